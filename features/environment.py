@@ -8,10 +8,20 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+from utils.advanced_logger import advanced_logger
+from utils.async_logging import async_logging
 from utils.cleanup_manager import CleanupManager
 from utils.documentation_manager import DocumentationManager
+from utils.dom_snapshot import DomSnapshotManager
 from utils.evidence_manager import EvidenceManager
 from utils.execution_report_generator import ExecutionReportGenerator
+from utils.latency_model import PAGE_LOAD_KEY, latency_model
+from utils.locator_healing import healing_store
+from utils.run_history import RunHistoryStore
+from utils.run_report_generator import RunReportGenerator
+from utils.step_event_log import events_path_for_log, step_event_log
+from utils.wait_policy import wait_policy
+from utils.webdriver_profiler import webdriver_profiler
 
 
 def get_screen_dimensions():
@@ -141,9 +151,9 @@ def get_driver():
             # Fallback: usar driver del sistema
             driver = webdriver.Chrome(options=options)
 
-        # Configurar timeouts
-        driver.implicitly_wait(10)
-        driver.set_page_load_timeout(30)
+        # Configurar timeouts (solo esperas explícitas: implicit wait según la política)
+        wait_policy.apply(driver)
+        driver.set_page_load_timeout(latency_model.timeout_for(PAGE_LOAD_KEY, 30))
 
         # Maximizar la ventana del navegador
         try:
@@ -178,10 +188,93 @@ def before_all(context):
         logging.error(f"Error cargando config.json: {str(e)}")
         raise
 
+    # Rotación de logs por tamaño/antigüedad (segmentos comprimidos con gzip)
+    logging_config = context.config_data.get("logging", {})
+    max_age_hours = logging_config.get("max_age_hours")
+    advanced_logger.configure_rotation(
+        max_bytes=logging_config.get("max_bytes"),
+        backup_count=logging_config.get("backup_count"),
+        max_age_seconds=max_age_hours * 3600 if max_age_hours else None,
+    )
+
+    # Inicializar historial de ejecuciones (tendencias y regresiones por step)
+    try:
+        context.run_history = RunHistoryStore(
+            config=context.config_data.get("run_history", {})
+        )
+    except Exception as e:
+        logging.warning(f"Error inicializando historial de ejecuciones: {str(e)}")
+        context.run_history = None
+
+    # Snapshots sanitizados del DOM por pantalla (validación offline de locators)
+    context.dom_snapshots = DomSnapshotManager(
+        context.config_data.get("dom_snapshots", {})
+    )
+
+    # Política de esperas (implicit wait, presupuesto por step y frecuencias de sondeo)
+    wait_policy.configure(context.config_data.get("wait_policy", {}))
+
+    # Timeouts adaptativos (percentil histórico por elemento y carga de página)
+    latency_model.configure(context.config_data.get("adaptive_timeouts", {}))
+    webdriver_profiler.on_command = latency_model.observe_command
+
+    # Auto-reparación de locators (umbral de similitud y rutas de huellas/reparaciones)
+    healing_store.configure(context.config_data.get("locator_healing", {}))
+
+    # Inicializar reporte agregado de la ejecución (un índice para todos los scenarios)
+    context.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    run_report_config = context.config_data.get("run_report", {})
+    context.per_scenario_html = run_report_config.get("per_scenario_html", False)
+    try:
+        context.run_report = RunReportGenerator(context.run_id)
+    except Exception as e:
+        logging.warning(f"Error inicializando reporte agregado: {str(e)}")
+        context.run_report = None
+
+    # Limpieza de la sesión (retención y cuota de disco) en un hilo daemon, con
+    # bloqueo exclusivo entre workers y pausas de E/S para no competir con WebDriver
+    try:
+        context.session_cleanup_manager = CleanupManager(
+            context.config_data.get("cleanup_management", {})
+        )
+        context.session_cleanup_manager.start_background_cleanup()
+    except Exception as e:
+        logging.warning(f"Error iniciando limpieza en segundo plano: {str(e)}")
+        context.session_cleanup_manager = None
+
+
+def after_all(context):
+    """Se ejecuta una sola vez después de todos los escenarios"""
+    if getattr(context, "run_report", None):
+        index_path = context.run_report.generate_index()
+        if index_path:
+            logging.info(f"📊 Reporte agregado de la ejecución: {index_path}")
+
+            # Mostrar mensaje al usuario
+            print("\n" + "=" * 80)
+            print("📊 REPORTE AGREGADO DE LA EJECUCIÓN")
+            print("=" * 80)
+            print(f"✅ Índice HTML: {index_path}")
+            print("=" * 80)
+
+    # Cancelar la limpieza si sigue en curso; su reporte queda marcado como cancelado
+    if getattr(context, "session_cleanup_manager", None):
+        context.session_cleanup_manager.stop_background_cleanup()
+        cleanup_summary = context.session_cleanup_manager.last_session_summary
+        if cleanup_summary:
+            logging.info(
+                f"🧹 Limpieza completada: {cleanup_summary.get('evidences_cleaned', 0)} evidencias, {cleanup_summary.get('logs_cleaned', 0)} logs, {cleanup_summary.get('reports_cleaned', 0)} reportes, {cleanup_summary.get('docs_cleaned', 0)} docs, {cleanup_summary['total_size_freed_mb']} MB liberados"
+            )
+
+    async_logging.flush()
+
 
 def before_scenario(context, scenario):
     """Se ejecuta antes de cada escenario"""
     try:
+        # Inicio del escenario para el registro de resultados (antes de crear el log)
+        context.scenario_started_at = datetime.now()
+
         # Configurar logging específico para el escenario
         setup_scenario_logging(context, scenario)
 
@@ -194,37 +287,17 @@ def before_scenario(context, scenario):
         # Inicializar gestor de documentación
         context.documentation_manager = DocumentationManager()
 
-        # Inicializar gestor de limpieza
-        try:
-            context.cleanup_manager = CleanupManager(
-                context.config_data.get("cleanup_management", {})
-            )
-        except Exception as e:
-            logging.warning(f"Error inicializando CleanupManager: {str(e)}")
-            context.cleanup_manager = None
+        # Gestor de limpieza de la sesión (la limpieza corre en segundo plano desde before_all)
+        context.cleanup_manager = getattr(context, "session_cleanup_manager", None)
 
         # Inicializar tracking de ejecución
         context.start_time = datetime.now().strftime("%H:%M:%S")
         context.executed_steps = []
         context.screenshots_taken = 0
 
-        # Limpiar archivos antiguos (solo una vez por sesión) - COMENTADO TEMPORALMENTE
-        # if not hasattr(context, "_cleanup_done"):
-        #     try:
-        #         # Comentado temporalmente para evitar errores
-        #         # context.evidence_manager.cleanup_old_evidence()
-        #         if context.cleanup_manager:
-        #             cleanup_summary = context.cleanup_manager.cleanup_old_files()
-        #             if cleanup_summary:
-        #                 logging.info(
-        #                     f"🧹 Limpieza completada: {cleanup_summary['evidences_cleaned']} evidencias, {cleanup_summary['logs_cleaned']} logs, {cleanup_summary['reports_cleaned']} reportes, {cleanup_summary['docs_cleaned']} docs, {cleanup_summary['total_size_freed_mb']} MB liberados"
-        #                 )
-        #         context._cleanup_done = True
-        #     except Exception as e:
-        #         logging.warning(f"Error en limpieza inicial: {str(e)}")
-        #         context._cleanup_done = True  # Marcar como hecho para evitar reintentos
-
         context.driver = get_driver()
+        # Conteo y latencia de los comandos WebDriver de cada step
+        webdriver_profiler.attach(context.driver)
         logging.info(f"Driver configurado para escenario: {scenario.name}")
     except Exception as e:
         logging.error(f"Error en before_scenario: {str(e)}")
@@ -234,31 +307,36 @@ def before_scenario(context, scenario):
 def setup_scenario_logging(context, scenario):
     """Configura el logging específico para el escenario"""
     try:
-        # Crear directorios para logs
-        logs_dir = os.path.join("logs", scenario.feature.name, scenario.name)
-        os.makedirs(logs_dir, exist_ok=True)
-
-        # Nombre del archivo de log con timestamp
+        # Ubicación canónica única: logs/<fecha>/<feature>/<scenario>_<timestamp>.log
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = os.path.join(logs_dir, f"test_{timestamp}.log")
-
-        # Limpiar handlers existentes
-        root_logger = logging.getLogger()
-        for handler in root_logger.handlers[:]:
-            root_logger.removeHandler(handler)
-
-        # Configurar logging con archivo y consola
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            handlers=[
-                logging.FileHandler(log_file, mode="w", encoding="utf-8"),
-                logging.StreamHandler(),
-            ],
+        log_file = str(
+            advanced_logger.get_scenario_log_path(scenario.feature.name, scenario.name)
         )
 
-        # Guardar la ruta del log en el contexto
+        # Handlers reales: los escribe el hilo listener, no el hilo de WebDriver
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
+        file_handler = advanced_logger.create_log_handler(log_file)
+        file_handler.setFormatter(formatter)
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+
+        # El root logger solo encola; los handlers del escenario anterior se cierran
+        logging.getLogger().setLevel(logging.INFO)
+        async_logging.install_root([file_handler, console_handler])
+
+        # Guardar la ruta del log en el contexto; los loggers de AdvancedLogger
+        # escriben en este mismo archivo en lugar de abrir una segunda copia
         context.log_file = log_file
+        advanced_logger.register_scenario_log(log_file)
+
+        # Log estructurado de eventos (JSON Lines + índice de offsets por step)
+        context.events_file = step_event_log.start_scenario(
+            getattr(context, "run_id", timestamp),
+            str(scenario.location),
+            events_path_for_log(log_file),
+        )
 
         logging.info(f"Logging configurado para escenario: {scenario.name}")
         logging.info(f"Archivo de log: {log_file}")
@@ -269,9 +347,55 @@ def setup_scenario_logging(context, scenario):
         logging.basicConfig(level=logging.INFO)
 
 
+def before_step(context, step):
+    """Se ejecuta antes de cada step"""
+    step_event_log.start_step(step.keyword, step.name)
+    webdriver_profiler.start_step()
+    wait_policy.start_step()
+
+
+def after_step(context, step):
+    """Se ejecuta después de cada step"""
+    # Cerrar el conteo antes del snapshot para no atribuirle sus comandos al step
+    commands = webdriver_profiler.end_step()
+    if commands:
+        step_event_log.event("webdriver_commands", **commands)
+        slowest = commands["slowest"]
+        logging.info(
+            f"🌐 {commands['commands']} comandos WebDriver en {commands['total_time']:.2f}s "
+            f"(más lento: {slowest['command']} en {slowest['method']}, {slowest['duration']:.3f}s)"
+        )
+
+    waits = wait_policy.end_step()
+    if waits:
+        logging.info(
+            f"⏳ {waits['waits']} esperas: {waits['spent']:.2f}s de {waits['requested']:.2f}s "
+            f"solicitados ({waits['timeouts']} timeouts, {waits['clamped']} limitadas por presupuesto)"
+        )
+
+    # Solo se escribe si la pantalla cambió desde su último snapshot
+    if getattr(context, "dom_snapshots", None) and getattr(context, "driver", None):
+        context.dom_snapshots.capture(context.driver)
+
+    step_event_log.end_step(
+        step.status.name if hasattr(step.status, "name") else str(step.status),
+        duration=getattr(step, "duration", None),
+        error_message=getattr(step, "error_message", None),
+    )
+
+
 def after_scenario(context, scenario):
     """Se ejecuta después de cada escenario"""
     try:
+        # Vaciar la cola de logging para que el log del escenario esté completo
+        async_logging.flush()
+        advanced_logger.end_scenario_log()
+        step_event_log.end_scenario(
+            scenario.status.name
+            if hasattr(scenario.status, "name")
+            else str(scenario.status)
+        )
+
         # Finalizar tracking de ejecución
         context.end_time = datetime.now().strftime("%H:%M:%S")
         context.overall_status = "SUCCESS" if scenario.status == "passed" else "FAILED"
@@ -280,8 +404,12 @@ def after_scenario(context, scenario):
             if scenario.status == "failed":
                 take_final_screenshot(context, scenario)
             context.driver.quit()
+            webdriver_profiler.detach()
             logging.info("Driver cerrado")
 
+        # Guardar las latencias observadas en el scenario para los timeouts adaptativos
+        latency_model.flush()
+
         # Generar resumen diario si está habilitado
         if (
             hasattr(context, "evidence_manager")
@@ -311,18 +439,31 @@ def after_scenario(context, scenario):
                     context, scenario, scenario.feature
                 )
                 html_report, json_report = (
-                    context.report_generator.generate_execution_report(execution_data)
+                    context.report_generator.generate_execution_report(
+                        execution_data,
+                        render_html=getattr(context, "per_scenario_html", True),
+                    )
                 )
 
-                if html_report:
-                    logging.info(f"📊 Reporte de ejecución generado: {html_report}")
+                # Registrar el scenario en el reporte agregado de la ejecución
+                if getattr(context, "run_report", None):
+                    context.run_report.append_scenario(
+                        execution_data,
+                        duration=getattr(scenario, "duration", None),
+                        json_report=json_report,
+                    )
+
+                if json_report:
+                    if html_report:
+                        logging.info(f"📊 Reporte de ejecución generado: {html_report}")
                     logging.info(f"📄 Reporte JSON generado: {json_report}")
 
                     # Mostrar mensaje al usuario
                     print("\n" + "=" * 80)
                     print("📊 REPORTE DE EJECUCIÓN GENERADO")
                     print("=" * 80)
-                    print(f"✅ Reporte HTML: {html_report}")
+                    if html_report:
+                        print(f"✅ Reporte HTML: {html_report}")
                     print(f"📄 Reporte JSON: {json_report}")
                     print("=" * 80)
                 else:
@@ -330,9 +471,20 @@ def after_scenario(context, scenario):
             except Exception as e:
                 logging.error(f"Error generando reporte de ejecución: {str(e)}")
 
+        # Registrar la ejecución en el historial y detectar regresiones
+        if getattr(context, "run_history", None):
+            try:
+                context.run_history.ingest_execution_data(
+                    execution_data, source=json_report
+                )
+                context.run_history.log_regressions()
+            except Exception as e:
+                logging.warning(f"Error actualizando historial de ejecuciones: {str(e)}")
+
         # Generar documentación específica
         if hasattr(context, "documentation_manager"):
             try:
+                async_logging.flush()
                 log_file_path = getattr(context, "log_file", None)
                 doc_path, pdf_path = (
                     context.documentation_manager.generate_execution_documentation(
@@ -363,15 +515,41 @@ def after_scenario(context, scenario):
             except Exception as e:
                 logging.error(f"Error generando documentación: {str(e)}")
 
+        # Registrar el resultado: la cuota de disco no desaloja ejecuciones fallidas
+        if hasattr(context, "evidence_manager"):
+            context.evidence_manager.record_execution_result(
+                context.overall_status,
+                getattr(context, "scenario_started_at", None),
+                evidence_dir=get_evidence_folder(context),
+                log_file=getattr(context, "log_file", None),
+            )
+
     except Exception as e:
         logging.error(f"Error en after_scenario: {str(e)}")
 
 
+def get_evidence_folder(context):
+    """Carpeta de evidencias de la ejecución del page object activo, si se configuró"""
+    for page_name in ("alta_catalogo_page", "alta_zafra_page"):
+        folder = getattr(getattr(context, page_name, None), "execution_folder", None)
+        if folder:
+            return folder
+    return getattr(context, "final_screenshot_dir", None)
+
+
 def take_final_screenshot(context, scenario):
     """Toma una captura final si el escenario falla"""
     try:
-        evidence_dir = os.path.join("evidences", scenario.feature.name, scenario.name)
+        # Estructura por fecha (evidences/YYYY-MM-DD/...) para que la limpieza
+        # la trate como evidencia de la ejecución y no como estructura antigua
+        evidence_dir = get_evidence_folder(context) or os.path.join(
+            "evidences",
+            datetime.now().strftime("%Y-%m-%d"),
+            scenario.feature.name,
+            scenario.name,
+        )
         os.makedirs(evidence_dir, exist_ok=True)
+        context.final_screenshot_dir = evidence_dir
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         screenshot_path = os.path.join(evidence_dir, f"FAILED_{timestamp}.png")
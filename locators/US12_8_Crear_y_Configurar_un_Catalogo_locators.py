@@ -182,6 +182,7 @@ class AltaCatalogoLocators:
         # Formulario Nuevo Catálogo - Campos (IDs actualizados según debug)
         self.CAMPO_NOMBRE = (By.XPATH, "//input[@name='nombre']")
         self.CAMPO_DESCRIPCION = (By.XPATH, "//input[@name='descripcion']")
+        self.CAMPO_DESCRIPCION_ALT = (By.XPATH, "//textarea[@name='descripcion']")
         self.DROPDOWN_CLASIFICACION_AREA = (By.XPATH, "//input[@name='tipo_area']")
         self.DROPDOWN_TIPO_CLASIFICACION = (
             By.XPATH,
@@ -213,6 +214,16 @@ class AltaCatalogoLocators:
         self.CAMPO_ETIQUETA = (By.XPATH, "//*[@id='«r2o»']")
         self.DROPDOWN_TIPO_DATO = (By.XPATH, "//*[@id='tipoDato-0']")
 
+        # Campos por name (estables frente a los IDs dinámicos)
+        self.CAMPO_NOMBRE_TECNICO_ALT = (
+            By.XPATH,
+            "//input[@name='atributos_catalogo[0].nombre_atributo']",
+        )
+        self.CAMPO_ETIQUETA_ALT = (
+            By.XPATH,
+            "//input[@name='atributos_catalogo[0].etiqueta']",
+        )
+
         # Opción de Tipo de Dato (IDs dinámicos actualizados)
         self.OPCION_TIPO_DATO = (By.XPATH, "//*[@id='«r18»']/li[2]")
         self.OPCION_TIPO_DATO_ALT = (
@@ -11,9 +11,20 @@ from datetime import datetime
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
 from locators.US12_8_Crear_y_Configurar_un_Catalogo_locators import AltaCatalogoLocators
+from utils.dom_inventory import (
+    DomInventory,
+    describe_element,
+    format_inventory,
+    selector_queries,
+    tag_queries,
+)
+from utils.form_filler import FormFiller
+from utils.locator_healing import LocatorHealer
+from utils.locator_registry import locator_registry
+from utils.step_event_log import step_event_log
+from utils.wait_policy import wait_policy
 
 
 class AltaCatalogoPage:
@@ -21,8 +32,9 @@ class AltaCatalogoPage:
 
     def __init__(self, driver):
         self.driver = driver
-        self.locators = AltaCatalogoLocators()
-        self.wait = WebDriverWait(driver, 15)
+        self.locators = locator_registry.get(AltaCatalogoLocators)
+        self.healer = LocatorHealer(driver, self.locators)
+        self.wait = wait_policy.wait(driver, 15)
         self.logger = logging.getLogger(__name__)
         self.execution_folder = None  # Carpeta específica para esta ejecución
 
@@ -80,7 +92,7 @@ class AltaCatalogoPage:
             self.driver.get(self.locators.URL_LOGIN)
 
             # Esperar solo a que el body esté presente (mínimo necesario) - ULTRA RÁPIDO
-            WebDriverWait(self.driver, 1).until(
+            wait_policy.wait(self.driver, 1).until(
                 EC.presence_of_element_located(self.locators.PAGINA_LOGIN)
             )
 
@@ -91,18 +103,9 @@ class AltaCatalogoPage:
             self.logger.info("Haciendo clic inmediato en OKTA...")
 
             # Intentar con timeout muy corto (2 segundos)
-            try:
-                boton_okta = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.BOTON_OKTA)
-                )
-                self.logger.info("✅ Botón OKTA encontrado inmediatamente")
-            except TimeoutException:
-                # Si no encuentra con el primer selector, intentar con el alternativo
-                self.logger.info("Intentando con selector alternativo...")
-                boton_okta = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.BOTON_OKTA_ALT)
-                )
-                self.logger.info("✅ Botón OKTA encontrado con selector alternativo")
+            boton_okta = self.healer.find(
+                EC.element_to_be_clickable, "BOTON_OKTA", "BOTON_OKTA_ALT", timeout=1
+            )
 
             # Capturar screenshot antes del clic
             self._capturar_screenshot("antes_clic_okta_inmediato")
@@ -200,17 +203,9 @@ class AltaCatalogoPage:
             self.logger.info("Haciendo clic inmediato en el botón OKTA...")
 
             # Intentar con el selector principal (timeout ultra corto)
-            try:
-                boton_okta = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.BOTON_OKTA)
-                )
-                self.logger.info("✅ Botón OKTA encontrado con selector principal")
-            except TimeoutException:
-                self.logger.info("Intentando con selector alternativo...")
-                boton_okta = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.BOTON_OKTA_ALT)
-                )
-                self.logger.info("✅ Botón OKTA encontrado con selector alternativo")
+            boton_okta = self.healer.find(
+                EC.element_to_be_clickable, "BOTON_OKTA", "BOTON_OKTA_ALT", timeout=1
+            )
 
             # Capturar screenshot antes del clic
             self._capturar_screenshot("antes_clic_okta_inmediato")
@@ -348,19 +343,12 @@ class AltaCatalogoPage:
             self.logger.info(f"Ingresando usuario en OKTA: {usuario}")
 
             # Buscar el campo de usuario con timeout ultra corto
-            try:
-                campo_usuario = WebDriverWait(self.driver, 1).until(
-                    EC.presence_of_element_located(self.locators.OKTA_CAMPO_USUARIO)
-                )
-                self.logger.info("✅ Campo de usuario encontrado")
-            except TimeoutException:
-                self.logger.info("Intentando con selector alternativo...")
-                campo_usuario = WebDriverWait(self.driver, 1).until(
-                    EC.presence_of_element_located(self.locators.OKTA_CAMPO_USUARIO_ALT)
-                )
-                self.logger.info(
-                    "✅ Campo de usuario encontrado con selector alternativo"
-                )
+            campo_usuario = self.healer.find(
+                EC.presence_of_element_located,
+                "OKTA_CAMPO_USUARIO",
+                "OKTA_CAMPO_USUARIO_ALT",
+                timeout=1,
+            )
 
             # Limpiar el campo y ingresar el usuario
             campo_usuario.clear()
@@ -387,19 +375,12 @@ class AltaCatalogoPage:
             self.logger.info("Haciendo clic en botón Siguiente de OKTA...")
 
             # Buscar el botón Siguiente con timeout ultra corto
-            try:
-                boton_siguiente = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.OKTA_BOTON_SIGUIENTE)
-                )
-                self.logger.info("✅ Botón Siguiente encontrado")
-            except TimeoutException:
-                self.logger.info("Intentando con selector alternativo...")
-                boton_siguiente = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.OKTA_BOTON_SIGUIENTE_ALT)
-                )
-                self.logger.info(
-                    "✅ Botón Siguiente encontrado con selector alternativo"
-                )
+            boton_siguiente = self.healer.find(
+                EC.element_to_be_clickable,
+                "OKTA_BOTON_SIGUIENTE",
+                "OKTA_BOTON_SIGUIENTE_ALT",
+                timeout=1,
+            )
 
             # Capturar screenshot antes del clic
             self._capturar_screenshot("antes_clic_siguiente_okta")
@@ -437,19 +418,12 @@ class AltaCatalogoPage:
             )
 
             # Buscar el campo de usuario con timeout ultra corto
-            try:
-                campo_usuario = WebDriverWait(self.driver, 1).until(
-                    EC.presence_of_element_located(self.locators.OKTA_CAMPO_USUARIO)
-                )
-                self.logger.info("✅ Campo de usuario encontrado")
-            except TimeoutException:
-                self.logger.info("Intentando con selector alternativo...")
-                campo_usuario = WebDriverWait(self.driver, 1).until(
-                    EC.presence_of_element_located(self.locators.OKTA_CAMPO_USUARIO_ALT)
-                )
-                self.logger.info(
-                    "✅ Campo de usuario encontrado con selector alternativo"
-                )
+            campo_usuario = self.healer.find(
+                EC.presence_of_element_located,
+                "OKTA_CAMPO_USUARIO",
+                "OKTA_CAMPO_USUARIO_ALT",
+                timeout=1,
+            )
 
             # Limpiar el campo y ingresar el usuario de forma rápida
             campo_usuario.clear()
@@ -460,19 +434,12 @@ class AltaCatalogoPage:
             self._capturar_screenshot("usuario_ingresado_okta")
 
             # Buscar el botón Siguiente con timeout ultra corto
-            try:
-                boton_siguiente = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.OKTA_BOTON_SIGUIENTE)
-                )
-                self.logger.info("✅ Botón Siguiente encontrado")
-            except TimeoutException:
-                self.logger.info("Intentando con selector alternativo...")
-                boton_siguiente = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.OKTA_BOTON_SIGUIENTE_ALT)
-                )
-                self.logger.info(
-                    "✅ Botón Siguiente encontrado con selector alternativo"
-                )
+            boton_siguiente = self.healer.find(
+                EC.element_to_be_clickable,
+                "OKTA_BOTON_SIGUIENTE",
+                "OKTA_BOTON_SIGUIENTE_ALT",
+                timeout=1,
+            )
 
             # Capturar screenshot antes del clic
             self._capturar_screenshot("antes_clic_siguiente_okta")
@@ -520,7 +487,7 @@ class AltaCatalogoPage:
             if self.locators.URL_OKTA in url_actual:
                 # Buscar el campo de contraseña para confirmar que estamos en la página correcta
                 try:
-                    WebDriverWait(self.driver, 1).until(
+                    wait_policy.wait(self.driver, 1).until(
                         EC.presence_of_element_located(
                             self.locators.OKTA_CAMPO_CONTRASENA
                         )
@@ -551,13 +518,13 @@ class AltaCatalogoPage:
 
             # Buscar el campo de contraseña con timeout ultra corto
             try:
-                campo_contrasena = WebDriverWait(self.driver, 1).until(
+                campo_contrasena = wait_policy.wait(self.driver, 1).until(
                     EC.presence_of_element_located(self.locators.OKTA_CAMPO_CONTRASENA)
                 )
                 self.logger.info("✅ Campo de contraseña encontrado")
             except TimeoutException:
                 self.logger.info("Intentando con selector alternativo...")
-                campo_contrasena = WebDriverWait(self.driver, 1).until(
+                campo_contrasena = wait_policy.wait(self.driver, 1).until(
                     EC.presence_of_element_located(
                         self.locators.OKTA_CAMPO_CONTRASENA_ALT
                     )
@@ -591,19 +558,12 @@ class AltaCatalogoPage:
             self.logger.info("Haciendo clic en botón Verificar de OKTA...")
 
             # Buscar el botón Verificar con timeout ultra corto
-            try:
-                boton_verificar = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.OKTA_BOTON_VERIFICAR)
-                )
-                self.logger.info("✅ Botón Verificar encontrado")
-            except TimeoutException:
-                self.logger.info("Intentando con selector alternativo...")
-                boton_verificar = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.OKTA_BOTON_VERIFICAR_ALT)
-                )
-                self.logger.info(
-                    "✅ Botón Verificar encontrado con selector alternativo"
-                )
+            boton_verificar = self.healer.find(
+                EC.element_to_be_clickable,
+                "OKTA_BOTON_VERIFICAR",
+                "OKTA_BOTON_VERIFICAR_ALT",
+                timeout=1,
+            )
 
             # Capturar screenshot antes del clic
             self._capturar_screenshot("antes_clic_verificar_okta")
@@ -640,13 +600,13 @@ class AltaCatalogoPage:
 
             # Buscar el campo de contraseña con timeout ultra corto
             try:
-                campo_contrasena = WebDriverWait(self.driver, 1).until(
+                campo_contrasena = wait_policy.wait(self.driver, 1).until(
                     EC.presence_of_element_located(self.locators.OKTA_CAMPO_CONTRASENA)
                 )
                 self.logger.info("✅ Campo de contraseña encontrado")
             except TimeoutException:
                 self.logger.info("Intentando con selector alternativo...")
-                campo_contrasena = WebDriverWait(self.driver, 1).until(
+                campo_contrasena = wait_policy.wait(self.driver, 1).until(
                     EC.presence_of_element_located(
                         self.locators.OKTA_CAMPO_CONTRASENA_ALT
                     )
@@ -664,19 +624,12 @@ class AltaCatalogoPage:
             self._capturar_screenshot("contrasena_ingresada_okta")
 
             # Buscar el botón Verificar con timeout ultra corto
-            try:
-                boton_verificar = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.OKTA_BOTON_VERIFICAR)
-                )
-                self.logger.info("✅ Botón Verificar encontrado")
-            except TimeoutException:
-                self.logger.info("Intentando con selector alternativo...")
-                boton_verificar = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.OKTA_BOTON_VERIFICAR_ALT)
-                )
-                self.logger.info(
-                    "✅ Botón Verificar encontrado con selector alternativo"
-                )
+            boton_verificar = self.healer.find(
+                EC.element_to_be_clickable,
+                "OKTA_BOTON_VERIFICAR",
+                "OKTA_BOTON_VERIFICAR_ALT",
+                timeout=1,
+            )
 
             # Capturar screenshot antes del clic
             self._capturar_screenshot("antes_clic_verificar_okta")
@@ -718,13 +671,13 @@ class AltaCatalogoPage:
 
             # Buscar el campo de contraseña con timeout ultra corto
             try:
-                campo_contrasena = WebDriverWait(self.driver, 1).until(
+                campo_contrasena = wait_policy.wait(self.driver, 1).until(
                     EC.presence_of_element_located(self.locators.OKTA_CAMPO_CONTRASENA)
                 )
                 self.logger.info("✅ Campo de contraseña encontrado")
             except TimeoutException:
                 self.logger.info("Intentando con selector alternativo...")
-                campo_contrasena = WebDriverWait(self.driver, 1).until(
+                campo_contrasena = wait_policy.wait(self.driver, 1).until(
                     EC.presence_of_element_located(
                         self.locators.OKTA_CAMPO_CONTRASENA_ALT
                     )
@@ -743,14 +696,14 @@ class AltaCatalogoPage:
 
             # Buscar el botón Verificar con timeout ultra corto
             try:
-                boton_verificar = WebDriverWait(self.driver, 1).until(
+                boton_verificar = wait_policy.wait(self.driver, 1).until(
                     EC.element_to_be_clickable(self.locators.OKTA_BOTON_VERIFICAR)
                 )
                 self.logger.info("✅ Botón Verificar encontrado")
             except TimeoutException:
                 self.logger.info("Intentando con selector alternativo...")
                 try:
-                    boton_verificar = WebDriverWait(self.driver, 1).until(
+                    boton_verificar = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(
                             self.locators.OKTA_BOTON_VERIFICAR_ALT
                         )
@@ -761,7 +714,7 @@ class AltaCatalogoPage:
                 except TimeoutException:
                     # Intentar con selectores más específicos
                     self.logger.info("Intentando con selectores más específicos...")
-                    boton_verificar = WebDriverWait(self.driver, 1).until(
+                    boton_verificar = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(
                             (By.XPATH, "//button[contains(text(), 'Verificar')]")
                         )
@@ -817,14 +770,14 @@ class AltaCatalogoPage:
 
             # Buscar el botón Verificar con timeout ultra corto
             try:
-                boton_verificar = WebDriverWait(self.driver, 1).until(
+                boton_verificar = wait_policy.wait(self.driver, 1).until(
                     EC.element_to_be_clickable(self.locators.OKTA_BOTON_VERIFICAR)
                 )
                 self.logger.info("✅ Botón Verificar encontrado")
             except TimeoutException:
                 self.logger.info("Intentando con selector alternativo...")
                 try:
-                    boton_verificar = WebDriverWait(self.driver, 1).until(
+                    boton_verificar = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(
                             self.locators.OKTA_BOTON_VERIFICAR_ALT
                         )
@@ -835,7 +788,7 @@ class AltaCatalogoPage:
                 except TimeoutException:
                     # Intentar con selectores más específicos
                     self.logger.info("Intentando con selectores más específicos...")
-                    boton_verificar = WebDriverWait(self.driver, 1).until(
+                    boton_verificar = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(
                             (By.XPATH, "//button[contains(text(), 'Verificar')]")
                         )
@@ -886,13 +839,13 @@ class AltaCatalogoPage:
 
             # Buscar el campo de contraseña con timeout ultra corto
             try:
-                campo_contrasena = WebDriverWait(self.driver, 1).until(
+                campo_contrasena = wait_policy.wait(self.driver, 1).until(
                     EC.presence_of_element_located(self.locators.OKTA_CAMPO_CONTRASENA)
                 )
                 self.logger.info("✅ Campo de contraseña encontrado")
             except TimeoutException:
                 self.logger.info("Intentando con selector alternativo...")
-                campo_contrasena = WebDriverWait(self.driver, 1).until(
+                campo_contrasena = wait_policy.wait(self.driver, 1).until(
                     EC.presence_of_element_located(
                         self.locators.OKTA_CAMPO_CONTRASENA_ALT
                     )
@@ -914,7 +867,7 @@ class AltaCatalogoPage:
 
             # Buscar el botón Verificar con timeout ultra corto
             try:
-                boton_verificar = WebDriverWait(self.driver, 1).until(
+                boton_verificar = wait_policy.wait(self.driver, 1).until(
                     EC.element_to_be_clickable(selector_especifico)
                 )
                 self.logger.info(
@@ -923,7 +876,7 @@ class AltaCatalogoPage:
             except TimeoutException:
                 self.logger.info("Intentando con selector alternativo...")
                 try:
-                    boton_verificar = WebDriverWait(self.driver, 1).until(
+                    boton_verificar = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(
                             self.locators.OKTA_BOTON_VERIFICAR_ALT
                         )
@@ -934,7 +887,7 @@ class AltaCatalogoPage:
                 except TimeoutException:
                     # Intentar con el tercer selector
                     self.logger.info("Intentando con tercer selector...")
-                    boton_verificar = WebDriverWait(self.driver, 1).until(
+                    boton_verificar = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(
                             self.locators.OKTA_BOTON_VERIFICAR_ALT2
                         )
@@ -995,7 +948,7 @@ class AltaCatalogoPage:
 
             # Buscar el botón Verificar con timeout ultra corto
             try:
-                boton_verificar = WebDriverWait(self.driver, 1).until(
+                boton_verificar = wait_policy.wait(self.driver, 1).until(
                     EC.element_to_be_clickable(selector_especifico)
                 )
                 self.logger.info(
@@ -1004,7 +957,7 @@ class AltaCatalogoPage:
             except TimeoutException:
                 self.logger.info("Intentando con selector alternativo...")
                 try:
-                    boton_verificar = WebDriverWait(self.driver, 1).until(
+                    boton_verificar = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(
                             self.locators.OKTA_BOTON_VERIFICAR_ALT
                         )
@@ -1015,7 +968,7 @@ class AltaCatalogoPage:
                 except TimeoutException:
                     # Intentar con el tercer selector
                     self.logger.info("Intentando con tercer selector...")
-                    boton_verificar = WebDriverWait(self.driver, 1).until(
+                    boton_verificar = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(
                             self.locators.OKTA_BOTON_VERIFICAR_ALT2
                         )
@@ -1111,7 +1064,7 @@ class AltaCatalogoPage:
 
                 # Verificar elementos de la página principal
                 try:
-                    WebDriverWait(self.driver, 1).until(
+                    wait_policy.wait(self.driver, 1).until(
                         EC.presence_of_element_located(self.locators.BIENVENIDO_TEXTO)
                     )
                     self.logger.info("✅ Texto de bienvenida encontrado")
@@ -1120,7 +1073,7 @@ class AltaCatalogoPage:
 
                 # Verificar logo de Zulka
                 try:
-                    WebDriverWait(self.driver, 1).until(
+                    wait_policy.wait(self.driver, 1).until(
                         EC.presence_of_element_located(self.locators.ZULKA_LOGO)
                     )
                     self.logger.info("✅ Logo de Zulka encontrado")
@@ -1148,19 +1101,9 @@ class AltaCatalogoPage:
             self.logger.info("🔧 Haciendo clic en Configurador...")
 
             # Buscar el elemento Configurador con timeout optimizado
-            try:
-                configurador = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.CONFIGURADOR_MENU)
-                )
-                self.logger.info("✅ Elemento Configurador encontrado")
-            except TimeoutException:
-                self.logger.info("Intentando con selector alternativo...")
-                configurador = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.CONFIGURADOR_MENU_ALT)
-                )
-                self.logger.info(
-                    "✅ Elemento Configurador encontrado con selector alternativo"
-                )
+            configurador = self.healer.find(
+                EC.element_to_be_clickable, "CONFIGURADOR_MENU", "CONFIGURADOR_MENU_ALT", timeout=1
+            )
 
             # Capturar screenshot antes del clic
             self._capturar_screenshot("antes_clic_configurador")
@@ -1188,19 +1131,9 @@ class AltaCatalogoPage:
             self.logger.info("📋 Haciendo clic en Gestor de catálogos...")
 
             # Buscar el elemento Gestor de catálogos con timeout reducido
-            try:
-                gestor = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.GESTOR_CATALOGOS)
-                )
-                self.logger.info("✅ Elemento Gestor de catálogos encontrado")
-            except TimeoutException:
-                self.logger.info("Intentando con selector alternativo...")
-                gestor = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.GESTOR_CATALOGOS_ALT)
-                )
-                self.logger.info(
-                    "✅ Elemento Gestor de catálogos encontrado con selector alternativo"
-                )
+            gestor = self.healer.find(
+                EC.element_to_be_clickable, "GESTOR_CATALOGOS", "GESTOR_CATALOGOS_ALT", timeout=1
+            )
 
             # Capturar screenshot antes del clic
             self._capturar_screenshot("antes_clic_gestor_catalogos")
@@ -1228,19 +1161,12 @@ class AltaCatalogoPage:
             self.logger.info("➕ Haciendo clic en NUEVO CATÁLOGO...")
 
             # Buscar el botón NUEVO CATÁLOGO con timeout reducido
-            try:
-                nuevo_catalogo = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.BOTON_NUEVO_CATALOGO)
-                )
-                self.logger.info("✅ Botón NUEVO CATÁLOGO encontrado")
-            except TimeoutException:
-                self.logger.info("Intentando con selector alternativo...")
-                nuevo_catalogo = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.BOTON_NUEVO_CATALOGO_ALT)
-                )
-                self.logger.info(
-                    "✅ Botón NUEVO CATÁLOGO encontrado con selector alternativo"
-                )
+            nuevo_catalogo = self.healer.find(
+                EC.element_to_be_clickable,
+                "BOTON_NUEVO_CATALOGO",
+                "BOTON_NUEVO_CATALOGO_ALT",
+                timeout=1,
+            )
 
             # Capturar screenshot antes del clic
             self._capturar_screenshot("antes_clic_nuevo_catalogo")
@@ -1288,43 +1214,15 @@ class AltaCatalogoPage:
                 ("Botón submit", "//button[@type='submit']"),
             ]
 
-            elementos_encontrados = []
-
-            for nombre, selector in selectores:
-                try:
-                    if selector.startswith("//"):
-                        # XPath
-                        elementos = self.driver.find_elements(By.XPATH, selector)
-                    else:
-                        # CSS
-                        elementos = self.driver.find_elements(By.CSS_SELECTOR, selector)
-
-                    if elementos:
-                        for i, elemento in enumerate(elementos):
-                            try:
-                                texto = (
-                                    elemento.text
-                                    or elemento.get_attribute("value")
-                                    or elemento.get_attribute("placeholder")
-                                    or "Sin texto"
-                                )
-                                tag = elemento.tag_name
-                                tipo = elemento.get_attribute("type") or "Sin tipo"
-                                clase = elemento.get_attribute("class") or "Sin clase"
-                                id_elem = elemento.get_attribute("id") or "Sin ID"
-
-                                info = f"{nombre} #{i+1}: tag={tag}, type={tipo}, text='{texto}', class='{clase}', id='{id_elem}'"
-                                elementos_encontrados.append(info)
-                                self.logger.info(f"✅ {info}")
-                            except Exception as e:
-                                self.logger.info(
-                                    f"⚠️ {nombre} #{i+1}: Error obteniendo info - {e}"
-                                )
-                    else:
-                        self.logger.info(f"❌ {nombre}: No encontrado")
+            inventario = self._inventario_dom(
+                "debug_elementos_nuevo_catalogo", selector_queries(selectores)
+            )
 
-                except Exception as e:
-                    self.logger.info(f"❌ {nombre}: Error - {e}")
+            elementos_encontrados = [
+                f"{nombre} #{i+1}: {describe_element(elemento)}"
+                for nombre, resultado in inventario.items()
+                for i, elemento in enumerate(resultado["elements"])
+            ]
 
             # Capturar screenshot para análisis
             self._capturar_screenshot("debug_elementos_nuevo_catalogo")
@@ -1446,80 +1344,11 @@ class AltaCatalogoPage:
         try:
             self.logger.info("🔍 DEBUG: Buscando elementos del formulario...")
 
-            # Buscar todos los inputs
-            inputs = self.driver.find_elements(By.TAG_NAME, "input")
-            self.logger.info(f"📋 Encontrados {len(inputs)} inputs en la página")
-
-            for i, input_elem in enumerate(inputs):
-                try:
-                    input_type = input_elem.get_attribute("type") or "Sin tipo"
-                    input_id = input_elem.get_attribute("id") or "Sin ID"
-                    input_class = input_elem.get_attribute("class") or "Sin clase"
-                    input_placeholder = (
-                        input_elem.get_attribute("placeholder") or "Sin placeholder"
-                    )
-                    input_name = input_elem.get_attribute("name") or "Sin name"
-
-                    self.logger.info(
-                        f"Input #{i+1}: type={input_type}, id={input_id}, class={input_class}, placeholder={input_placeholder}, name={input_name}"
-                    )
-                except Exception as e:
-                    self.logger.info(f"Input #{i+1}: Error obteniendo atributos - {e}")
-
-            # Buscar todos los textareas
-            textareas = self.driver.find_elements(By.TAG_NAME, "textarea")
-            self.logger.info(f"📋 Encontrados {len(textareas)} textareas en la página")
-
-            for i, textarea in enumerate(textareas):
-                try:
-                    textarea_id = textarea.get_attribute("id") or "Sin ID"
-                    textarea_class = textarea.get_attribute("class") or "Sin clase"
-                    textarea_placeholder = (
-                        textarea.get_attribute("placeholder") or "Sin placeholder"
-                    )
-                    textarea_name = textarea.get_attribute("name") or "Sin name"
-
-                    self.logger.info(
-                        f"Textarea #{i+1}: id={textarea_id}, class={textarea_class}, placeholder={textarea_placeholder}, name={textarea_name}"
-                    )
-                except Exception as e:
-                    self.logger.info(
-                        f"Textarea #{i+1}: Error obteniendo atributos - {e}"
-                    )
-
-            # Buscar todos los selects
-            selects = self.driver.find_elements(By.TAG_NAME, "select")
-            self.logger.info(f"📋 Encontrados {len(selects)} selects en la página")
-
-            for i, select in enumerate(selects):
-                try:
-                    select_id = select.get_attribute("id") or "Sin ID"
-                    select_class = select.get_attribute("class") or "Sin clase"
-                    select_name = select.get_attribute("name") or "Sin name"
-
-                    self.logger.info(
-                        f"Select #{i+1}: id={select_id}, class={select_class}, name={select_name}"
-                    )
-                except Exception as e:
-                    self.logger.info(f"Select #{i+1}: Error obteniendo atributos - {e}")
-
-            # Buscar todos los elementos li (opciones de dropdown)
-            lis = self.driver.find_elements(By.TAG_NAME, "li")
-            self.logger.info(f"📋 Encontrados {len(lis)} elementos li en la página")
-
-            for i, li in enumerate(lis[:10]):  # Solo mostrar los primeros 10
-                try:
-                    li_id = li.get_attribute("id") or "Sin ID"
-                    li_class = li.get_attribute("class") or "Sin clase"
-                    li_text = li.text or "Sin texto"
-                    li_data_value = li.get_attribute("data-value") or "Sin data-value"
-                    li_role = li.get_attribute("role") or "Sin role"
-
-                    self.logger.info(
-                        f"Li #{i+1}: id={li_id}, class={li_class}, text='{li_text}', data-value={li_data_value}, role={li_role}"
-                    )
-                except Exception as e:
-                    self.logger.info(f"Li #{i+1}: Error obteniendo atributos - {e}")
+            # Inputs, textareas, selects y opciones de dropdown (solo los primeros 10 li)
+            self._inventario_dom(
+                "debug_elementos_formulario",
+                tag_queries("input", "textarea", "select", ("li", 10)),
+            )
 
             # Capturar screenshot del debug
             self._capturar_screenshot("debug_elementos_formulario")
@@ -1554,7 +1383,7 @@ class AltaCatalogoPage:
             for selector in selectores_nombre:
                 try:
                     self.logger.info(f"🔍 Probando selector: {selector}")
-                    campo_nombre = WebDriverWait(self.driver, 1).until(
+                    campo_nombre = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     selector_usado = selector
@@ -1625,7 +1454,7 @@ class AltaCatalogoPage:
             for selector in selectores_descripcion:
                 try:
                     self.logger.info(f"🔍 Probando selector descripción: {selector}")
-                    campo_descripcion = WebDriverWait(self.driver, 1).until(
+                    campo_descripcion = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     selector_usado = selector
@@ -1689,7 +1518,7 @@ class AltaCatalogoPage:
             for selector in selectores_dropdown:
                 try:
                     self.logger.info(f"🔍 Probando selector dropdown: {selector}")
-                    dropdown_area = WebDriverWait(self.driver, 1).until(
+                    dropdown_area = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     self.logger.info(f"✅ Dropdown encontrado con selector: {selector}")
@@ -1739,7 +1568,7 @@ class AltaCatalogoPage:
             for selector in selectores_opcion:
                 try:
                     self.logger.info(f"🔍 Probando selector opción: {selector}")
-                    opcion_area = WebDriverWait(self.driver, 1).until(
+                    opcion_area = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     self.logger.info(f"✅ Opción encontrada con selector: {selector}")
@@ -1807,7 +1636,7 @@ class AltaCatalogoPage:
             for selector in selectores_dropdown:
                 try:
                     self.logger.info(f"🔍 Probando selector dropdown tipo: {selector}")
-                    dropdown_tipo = WebDriverWait(self.driver, 1).until(
+                    dropdown_tipo = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     self.logger.info(
@@ -1859,7 +1688,7 @@ class AltaCatalogoPage:
             for selector in selectores_opcion:
                 try:
                     self.logger.info(f"🔍 Probando selector opción tipo: {selector}")
-                    opcion_tipo = WebDriverWait(self.driver, 1).until(
+                    opcion_tipo = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     self.logger.info(
@@ -1913,22 +1742,36 @@ class AltaCatalogoPage:
         try:
             self.logger.info("📋 Llenando formulario completo de Nuevo Catálogo...")
 
-            # Llenar campo Nombre
-            if not self.llenar_campo_nombre("Test"):
-                return False
+            # Campos de texto por lotes
+            valores = {"Nombre": "Test", "Descripción": "Test"}
+            campos = {
+                "Nombre": [self.locators.CAMPO_NOMBRE],
+                "Descripción": [
+                    self.locators.CAMPO_DESCRIPCION,
+                    self.locators.CAMPO_DESCRIPCION_ALT,
+                ],
+            }
+            pendientes = self._llenar_campos_por_lotes(
+                "formulario_nuevo_catalogo", valores, campos
+            )
 
-            # Llenar campo Descripción
-            if not self.llenar_campo_descripcion("Test"):
-                return False
+            # Los campos que no quedaron asignados se llenan uno por uno
+            llenado_individual = {
+                "Nombre": lambda: self.llenar_campo_nombre("Test"),
+                "Descripción": lambda: self.llenar_campo_descripcion("Test"),
+            }
+            for campo in pendientes:
+                if not llenado_individual[campo]():
+                    return False
 
-            # Seleccionar Clasificación de área
+            # Los dropdowns de Material-UI solo renderizan sus opciones al
+            # abrirse, así que se eligen por texto ('Crédito', 'Global') con clic
             if not self.seleccionar_clasificacion_area():
                 return False
-
-            # Seleccionar Tipo de Clasificación
             if not self.seleccionar_tipo_clasificacion():
                 return False
 
+            self._capturar_screenshot("formulario_completo_llenado")
             self.logger.info("✅ Formulario completo llenado exitosamente")
             return True
 
@@ -1977,7 +1820,7 @@ class AltaCatalogoPage:
             for selector in selectores_boton:
                 try:
                     self.logger.info(f"🔍 Probando selector botón: {selector}")
-                    boton_guardar = WebDriverWait(self.driver, 1).until(
+                    boton_guardar = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     self.logger.info(f"✅ Botón encontrado con selector: {selector}")
@@ -2046,7 +1889,7 @@ class AltaCatalogoPage:
             for selector in selectores_nombre_tecnico:
                 try:
                     self.logger.info(f"🔍 Probando selector nombre técnico: {selector}")
-                    campo_nombre_tecnico = WebDriverWait(self.driver, 1).until(
+                    campo_nombre_tecnico = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     self.logger.info(
@@ -2104,7 +1947,7 @@ class AltaCatalogoPage:
             for selector in selectores_etiqueta:
                 try:
                     self.logger.info(f"🔍 Probando selector etiqueta: {selector}")
-                    campo_etiqueta = WebDriverWait(self.driver, 1).until(
+                    campo_etiqueta = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     self.logger.info(
@@ -2167,7 +2010,7 @@ class AltaCatalogoPage:
                     self.logger.info(
                         f"🔍 Probando selector dropdown tipo dato: {selector}"
                     )
-                    dropdown_tipo_dato = WebDriverWait(self.driver, 1).until(
+                    dropdown_tipo_dato = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     self.logger.info(
@@ -2222,7 +2065,7 @@ class AltaCatalogoPage:
                     self.logger.info(
                         f"🔍 Probando selector opción tipo dato: {selector}"
                     )
-                    opcion_tipo_dato = WebDriverWait(self.driver, 1).until(
+                    opcion_tipo_dato = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     self.logger.info(
@@ -2270,56 +2113,12 @@ class AltaCatalogoPage:
                 "🔍 DEBUG: Buscando elementos de estructura del catálogo..."
             )
 
-            # Buscar todos los inputs
-            inputs = self.driver.find_elements(By.TAG_NAME, "input")
-            self.logger.info(
-                f"📝 Encontrados {len(inputs)} elementos input en la página"
+            # Solo se muestran los primeros 10 inputs, 5 selects y 10 li
+            self._inventario_dom(
+                "debug_elementos_estructura_catalogo",
+                tag_queries(("input", 10), ("select", 5), ("li", 10)),
             )
 
-            for i, input_elem in enumerate(inputs[:10]):  # Solo mostrar los primeros 10
-                try:
-                    name = input_elem.get_attribute("name") or "sin_name"
-                    id_attr = input_elem.get_attribute("id") or "sin_id"
-                    type_attr = input_elem.get_attribute("type") or "sin_type"
-                    class_attr = input_elem.get_attribute("class") or "sin_class"
-                    self.logger.info(
-                        f"Input #{i+1}: name='{name}', id='{id_attr}', type='{type_attr}', class='{class_attr[:50]}...'"
-                    )
-                except Exception as e:
-                    self.logger.info(f"Input #{i+1}: Error obteniendo atributos - {e}")
-
-            # Buscar todos los elementos select
-            selects = self.driver.find_elements(By.TAG_NAME, "select")
-            self.logger.info(
-                f"🔽 Encontrados {len(selects)} elementos select en la página"
-            )
-
-            for i, select in enumerate(selects[:5]):  # Solo mostrar los primeros 5
-                try:
-                    name = select.get_attribute("name") or "sin_name"
-                    id_attr = select.get_attribute("id") or "sin_id"
-                    class_attr = select.get_attribute("class") or "sin_class"
-                    self.logger.info(
-                        f"Select #{i+1}: name='{name}', id='{id_attr}', class='{class_attr[:50]}...'"
-                    )
-                except Exception as e:
-                    self.logger.info(f"Select #{i+1}: Error obteniendo atributos - {e}")
-
-            # Buscar todos los elementos li (opciones de dropdown)
-            lis = self.driver.find_elements(By.TAG_NAME, "li")
-            self.logger.info(f"📋 Encontrados {len(lis)} elementos li en la página")
-
-            for i, li in enumerate(lis[:10]):  # Solo mostrar los primeros 10
-                try:
-                    text = li.text or "sin_texto"
-                    class_attr = li.get_attribute("class") or "sin_class"
-                    data_value = li.get_attribute("data-value") or "sin_data_value"
-                    self.logger.info(
-                        f"Li #{i+1}: text='{text}', class='{class_attr[:50]}...', data-value='{data_value}'"
-                    )
-                except Exception as e:
-                    self.logger.info(f"Li #{i+1}: Error obteniendo atributos - {e}")
-
             # Capturar screenshot para análisis visual
             self._capturar_screenshot("debug_elementos_estructura_catalogo")
 
@@ -2331,21 +2130,37 @@ class AltaCatalogoPage:
         try:
             self.logger.info("📋 Llenando estructura completa del catálogo...")
 
-            # Debug: Inspeccionar elementos disponibles
-            self.debug_elementos_estructura_catalogo()
+            # Campos de texto por lotes
+            valores = {"Nombre Técnico": "Test", "Etiqueta": "Test"}
+            campos = {
+                "Nombre Técnico": [
+                    self.locators.CAMPO_NOMBRE_TECNICO,
+                    self.locators.CAMPO_NOMBRE_TECNICO_ALT,
+                ],
+                "Etiqueta": [self.locators.CAMPO_ETIQUETA, self.locators.CAMPO_ETIQUETA_ALT],
+            }
+            pendientes = self._llenar_campos_por_lotes(
+                "estructura_catalogo", valores, campos
+            )
 
-            # Llenar campo Nombre Técnico
-            if not self.llenar_campo_nombre_tecnico_debug("Test"):
-                return False
+            if pendientes:
+                # Debug: Inspeccionar elementos disponibles
+                self.debug_elementos_estructura_catalogo()
 
-            # Llenar campo Etiqueta
-            if not self.llenar_campo_etiqueta_debug("Test"):
-                return False
+            # Los campos que no quedaron asignados se llenan uno por uno
+            llenado_individual = {
+                "Nombre Técnico": lambda: self.llenar_campo_nombre_tecnico_debug("Test"),
+                "Etiqueta": lambda: self.llenar_campo_etiqueta_debug("Test"),
+            }
+            for campo in pendientes:
+                if not llenado_individual[campo]():
+                    return False
 
-            # Seleccionar Tipo de Dato
+            # Tipo de Dato se elige por el texto de la opción ('Texto') con clic
             if not self.seleccionar_tipo_dato_debug():
                 return False
 
+            self._capturar_screenshot("estructura_catalogo_llenada")
             self.logger.info("✅ Estructura del catálogo llenada exitosamente")
             return True
 
@@ -2384,7 +2199,7 @@ class AltaCatalogoPage:
                     self.logger.info(
                         f"🔍 Probando selector botón estructura: {selector}"
                     )
-                    boton_guardar = WebDriverWait(self.driver, 1).until(
+                    boton_guardar = wait_policy.wait(self.driver, 1).until(
                         EC.element_to_be_clickable(selector)
                     )
                     self.logger.info(
@@ -2447,43 +2262,15 @@ class AltaCatalogoPage:
                 ("CSS verify", "[class*='verify'], [class*='submit']"),
             ]
 
-            elementos_encontrados = []
-
-            for nombre, selector in selectores:
-                try:
-                    if selector.startswith("//"):
-                        # XPath
-                        elementos = self.driver.find_elements(By.XPATH, selector)
-                    else:
-                        # CSS
-                        elementos = self.driver.find_elements(By.CSS_SELECTOR, selector)
-
-                    if elementos:
-                        for i, elemento in enumerate(elementos):
-                            try:
-                                texto = (
-                                    elemento.text
-                                    or elemento.get_attribute("value")
-                                    or elemento.get_attribute("placeholder")
-                                    or "Sin texto"
-                                )
-                                tag = elemento.tag_name
-                                tipo = elemento.get_attribute("type") or "Sin tipo"
-                                clase = elemento.get_attribute("class") or "Sin clase"
-                                id_elem = elemento.get_attribute("id") or "Sin ID"
-
-                                info = f"{nombre} #{i+1}: tag={tag}, type={tipo}, text='{texto}', class='{clase}', id='{id_elem}'"
-                                elementos_encontrados.append(info)
-                                self.logger.info(f"✅ {info}")
-                            except Exception as e:
-                                self.logger.info(
-                                    f"⚠️ {nombre} #{i+1}: Error obteniendo info - {e}"
-                                )
-                    else:
-                        self.logger.info(f"❌ {nombre}: No encontrado")
+            inventario = self._inventario_dom(
+                "debug_elementos_verificar", selector_queries(selectores)
+            )
 
-                except Exception as e:
-                    self.logger.info(f"❌ {nombre}: Error - {e}")
+            elementos_encontrados = [
+                f"{nombre} #{i+1}: {describe_element(elemento)}"
+                for nombre, resultado in inventario.items()
+                for i, elemento in enumerate(resultado["elements"])
+            ]
 
             # Capturar screenshot para análisis
             self._capturar_screenshot("debug_elementos_verificar")
@@ -2604,13 +2391,13 @@ class AltaCatalogoPage:
 
             # Buscar el campo de contraseña
             try:
-                campo_contrasena = WebDriverWait(self.driver, 1).until(
+                campo_contrasena = wait_policy.wait(self.driver, 1).until(
                     EC.presence_of_element_located(self.locators.OKTA_CAMPO_CONTRASENA)
                 )
                 self.logger.info("✅ Campo de contraseña encontrado")
             except TimeoutException:
                 self.logger.info("Intentando con selector alternativo...")
-                campo_contrasena = WebDriverWait(self.driver, 1).until(
+                campo_contrasena = wait_policy.wait(self.driver, 1).until(
                     EC.presence_of_element_located(
                         self.locators.OKTA_CAMPO_CONTRASENA_ALT
                     )
@@ -2665,10 +2452,75 @@ class AltaCatalogoPage:
 
             self.driver.save_screenshot(screenshot_path)
             self.logger.info(f"📸 Screenshot capturado: {screenshot_path}")
+            step_event_log.screenshot(screenshot_path, nombre_archivo)
 
         except Exception as e:
             self.logger.error(f"❌ Error capturando screenshot: {e}")
 
+    def _llenar_campos_por_lotes(self, nombre, valores, campos):
+        """
+        Asigna y verifica varios campos con dos llamadas al navegador
+
+        Args:
+            nombre: Nombre del formulario para el log estructurado
+            valores: Campo -> valor
+            campos: Campo -> locators en orden de preferencia
+
+        Returns:
+            Lista de campos que no quedaron con su valor
+        """
+        resultados = FormFiller(self.driver).fill(valores, campos)
+        for campo, resultado in resultados.items():
+            if resultado["ok"]:
+                self.logger.info(
+                    f"✅ {campo} = '{resultado['value']}' ({resultado['method']})"
+                )
+            else:
+                self.logger.warning(f"⚠️ {campo} no asignado por lotes: {resultado['error']}")
+
+        pendientes = FormFiller.failed(resultados)
+        step_event_log.event(
+            "form_fill",
+            name=nombre,
+            fields=len(resultados),
+            failed=pendientes,
+            cdp=[campo for campo, resultado in resultados.items() if resultado["method"] == "cdp"],
+        )
+        return pendientes
+
+    def _inventario_dom(self, nombre, consultas):
+        """
+        Inventario de elementos en una sola llamada al navegador
+
+        Lo registra como tabla en el log y lo guarda en JSON junto a los
+        screenshots de la ejecución.
+
+        Args:
+            nombre: Nombre del diagnóstico (prefijo del archivo JSON)
+            consultas: Consultas de utils.dom_inventory (selector_queries, tag_queries)
+
+        Returns:
+            Diccionario consulta -> {"count", "elements", "error"}
+        """
+        inventario_dom = DomInventory(self.driver)
+        inventario = inventario_dom.collect(consultas)
+        self.logger.info(f"🔎 Inventario del DOM ({nombre}):\n{format_inventory(inventario)}")
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        carpeta = self.execution_folder or (
+            f"evidences/{datetime.now().strftime('%Y-%m-%d')}/alta_catalogo"
+        )
+        ruta = inventario_dom.save(
+            inventario, os.path.join(carpeta, f"{nombre}_{timestamp}.json")
+        )
+        step_event_log.event(
+            "dom_inventory",
+            name=nombre,
+            path=ruta,
+            counts={consulta: resultado["count"] for consulta, resultado in inventario.items()},
+        )
+        return inventario
+
     def obtener_estado_pagina(self):
         """Obtiene el estado actual de la página"""
         try:
@@ -10,11 +10,14 @@ from datetime import datetime
 
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
 from locators.US13_8_Crear_y_Configurar_una_Nueva_Zafra_locators import (
     AltaZafraLocators,
 )
+from utils.locator_healing import LocatorHealer
+from utils.locator_registry import locator_registry
+from utils.step_event_log import step_event_log
+from utils.wait_policy import wait_policy
 
 
 class AltaZafraPage:
@@ -22,8 +25,9 @@ class AltaZafraPage:
 
     def __init__(self, driver):
         self.driver = driver
-        self.locators = AltaZafraLocators()
-        self.wait = WebDriverWait(driver, 15)
+        self.locators = locator_registry.get(AltaZafraLocators)
+        self.healer = LocatorHealer(driver, self.locators)
+        self.wait = wait_policy.wait(driver, 15)
         self.logger = logging.getLogger(__name__)
         self.execution_folder = None  # Carpeta específica para esta ejecución
 
@@ -82,7 +86,7 @@ class AltaZafraPage:
             self.driver.get(self.locators.URL_LOGIN)
 
             # Esperar solo a que el body esté presente (mínimo necesario) - ULTRA RÁPIDO
-            WebDriverWait(self.driver, 1).until(
+            wait_policy.wait(self.driver, 1).until(
                 EC.presence_of_element_located(self.locators.PAGINA_LOGIN)
             )
 
@@ -93,18 +97,9 @@ class AltaZafraPage:
             self.logger.info("Haciendo clic inmediato en OKTA...")
 
             # Intentar con timeout muy corto (2 segundos)
-            try:
-                boton_okta = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.BOTON_OKTA)
-                )
-                self.logger.info("✅ Botón OKTA encontrado inmediatamente")
-            except TimeoutException:
-                # Si no encuentra con el primer selector, intentar con el alternativo
-                self.logger.info("Intentando con selector alternativo...")
-                boton_okta = WebDriverWait(self.driver, 1).until(
-                    EC.element_to_be_clickable(self.locators.BOTON_OKTA_ALT)
-                )
-                self.logger.info("✅ Botón OKTA encontrado con selector alternativo")
+            boton_okta = self.healer.find(
+                EC.element_to_be_clickable, "BOTON_OKTA", "BOTON_OKTA_ALT", timeout=1
+            )
 
             # Hacer clic inmediato
             boton_okta.click()
@@ -162,7 +157,7 @@ class AltaZafraPage:
 
             for elemento in elementos_okta:
                 try:
-                    WebDriverWait(self.driver, 3).until(
+                    wait_policy.wait(self.driver, 3).until(
                         EC.presence_of_element_located(elemento)
                     )
                     self.logger.info("✅ Elemento de OKTA encontrado")
@@ -185,15 +180,12 @@ class AltaZafraPage:
             )
 
             # Buscar campo de usuario
-            campo_usuario = None
-            try:
-                campo_usuario = WebDriverWait(self.driver, 3).until(
-                    EC.presence_of_element_located(self.locators.OKTA_CAMPO_USUARIO)
-                )
-            except TimeoutException:
-                campo_usuario = WebDriverWait(self.driver, 3).until(
-                    EC.presence_of_element_located(self.locators.OKTA_CAMPO_USUARIO_ALT)
-                )
+            campo_usuario = self.healer.find(
+                EC.presence_of_element_located,
+                "OKTA_CAMPO_USUARIO",
+                "OKTA_CAMPO_USUARIO_ALT",
+                timeout=3,
+            )
 
             # Limpiar campo e ingresar usuario
             campo_usuario.clear()
@@ -201,15 +193,12 @@ class AltaZafraPage:
             self.logger.info("✅ Usuario ingresado")
 
             # Buscar botón Siguiente
-            boton_siguiente = None
-            try:
-                boton_siguiente = WebDriverWait(self.driver, 3).until(
-                    EC.element_to_be_clickable(self.locators.OKTA_BOTON_SIGUIENTE)
-                )
-            except TimeoutException:
-                boton_siguiente = WebDriverWait(self.driver, 3).until(
-                    EC.element_to_be_clickable(self.locators.OKTA_BOTON_SIGUIENTE_ALT)
-                )
+            boton_siguiente = self.healer.find(
+                EC.element_to_be_clickable,
+                "OKTA_BOTON_SIGUIENTE",
+                "OKTA_BOTON_SIGUIENTE_ALT",
+                timeout=3,
+            )
 
             # Hacer clic en Siguiente
             boton_siguiente.click()
@@ -241,7 +230,7 @@ class AltaZafraPage:
 
             for elemento in elementos_contrasena:
                 try:
-                    WebDriverWait(self.driver, 3).until(
+                    wait_policy.wait(self.driver, 3).until(
                         EC.presence_of_element_located(elemento)
                     )
                     self.logger.info("✅ Elemento de página de contraseña encontrado")
@@ -266,11 +255,11 @@ class AltaZafraPage:
             # Buscar campo de contraseña
             campo_contrasena = None
             try:
-                campo_contrasena = WebDriverWait(self.driver, 3).until(
+                campo_contrasena = wait_policy.wait(self.driver, 3).until(
                     EC.presence_of_element_located(self.locators.OKTA_CAMPO_CONTRASENA)
                 )
             except TimeoutException:
-                campo_contrasena = WebDriverWait(self.driver, 3).until(
+                campo_contrasena = wait_policy.wait(self.driver, 3).until(
                     EC.presence_of_element_located(
                         self.locators.OKTA_CAMPO_CONTRASENA_ALT
                     )
@@ -284,7 +273,7 @@ class AltaZafraPage:
             # Buscar botón Verificar con selector específico
             boton_verificar = None
             try:
-                boton_verificar = WebDriverWait(self.driver, 3).until(
+                boton_verificar = wait_policy.wait(self.driver, 3).until(
                     EC.element_to_be_clickable(self.locators.OKTA_BOTON_VERIFICAR)
                 )
                 self.logger.info(
@@ -292,7 +281,7 @@ class AltaZafraPage:
                 )
             except TimeoutException:
                 try:
-                    boton_verificar = WebDriverWait(self.driver, 3).until(
+                    boton_verificar = wait_policy.wait(self.driver, 3).until(
                         EC.element_to_be_clickable(
                             self.locators.OKTA_BOTON_VERIFICAR_ALT
                         )
@@ -301,7 +290,7 @@ class AltaZafraPage:
                         "✅ Botón Verificar encontrado con selector alternativo"
                     )
                 except TimeoutException:
-                    boton_verificar = WebDriverWait(self.driver, 3).until(
+                    boton_verificar = wait_policy.wait(self.driver, 3).until(
                         EC.element_to_be_clickable(
                             self.locators.OKTA_BOTON_VERIFICAR_ALT2
                         )
@@ -374,7 +363,7 @@ class AltaZafraPage:
             elementos_encontrados = 0
             for elemento in elementos_principales:
                 try:
-                    WebDriverWait(self.driver, 5).until(
+                    wait_policy.wait(self.driver, 5).until(
                         EC.presence_of_element_located(elemento)
                     )
                     elementos_encontrados += 1
@@ -405,19 +394,12 @@ class AltaZafraPage:
             self.logger.info("Haciendo clic en Configuración...")
 
             # Buscar el elemento de Configuración
-            elemento_configuracion = None
-            try:
-                elemento_configuracion = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable(self.locators.CONFIGURACION_MENU)
-                )
-                self.logger.info("✅ Elemento Configuración encontrado")
-            except TimeoutException:
-                elemento_configuracion = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable(self.locators.CONFIGURACION_MENU_ALT)
-                )
-                self.logger.info(
-                    "✅ Elemento Configuración encontrado con selector alternativo"
-                )
+            elemento_configuracion = self.healer.find(
+                EC.element_to_be_clickable,
+                "CONFIGURACION_MENU",
+                "CONFIGURACION_MENU_ALT",
+                timeout=5,
+            )
 
             # Hacer clic en Configuración
             elemento_configuracion.click()
@@ -439,19 +421,9 @@ class AltaZafraPage:
             self.logger.info("Haciendo clic en Zafras...")
 
             # Buscar el elemento de Zafras
-            elemento_zafras = None
-            try:
-                elemento_zafras = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable(self.locators.ZAFRAS_MENU)
-                )
-                self.logger.info("✅ Elemento Zafras encontrado")
-            except TimeoutException:
-                elemento_zafras = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable(self.locators.ZAFRAS_MENU_ALT)
-                )
-                self.logger.info(
-                    "✅ Elemento Zafras encontrado con selector alternativo"
-                )
+            elemento_zafras = self.healer.find(
+                EC.element_to_be_clickable, "ZAFRAS_MENU", "ZAFRAS_MENU_ALT", timeout=5
+            )
 
             # Hacer clic en Zafras
             elemento_zafras.click()
@@ -473,19 +445,9 @@ class AltaZafraPage:
             self.logger.info("Haciendo clic en Nueva zafra...")
 
             # Buscar el botón Nueva zafra
-            boton_nueva_zafra = None
-            try:
-                boton_nueva_zafra = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable(self.locators.BOTON_NUEVA_ZAFRA)
-                )
-                self.logger.info("✅ Botón Nueva zafra encontrado")
-            except TimeoutException:
-                boton_nueva_zafra = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable(self.locators.BOTON_NUEVA_ZAFRA_ALT)
-                )
-                self.logger.info(
-                    "✅ Botón Nueva zafra encontrado con selector alternativo"
-                )
+            boton_nueva_zafra = self.healer.find(
+                EC.element_to_be_clickable, "BOTON_NUEVA_ZAFRA", "BOTON_NUEVA_ZAFRA_ALT", timeout=5
+            )
 
             # Hacer clic en Nueva zafra
             boton_nueva_zafra.click()
@@ -515,7 +477,7 @@ class AltaZafraPage:
             elementos_encontrados = 0
             for elemento in elementos_verificar:
                 try:
-                    WebDriverWait(self.driver, 3).until(
+                    wait_policy.wait(self.driver, 3).until(
                         EC.presence_of_element_located(elemento)
                     )
                     elementos_encontrados += 1
@@ -563,6 +525,7 @@ class AltaZafraPage:
             # Capturar screenshot
             self.driver.save_screenshot(ruta_completa)
             self.logger.info(f"📸 Screenshot capturado: {ruta_completa}")
+            step_event_log.screenshot(ruta_completa, nombre_archivo)
 
         except Exception as e:
             self.logger.error(f"❌ Error capturando screenshot: {e}")
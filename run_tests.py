@@ -121,6 +121,22 @@ class TestRunner:
             logger.error(f"❌ Error ejecutando behave: {e}")
             return 1
 
+    def show_history(self, threshold=None):
+        """Actualiza el historial de ejecuciones y muestra regresiones de latencia"""
+        try:
+            from utils.run_history import RunHistoryStore
+
+            store = RunHistoryStore(
+                db_path=self.reports_dir / "run_history.db",
+                reports_dir=self.reports_dir,
+            )
+            store.ingest_reports()
+            store.log_regressions(store.detect_regressions(threshold=threshold))
+            return 0
+        except Exception as e:
+            logger.error(f"❌ Error analizando historial: {e}")
+            return 1
+
     def generate_timestamp_report_dir(self):
         """Genera un directorio de reportes con timestamp"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -184,6 +200,7 @@ Ejemplos de uso:
   python run_tests.py --format json                     # Generar reporte JSON
   python run_tests.py --tags @smoke                     # Ejecutar solo tests con tag @smoke
   python run_tests.py --list-features                   # Listar features disponibles
+  python run_tests.py --history                         # Tendencias y regresiones por step
   python run_tests.py --feature US12_8_Crear_y_Configurar_un_Catalogo --format html  # Feature específico con HTML
         """,
     )
@@ -214,6 +231,18 @@ Ejemplos de uso:
         "--check-deps", action="store_true", help="Verificar dependencias"
     )
 
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Ingerir reportes en el historial y mostrar regresiones de latencia",
+    )
+
+    parser.add_argument(
+        "--regression-threshold",
+        type=float,
+        help="Fracción tolerada sobre el p95 histórico (ej: 0.25 = +25%%)",
+    )
+
     parser.add_argument("--verbose", "-v", action="store_true", help="Salida detallada")
 
     args = parser.parse_args()
@@ -245,6 +274,10 @@ Ejemplos de uso:
         runner.list_features()
         return 0
 
+    # Analizar historial si se solicita
+    if args.history:
+        return runner.show_history(threshold=args.regression_threshold)
+
     # Verificaciones previas
     if not runner.check_dependencies():
         return 1
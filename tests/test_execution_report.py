@@ -0,0 +1,65 @@
+"""
+Pruebas del reporte de ejecución con scenarios reales de behave
+"""
+
+import json
+
+import pytest
+
+behave_model = pytest.importorskip("behave.model")
+from behave.model_core import Status  # noqa: E402
+
+from utils.execution_report_generator import ExecutionReportGenerator  # noqa: E402
+from utils.step_event_log import StepEventLog  # noqa: E402
+
+
+class _Context:
+    """Contexto mínimo de behave para recolectar los datos de la ejecución"""
+
+
+def _scenario_con_eventos(tmp_path):
+    step = behave_model.Step("demo.feature", 2, "Given", "given", "el usuario abre la página")
+    step.status = Status.passed
+    step.duration = 1.25
+    scenario = behave_model.Scenario("demo.feature", 1, "Scenario", "Demo", steps=[step])
+
+    event_log = StepEventLog()
+    context = _Context()
+    context.events_file = event_log.start_scenario("run", "demo", tmp_path / "events.jsonl")
+    event_log.start_step(step.keyword, step.name)
+    event_log.event(
+        "webdriver_commands",
+        commands=3,
+        total_time=0.42,
+        errors=0,
+        slowest={"command": "findElements", "duration": 0.3, "method": "LoginPage.abrir"},
+        by_command=[
+            {"name": "findElements", "count": 2, "time": 0.35},
+            {"name": "clickElement", "count": 1, "time": 0.07},
+        ],
+        by_method=[{"name": "LoginPage.abrir", "count": 3, "time": 0.42}],
+    )
+    event_log.end_step("passed", duration=1.25)
+    event_log.end_scenario("passed")
+    context.overall_status = "SUCCESS"
+    return context, scenario
+
+
+def test_reporte_json_y_html_con_status_de_behave(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    context, scenario = _scenario_con_eventos(tmp_path)
+    generator = ExecutionReportGenerator()
+
+    data = generator.collect_execution_data(context, scenario)
+    html_report, json_report = generator.generate_execution_report(data)
+
+    assert json_report is not None and html_report is not None
+    with open(json_report, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    assert report["steps"][0]["status"] == "passed"
+    assert report["steps"][0]["events"]["webdriver"]["commands"] == 3
+    assert report["summary"]["successful_steps"] == 1
+    with open(html_report, "r", encoding="utf-8") as f:
+        html = f.read()
+    assert "Comandos WebDriver por Paso" in html
+    assert "findElements" in html
@@ -0,0 +1,65 @@
+"""
+Pruebas del historial de ejecuciones con scenarios reales de behave
+"""
+
+import pytest
+
+behave_model = pytest.importorskip("behave.model")
+from behave.model_core import Status  # noqa: E402
+
+from utils.execution_report_generator import ExecutionReportGenerator  # noqa: E402
+from utils.run_history import RunHistoryStore  # noqa: E402
+
+
+class _Context:
+    """Contexto mínimo de behave para recolectar los datos de la ejecución"""
+
+
+def _scenario(durations, status=Status.passed):
+    steps = []
+    for i, duration in enumerate(durations, 1):
+        step = behave_model.Step("demo.feature", i + 1, "Given", "given", f"paso {i}")
+        step.status = status
+        step.duration = duration
+        steps.append(step)
+    return behave_model.Scenario("demo.feature", 1, "Scenario", "Demo", steps=steps)
+
+
+def _execution_data(scenario, execution_date, start_time):
+    data = ExecutionReportGenerator().collect_execution_data(_Context(), scenario)
+    data["execution_info"]["execution_date"] = execution_date
+    data["execution_info"]["start_time"] = start_time
+    return data
+
+
+def test_ingesta_scenario_en_vivo_con_status_de_behave(tmp_path):
+    store = RunHistoryStore(tmp_path / "history.db", reports_dir=tmp_path)
+    scenario = _scenario([1.5, 0.25])
+    assert isinstance(scenario.steps[0].status, Status)
+
+    run_id = store.ingest_execution_data(
+        _execution_data(scenario, "2025-01-04", "10:00:00")
+    )
+
+    assert run_id is not None
+    durations = store.load_step_durations()
+    assert list(durations["status"]) == ["passed", "passed"]
+    assert list(durations["duration"]) == [1.5, 0.25]
+
+
+def test_reingesta_de_ejecucion_antigua_no_es_la_ultima(tmp_path):
+    store = RunHistoryStore(tmp_path / "history.db", reports_dir=tmp_path)
+    antigua = tmp_path / "antigua.json"
+    antigua.write_text("{}")
+    store.ingest_execution_data(
+        _execution_data(_scenario([9.0]), "2025-01-01", "08:00:00"), source=antigua
+    )
+    store.ingest_execution_data(_execution_data(_scenario([1.0]), "2025-01-02", "08:00:00"))
+    # Re-ingerir la ejecución antigua le asigna un run_id mayor
+    store.ingest_execution_data(
+        _execution_data(_scenario([9.0]), "2025-01-01", "08:00:00"), source=antigua
+    )
+
+    durations = store.load_step_durations()
+    assert list(durations["execution_date"]) == ["2025-01-01", "2025-01-02"]
+    assert durations["duration"].iloc[-1] == 1.0
@@ -3,33 +3,95 @@ Sistema de Logging Avanzado para Automatización de Pruebas
 Organización por fecha, feature y resultado para facilitar análisis
 """
 
+import itertools
 import json
 import logging
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .async_logging import async_logging
+from .log_analyzer import StreamingLogAnalyzer
+from .log_rotation import (
+    DEFAULT_BACKUP_COUNT,
+    DEFAULT_MAX_BYTES,
+    CompressedRotatingFileHandler,
+    base_log_path,
+    get_log_segments,
+    is_log_file,
+)
+
 
 class AdvancedLogger:
     """Sistema avanzado de logging con organización automática"""
 
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: str = ".", max_loggers: int = 16):
         self.project_root = Path(project_root)
         self.logs_dir = self.project_root / "logs"
         self.logs_dir.mkdir(exist_ok=True)
 
-        # Cache de loggers para evitar duplicados
-        self._loggers = {}
+        # Registro LRU acotado de loggers por fecha/feature/scenario: al
+        # desalojar uno se cierran sus handlers (fuera del lock del registro)
+        self.max_loggers = max_loggers
+        self._loggers: "OrderedDict[str, logging.Logger]" = OrderedDict()
+        self._registry_lock = threading.Lock()
+        # Sufijo único por logger creado: cerrar uno desalojado nunca afecta
+        # al que lo reemplaza con la misma clave
+        self._logger_ids = itertools.count(1)
+        self._evicted_count = 0
+        self._released_count = 0
+
+        # Analizador de logs en streaming
+        self._log_analyzer = StreamingLogAnalyzer()
+
+        # Rotación de logs por tamaño/antigüedad con segmentos comprimidos
+        self.max_bytes = DEFAULT_MAX_BYTES
+        self.backup_count = DEFAULT_BACKUP_COUNT
+        self.max_age_seconds: Optional[float] = None
+
+        # Log canónico del escenario en curso (lo abre environment.py)
+        self._scenario_log: Optional[Path] = None
+
+    def configure_rotation(
+        self,
+        max_bytes: Optional[int] = None,
+        backup_count: Optional[int] = None,
+        max_age_seconds: Optional[float] = None,
+    ):
+        """
+        Configura la rotación de los logs
 
-    def get_test_logger(
+        Args:
+            max_bytes: Tamaño máximo del log antes de rotar (0 desactiva)
+            backup_count: Número de segmentos comprimidos a conservar
+            max_age_seconds: Antigüedad máxima del log antes de rotar (opcional)
+        """
+        if max_bytes is not None:
+            self.max_bytes = int(max_bytes)
+        if backup_count is not None:
+            self.backup_count = int(backup_count)
+        self.max_age_seconds = max_age_seconds
+
+    def create_log_handler(self, log_file: Path) -> logging.Handler:
+        """Crea el handler de archivo rotativo con la configuración actual"""
+        return CompressedRotatingFileHandler(
+            log_file,
+            max_bytes=self.max_bytes,
+            backup_count=self.backup_count,
+            max_age_seconds=self.max_age_seconds,
+        )
+
+    def get_scenario_log_path(
         self,
         feature_name: str,
         scenario_name: str,
         execution_date: Optional[str] = None,
-    ) -> logging.Logger:
+    ) -> Path:
         """
-        Obtiene un logger configurado para un test específico con organización por fecha
+        Obtiene la ruta canónica del log de un escenario
 
         Args:
             feature_name: Nombre del feature
@@ -37,30 +99,157 @@ class AdvancedLogger:
             execution_date: Fecha de ejecución (opcional, usa fecha actual si no se especifica)
 
         Returns:
-            Logger configurado
+            Ruta logs/<fecha>/<feature>/<scenario>_<timestamp>.log
         """
         if execution_date is None:
             execution_date = datetime.now().strftime("%Y-%m-%d")
 
         # Crear estructura de directorios: logs/fecha/feature/
-        date_dir = self.logs_dir / execution_date.replace("-", "_")
-        feature_dir = date_dir / feature_name
+        feature_dir = self.logs_dir / execution_date.replace("-", "_") / feature_name
         feature_dir.mkdir(parents=True, exist_ok=True)
 
-        # Nombre del archivo de log con timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_filename = f"{scenario_name}_{timestamp}.log"
-        log_file = feature_dir / log_filename
+        return feature_dir / f"{scenario_name}_{timestamp}.log"
+
+    def register_scenario_log(self, log_file: Path):
+        """
+        Registra el log canónico del escenario en curso
+
+        Mientras esté registrado, los loggers de get_test_logger no abren un
+        segundo archivo: sus registros se propagan al log del escenario.
+        """
+        self._scenario_log = Path(log_file)
+
+    def end_scenario_log(self):
+        """Olvida el log del escenario en curso"""
+        self._scenario_log = None
 
-        # Crear logger único para esta ejecución
-        logger_name = f"{execution_date}_{feature_name}_{scenario_name}_{timestamp}"
+    def get_test_logger(
+        self,
+        feature_name: str,
+        scenario_name: str,
+        execution_date: Optional[str] = None,
+    ) -> logging.Logger:
+        """
+        Obtiene un logger configurado para un test específico con organización por fecha
+
+        Args:
+            feature_name: Nombre del feature
+            scenario_name: Nombre del scenario
+            execution_date: Fecha de ejecución (opcional, usa fecha actual si no se especifica)
+
+        Returns:
+            Logger configurado
+        """
+        if execution_date is None:
+            execution_date = datetime.now().strftime("%Y-%m-%d")
 
-        if logger_name not in self._loggers:
-            self._loggers[logger_name] = self._create_logger(
+        # Un único log por escenario: se reutiliza el del escenario en curso
+        if self._scenario_log is not None:
+            log_file = self._scenario_log
+        else:
+            log_file = self.get_scenario_log_path(
+                feature_name, scenario_name, execution_date
+            )
+        key = f"{execution_date}_{feature_name}_{scenario_name}"
+        propagating = self._scenario_log is not None
+
+        evicted = []
+        with self._registry_lock:
+            logger = self._loggers.get(key)
+            # Se reutiliza si escribe al mismo destino (log del escenario o archivo propio)
+            if logger is not None and self._is_propagating(logger.name) == propagating:
+                self._loggers.move_to_end(key)
+                return logger
+            if logger is not None:
+                evicted.append(self._loggers.pop(key).name)
+
+            logger_name = f"{key}_{next(self._logger_ids)}"
+            logger = self._create_logger(
                 logger_name, log_file, feature_name, scenario_name
             )
+            self._loggers[key] = logger
 
-        return self._loggers[logger_name]
+            # Desalojar los loggers menos usados recientemente
+            while len(self._loggers) > self.max_loggers:
+                _, evicted_logger = self._loggers.popitem(last=False)
+                evicted.append(evicted_logger.name)
+                self._evicted_count += 1
+
+        for evicted_name in evicted:
+            self._close_logger(evicted_name)
+        return logger
+
+    def release_test_logger(self, logger) -> bool:
+        """
+        Libera un logger al terminar su escenario, cerrando sus handlers
+
+        Args:
+            logger: Logger (o su nombre) obtenido con get_test_logger
+
+        Returns:
+            True si el logger estaba registrado
+        """
+        name = logger if isinstance(logger, str) else logger.name
+        with self._registry_lock:
+            key = next(
+                (key for key, registered in self._loggers.items() if registered.name == name),
+                None,
+            )
+            if key is None:
+                return False
+            del self._loggers[key]
+            self._released_count += 1
+        # Vaciar la cola y cerrar los handlers puede tardar: sin bloquear el registro
+        self._close_logger(name)
+        return True
+
+    def release_all(self) -> int:
+        """Libera todos los loggers registrados y devuelve cuántos se cerraron"""
+        with self._registry_lock:
+            names = [logger.name for logger in self._loggers.values()]
+            self._loggers.clear()
+            self._released_count += len(names)
+        for name in names:
+            self._close_logger(name)
+        return len(names)
+
+    def get_handler_metrics(self) -> Dict[str, Any]:
+        """
+        Obtiene métricas del registro de loggers y de los handlers abiertos
+
+        Returns:
+            Diccionario con loggers registrados, handlers de archivo abiertos,
+            capacidad del registro y loggers desalojados/liberados
+        """
+        with self._registry_lock:
+            names = [logger.name for logger in self._loggers.values()]
+            evicted = self._evicted_count
+            released = self._released_count
+
+        open_file_handlers = 0
+        for name in names:
+            for handler in async_logging.logger_targets(name):
+                if isinstance(handler, logging.FileHandler) and handler.stream:
+                    open_file_handlers += 1
+
+        return {
+            "registered_loggers": len(names),
+            "max_loggers": self.max_loggers,
+            "open_file_handlers": open_file_handlers,
+            "evicted_loggers": evicted,
+            "released_loggers": released,
+        }
+
+    @staticmethod
+    def _is_propagating(name: str) -> bool:
+        """True si el logger no tiene handlers propios (escribe al log del escenario)"""
+        return not async_logging.logger_targets(name)
+
+    def _close_logger(self, name: str):
+        """Cierra los handlers de un logger y lo retira del registro de logging"""
+        async_logging.remove_logger_targets(name)
+        logging.Logger.manager.loggerDict.pop(name, None)
 
     def _create_logger(
         self, name: str, log_file: Path, feature_name: str, scenario_name: str
@@ -71,7 +260,7 @@ class AdvancedLogger:
         logger.setLevel(logging.DEBUG)
 
         # Evitar duplicar handlers
-        if logger.handlers:
+        if async_logging.has_logger_targets(name):
             return logger
 
         # Formato detallado para archivo
@@ -85,17 +274,24 @@ class AdvancedLogger:
             "%(asctime)s | %(levelname)-8s | %(message)s", datefmt="%H:%M:%S"
         )
 
-        # Handler para archivo
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        # Con un log de escenario activo los registros se propagan a él
+        if self._scenario_log is not None:
+            async_logging.add_logger_targets(name, [])
+            logger.info(f"INICIO DE EJECUCIÓN - {feature_name} - {scenario_name}")
+            return logger
+
+        # Handler para archivo (rotativo, segmentos comprimidos con gzip)
+        file_handler = self.create_log_handler(log_file)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
 
         # Handler para consola
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
+
+        # Los handlers los escribe el listener asíncrono; el logger solo encola
+        async_logging.add_logger_targets(name, [file_handler, console_handler])
 
         # Agregar información inicial al log
         logger.info("=" * 80)
@@ -269,13 +465,13 @@ class AdvancedLogger:
             date: Fecha en formato YYYY-MM-DD
 
         Returns:
-            Lista de archivos de log
+            Lista de archivos de log (los segmentos .gz se agrupan en su log)
         """
         date_dir = self.logs_dir / date.replace("-", "_")
         if not date_dir.exists():
             return []
 
-        return list(date_dir.rglob("*.log"))
+        return self._unique_logs(date_dir.rglob("*.log*"))
 
     def get_logs_by_feature(self, feature_name: str, date: str = None) -> List[Path]:
         """
@@ -286,13 +482,13 @@ class AdvancedLogger:
             date: Fecha específica (opcional)
 
         Returns:
-            Lista de archivos de log
+            Lista de archivos de log (los segmentos .gz se agrupan en su log)
         """
         if date:
             feature_dir = self.logs_dir / date.replace("-", "_") / feature_name
             if not feature_dir.exists():
                 return []
-            return list(feature_dir.glob("*.log"))
+            return self._unique_logs(feature_dir.glob("*.log*"))
         else:
             # Buscar en todas las fechas
             logs = []
@@ -300,8 +496,16 @@ class AdvancedLogger:
                 if date_dir.is_dir():
                     feature_dir = date_dir / feature_name
                     if feature_dir.exists():
-                        logs.extend(feature_dir.glob("*.log"))
-            return logs
+                        logs.extend(feature_dir.glob("*.log*"))
+            return self._unique_logs(logs)
+
+    def _unique_logs(self, paths) -> List[Path]:
+        """Agrupa segmentos rotados bajo la ruta de su log, sin duplicados"""
+        logs = {}
+        for path in paths:
+            if is_log_file(path):
+                logs.setdefault(base_log_path(path), None)
+        return list(logs)
 
     def analyze_log_file(self, log_file: Path) -> Dict[str, Any]:
         """
@@ -327,21 +531,31 @@ class AdvancedLogger:
         }
 
         try:
-            if not log_file.exists():
+            log_file = Path(log_file)
+            segments = get_log_segments(log_file)
+            if not segments:
                 return analysis
 
-            analysis["file_size"] = log_file.stat().st_size
-
-            with open(log_file, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            # El tamaño incluye los segmentos rotados (comprimidos)
+            analysis["file_size"] = sum(s.stat().st_size for s in segments)
+            analysis["segments"] = len(segments)
 
-            analysis["total_lines"] = len(lines)
+            # Recorrido único en streaming (mmap) para no cargar el log en memoria
+            start_time = None
+            end_time = None
 
-            for line in lines:
+            for log_line in self._log_analyzer.iter_lines(
+                log_file, include_rotated=True
+            ):
+                line = log_line.text
                 line_lower = line.lower()
+                analysis["total_lines"] = log_line.number
+
                 if "error" in line_lower:
                     analysis["error_count"] += 1
-                    if "error detected" in line_lower:
+                    if "error detected" in line_lower and (
+                        len(analysis["errors_found"]) < self._log_analyzer.max_errors
+                    ):
                         analysis["errors_found"].append(line.strip())
                 elif "warning" in line_lower:
                     analysis["warning_count"] += 1
@@ -357,16 +571,10 @@ class AdvancedLogger:
                 ):
                     analysis["steps_executed"] += 1
 
-            # Calcular tiempo de ejecución si está disponible
-            start_time = None
-            end_time = None
-
-            for line in lines:
-                if "inicio de ejecución" in line.lower():
-                    # Extraer timestamp del inicio
+                # Calcular tiempo de ejecución si está disponible
+                if "inicio de ejecución" in line_lower:
                     start_time = self._extract_timestamp(line)
-                elif "fin de ejecución" in line.lower():
-                    # Extraer timestamp del fin
+                elif "fin de ejecución" in line_lower:
                     end_time = self._extract_timestamp(line)
 
             if start_time and end_time:
@@ -0,0 +1,210 @@
+"""
+Logging Asíncrono - QueueHandler/QueueListener con un Hilo por Proceso
+Saca la escritura a archivo y consola del hilo que controla WebDriver
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+ROOT_TARGET = ""
+
+
+class DispatchHandler(logging.Handler):
+    """
+    Handler del hilo listener que reparte cada registro a los handlers destino
+
+    Los destinos registrados con ROOT_TARGET reciben todos los registros (como
+    los handlers del root logger); los registrados con el nombre de un logger
+    solo reciben los registros de ese logger y sus hijos.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._targets: Dict[str, List[logging.Handler]] = {}
+        self._targets_lock = threading.Lock()
+
+    def set_targets(self, name: str, handlers: List[logging.Handler]):
+        """Reemplaza los handlers destino de un nombre, cerrando los anteriores"""
+        with self._targets_lock:
+            previous = self._targets.get(name, [])
+            self._targets[name] = list(handlers)
+        self._close_handlers(previous)
+
+    def remove_targets(self, name: str) -> int:
+        """Quita y cierra los handlers destino de un nombre"""
+        with self._targets_lock:
+            previous = self._targets.pop(name, [])
+        self._close_handlers(previous)
+        return len(previous)
+
+    def has_targets(self, name: str) -> bool:
+        """Indica si hay handlers destino registrados para un nombre"""
+        with self._targets_lock:
+            return name in self._targets
+
+    def get_targets(self, name: str) -> List[logging.Handler]:
+        """Devuelve los handlers destino registrados para un nombre"""
+        with self._targets_lock:
+            return list(self._targets.get(name, []))
+
+    def target_handlers(self) -> List[logging.Handler]:
+        """Devuelve todos los handlers destino registrados"""
+        with self._targets_lock:
+            return [h for handlers in self._targets.values() for h in handlers]
+
+    def handle(self, record: logging.LogRecord):
+        with self._targets_lock:
+            targets = [
+                handler
+                for name, handlers in self._targets.items()
+                if name == ROOT_TARGET
+                or record.name == name
+                or record.name.startswith(name + ".")
+                for handler in handlers
+            ]
+        for handler in targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        self.handle(record)
+
+    def flush(self):
+        for handler in self.target_handlers():
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+    def _close_handlers(self, handlers: List[logging.Handler]):
+        for handler in handlers:
+            try:
+                handler.flush()
+                handler.close()
+            except Exception:
+                pass
+
+
+class AsyncLogging:
+    """Gestor del único QueueListener del proceso"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self.queue = None
+        self.queue_handler = None
+        self.dispatcher = None
+        self.listener = None
+
+    def _ensure_started(self):
+        """Arranca el listener (una vez por proceso, también tras un fork)"""
+        with self._lock:
+            if self.listener is not None and self._pid == os.getpid():
+                return
+
+            # Tras un fork el QueueHandler heredado ya no tiene listener
+            if self.queue_handler is not None:
+                logging.getLogger().removeHandler(self.queue_handler)
+
+            self._pid = os.getpid()
+            self.queue = queue.Queue(-1)
+            self.queue_handler = logging.handlers.QueueHandler(self.queue)
+            self.dispatcher = DispatchHandler()
+            self.listener = logging.handlers.QueueListener(
+                self.queue, self.dispatcher, respect_handler_level=False
+            )
+            self.listener.start()
+
+    def install_root(self, handlers: Optional[List[logging.Handler]] = None):
+        """
+        Deja el QueueHandler como único handler del root logger
+
+        Args:
+            handlers: Handlers reales (archivo, consola) que escribirá el listener;
+                reemplazan a los registrados previamente para el root
+        """
+        self._ensure_started()
+        root_logger = logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            if handler is not self.queue_handler:
+                root_logger.removeHandler(handler)
+        if self.queue_handler not in root_logger.handlers:
+            root_logger.addHandler(self.queue_handler)
+        if handlers is not None:
+            self.flush()
+            self.dispatcher.set_targets(ROOT_TARGET, handlers)
+
+    def ensure_root_queue(self):
+        """Agrega el QueueHandler al root logger sin quitar otros handlers"""
+        self._ensure_started()
+        root_logger = logging.getLogger()
+        if self.queue_handler not in root_logger.handlers:
+            root_logger.addHandler(self.queue_handler)
+
+    def add_logger_targets(self, logger_name: str, handlers: List[logging.Handler]):
+        """Registra handlers reales para los registros de un logger específico"""
+        self.ensure_root_queue()
+        self.dispatcher.set_targets(logger_name, handlers)
+
+    def remove_logger_targets(self, logger_name: str) -> int:
+        """Quita y cierra los handlers de un logger, vaciando antes la cola"""
+        if self.dispatcher is None:
+            return 0
+        self.flush()
+        return self.dispatcher.remove_targets(logger_name)
+
+    def has_logger_targets(self, logger_name: str) -> bool:
+        """Indica si un logger tiene handlers reales registrados"""
+        return self.dispatcher is not None and self.dispatcher.has_targets(logger_name)
+
+    def logger_targets(self, logger_name: str) -> List[logging.Handler]:
+        """Devuelve los handlers reales registrados para un logger"""
+        if self.dispatcher is None:
+            return []
+        return self.dispatcher.get_targets(logger_name)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Espera a que el listener procese todos los registros encolados
+
+        Args:
+            timeout: Tiempo máximo de espera en segundos
+
+        Returns:
+            True si la cola quedó vacía dentro del tiempo límite
+        """
+        if self.listener is None or self._pid != os.getpid():
+            return True
+
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.dispatcher.flush()
+        return not self.queue.unfinished_tasks
+
+    def shutdown(self):
+        """Detiene el listener y cierra todos los handlers destino"""
+        with self._lock:
+            if self.listener is None or self._pid != os.getpid():
+                return
+            logging.getLogger().removeHandler(self.queue_handler)
+            self.listener.stop()
+            for handler in self.dispatcher.target_handlers():
+                try:
+                    handler.flush()
+                    handler.close()
+                except Exception:
+                    pass
+            self.listener = None
+
+
+# Instancia global para uso fácil
+async_logging = AsyncLogging()
+atexit.register(async_logging.shutdown)
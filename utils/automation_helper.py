@@ -11,6 +11,7 @@ from typing import Any, Dict
 from .advanced_logger import advanced_logger
 from .code_reuse_helper import CodeReuseHelper
 from .element_validator import ElementValidator
+from .log_rotation import is_log_file
 from .pdf_generator import PDFGenerator
 
 
@@ -234,6 +235,10 @@ class AutomationHelper:
 
             self.logger.error(f"❌ Prueba falló: {str(e)}")
 
+        finally:
+            # Cerrar los handlers del logger de esta ejecución
+            advanced_logger.release_test_logger(test_logger)
+
         return execution_result
 
     def generate_complete_report(
@@ -440,7 +445,9 @@ class AutomationHelper:
             # Limpiar logs
             logs_dir = self.project_root / "logs"
             if logs_dir.exists():
-                for log_file in logs_dir.rglob("*.log"):
+                for log_file in logs_dir.rglob("*.log*"):
+                    if not is_log_file(log_file):
+                        continue
                     if datetime.fromtimestamp(log_file.stat().st_mtime) < cutoff_date:
                         cleanup_stats["total_size_freed"] += log_file.stat().st_size
                         log_file.unlink()
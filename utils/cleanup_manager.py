@@ -1,468 +1,937 @@
 """
 Gestor de Limpieza - Eliminación de Evidencias y Logs Antiguos
+Inventario único del sistema de archivos (os.scandir + pool de hilos) para
+estadísticas, vista previa y eliminación
 """
 
+import bisect
+import heapq
 import os
+import re
 import shutil
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
 
+from .evidence_manager import EXECUTION_RESULTS_FILE, read_execution_results
+
+# Fecha en el nombre de un artefacto: 2025-09-04, 2025_09_04 o run_20250904_...
+DATE_IN_NAME_PATTERN = re.compile(r'(?<!\d)(\d{4})[-_]?(\d{2})[-_]?(\d{2})(?!\d)')
+
+# Carpetas organizadas de documentación (nombres actuales y con emoji)
+ORGANIZED_DOC_FOLDERS = {
+    'EXITOSOS', 'FALLIDOS', 'PARCIALES', 'DESCONOCIDOS',
+    '✅_EXITOSOS', '❌_FALLIDOS', '⚠️_PARCIALES', '❓_DESCONOCIDOS'
+}
+
+# Archivos sueltos que no se consideran estructura antigua
+PROTECTED_FILES = {
+    'docs': {'README.md'},
+    'reports': {
+        'run_history.db', 'run_history.db-wal', 'run_history.db-shm', 'run_history.db-journal',
+        '.cleanup.lock', 'locator_profile.json', 'healed_locators.json',
+        os.path.basename(EXECUTION_RESULTS_FILE)
+    }
+}
+
+# Carpetas sin fecha que no se consideran estructura antigua (el archivo de
+# evidencias lo administra el EvidenceManager)
+PROTECTED_DIRS = {
+    'evidences': {'archive'}
+}
+
+# Prefijo de los artefactos de un fallo (screenshot final, carpetas FAILED_<ts>)
+FAILED_PREFIX = 'FAILED'
+
+# Reportes de limpieza sueltos en reports/: se conservan durante la retención
+CLEANUP_REPORT_PATTERN = re.compile(r'^cleanup_report_\d{8}_\d{6}\.json$')
+
+# Archivos de estado que la cuota de disco nunca desaloja
+QUOTA_EXEMPT_FILES = set().union(*PROTECTED_FILES.values())
+
+CATEGORIES = ('evidences', 'logs', 'reports', 'docs')
+
+# Categorías con cuota de disco (la documentación nunca se desaloja por cuota)
+QUOTA_CATEGORIES = ('evidences', 'logs', 'reports')
+
+# Carpeta de una ejecución: FAILED_20250904_194747, execution_20250904_194747, run_...
+RUN_FOLDER_PATTERN = re.compile(r'^(SUCCESS|FAILED|PARTIAL|UNKNOWN|execution|run)_\d{8}_\d{6}')
+
+# Timestamp que agrupa los archivos de una misma ejecución (log, segmentos, eventos, reportes)
+RUN_TIMESTAMP_PATTERN = re.compile(r'\d{8}_\d{6}')
+
+# Rutas de artefactos citadas en la documentación (entre comillas invertidas)
+DOC_REFERENCE_PATTERN = re.compile(r'`((?:evidences|logs|reports)[/\\][^`]+)`')
+
+# Archivo de bloqueo para que un solo worker limpie a la vez
+CLEANUP_LOCK_FILE = '.cleanup.lock'
+
+
+class CleanupCancelled(Exception):
+    """La limpieza en segundo plano fue cancelada"""
+
+
 class CleanupManager:
     """Gestor de limpieza de evidencias y logs antiguos que no están en la nueva estructura"""
-    
+
     def __init__(self, config=None):
         self.logger = logging.getLogger(__name__)
         self.config = config or {}
-        
+
         # Configuración por defecto
         self.cleanup_old_evidence = self.config.get('cleanup_old_evidence', True)
         self.cleanup_old_logs = self.config.get('cleanup_old_logs', True)
         self.cleanup_old_reports = self.config.get('cleanup_old_reports', True)
         self.cleanup_old_docs = self.config.get('cleanup_old_docs', True)
-        
+
         # Días de retención
         self.evidence_retention_days = self.config.get('evidence_retention_days', 30)
         self.logs_retention_days = self.config.get('logs_retention_days', 30)
         self.reports_retention_days = self.config.get('reports_retention_days', 30)
         self.docs_retention_days = self.config.get('docs_retention_days', 30)
-    
-    def cleanup_old_files(self):
-        """Limpia archivos antiguos que no están en la nueva estructura"""
+
+        # Directorio base y paralelismo del inventario
+        self.base_dir = Path(self.config.get('base_dir', '.'))
+        self.inventory_workers = self.config.get('inventory_workers', 8)
+
+        # Cuota de disco en MB por categoría (p. ej. {"evidences": 500, "logs": 200})
+        self.quota_mb = {
+            category: quota for category, quota in self.config.get('quota_mb', {}).items()
+            if category in QUOTA_CATEGORIES and quota is not None
+        }
+        # Las ejecuciones más recientes que esto nunca se desalojan (pueden estar en curso)
+        self.quota_protect_recent_minutes = self.config.get('quota_protect_recent_minutes', 60)
+        self.last_quota_summary = None
+        self._quota_thread = None
+
+        # Limpieza de sesión en segundo plano: cancelación, bloqueo y pausa de E/S
+        self.io_delay = 0.0
+        self.background_io_delay_ms = self.config.get('background_io_delay_ms', 5)
+        self.background_workers = self.config.get('background_workers', 2)
+        self.lock_stale_minutes = self.config.get('lock_stale_minutes', 60)
+        self.last_session_summary = None
+        self._cancel_event = threading.Event()
+        self._background_thread = None
+
+    def _enabled_categories(self):
+        """Categorías habilitadas para limpieza"""
+        enabled = {
+            'evidences': self.cleanup_old_evidence,
+            'logs': self.cleanup_old_logs,
+            'reports': self.cleanup_old_reports,
+            'docs': self.cleanup_old_docs
+        }
+        return [category for category in CATEGORIES if enabled[category]]
+
+    def _retention_days(self, category):
+        """Días de retención de una categoría"""
+        return {
+            'evidences': self.evidence_retention_days,
+            'logs': self.logs_retention_days,
+            'reports': self.reports_retention_days,
+            'docs': self.docs_retention_days
+        }[category]
+
+    def build_inventory(self, categories=None):
+        """
+        Construye el inventario de artefactos en una sola pasada
+
+        Cada entrada corresponde a un elemento de primer nivel de evidences/,
+        logs/, reports/ o docs/ con su categoría, fecha, tamaño, número de
+        archivos, última modificación y acción de limpieza ('legacy', 'expired'
+        o None si se conserva).
+
+        Args:
+            categories: Categorías a inventariar (por defecto todas)
+
+        Returns:
+            Lista de entradas del inventario
+        """
+        now = datetime.now()
+        inventory = []
+
+        for category in categories or CATEGORIES:
+            category_dir = self.base_dir / category
+            try:
+                with os.scandir(category_dir) as entries:
+                    for dir_entry in entries:
+                        entry = self._classify_entry(category, dir_entry, now)
+                        if entry:
+                            inventory.append(entry)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                self.logger.warning(f"Error inventariando {category_dir}: {str(e)}")
+
+        self._measure_directories(inventory)
+        self._protect_failed_legacy(inventory, now)
+        return inventory
+
+    def _protect_failed_legacy(self, inventory, now):
+        """
+        Conserva durante la retención las carpetas antiguas con evidencia de fallos
+
+        Una carpeta sin fecha que contiene artefactos FAILED_* o la evidencia
+        o el log de una ejecución fallida del registro de resultados solo se
+        elimina cuando su última modificación supera la retención.
+        """
+        legacy = [entry for entry in inventory if entry['action'] == 'legacy' and entry['is_dir']]
+        if not legacy:
+            return
+        failed_paths = self._load_run_windows()['failed_paths']
+        for entry in legacy:
+            root = os.path.normpath(entry['path'])
+            if not entry['failed']:
+                entry['failed'] = any(
+                    path == root or path.startswith(root + os.sep) for path in failed_paths
+                )
+            if entry['failed']:
+                cutoff = now - timedelta(days=self._retention_days(entry['category']))
+                entry['action'] = 'expired' if datetime.fromtimestamp(entry['mtime']) < cutoff else None
+
+    def _classify_entry(self, category, dir_entry, now):
+        """Crea la entrada de inventario de un elemento y decide su acción"""
+        try:
+            is_dir = dir_entry.is_dir(follow_symlinks=False)
+            stat = dir_entry.stat(follow_symlinks=False)
+        except OSError:
+            return None
+
+        name = dir_entry.name
+        date = self._parse_date(name)
+        cutoff = now - timedelta(days=self._retention_days(category))
+        action = None
+
+        if category in ('evidences', 'logs'):
+            if is_dir:
+                # Si no es una carpeta de fecha, es estructura antigua
+                if name in PROTECTED_DIRS.get(category, ()):
+                    pass
+                elif not self._is_date_folder(name):
+                    action = 'legacy'
+                elif date < cutoff:
+                    action = 'expired'
+        elif category == 'reports':
+            if not is_dir:
+                if CLEANUP_REPORT_PATTERN.match(name):
+                    # Los reportes de limpieza de sesiones anteriores vencen por fecha
+                    if date and date < cutoff:
+                        action = 'expired'
+                # El resto de archivos sueltos son estructura antigua
+                elif name not in PROTECTED_FILES['reports']:
+                    action = 'legacy'
+            elif date and date < cutoff:
+                action = 'expired'
+        elif category == 'docs':
+            if not is_dir:
+                if dir_entry.name.endswith('.md') and name not in PROTECTED_FILES['docs']:
+                    # Los resúmenes diarios se conservan durante la retención
+                    if date is None:
+                        action = 'legacy'
+                    elif date < cutoff:
+                        action = 'expired'
+            elif name not in ORGANIZED_DOC_FOLDERS:
+                action = 'legacy'
+
+        return {
+            'category': category,
+            'path': dir_entry.path,
+            'name': name,
+            'is_dir': is_dir,
+            'date': date,
+            'size': 0 if is_dir else stat.st_size,
+            'files': 0 if is_dir else 1,
+            'mtime': stat.st_mtime,
+            'failed': name.startswith(FAILED_PREFIX),
+            'action': action
+        }
+
+    def _measure_directories(self, inventory):
+        """
+        Calcula tamaño, archivos y última modificación de los directorios
+
+        Recorre el árbol por niveles: cada nivel se reparte entre los hilos del
+        pool, de modo que las llamadas a stat de directorios grandes se hacen en
+        paralelo sin que una tarea espere a otra.
+        """
+        pending = [(entry, entry['path']) for entry in inventory if entry['is_dir']]
+        if not pending:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.inventory_workers) as pool:
+            while pending:
+                results = pool.map(self._scan_directory, [path for _, path in pending])
+                next_level = []
+                for (entry, _), (size, files, newest, subdirs, failed) in zip(pending, results):
+                    entry['size'] += size
+                    entry['files'] += files
+                    entry['mtime'] = max(entry['mtime'], newest)
+                    entry['failed'] = entry['failed'] or failed
+                    next_level.extend((entry, subdir) for subdir in subdirs)
+                pending = next_level
+
+    def _scan_directory(self, path):
+        """
+        Lee un directorio con os.scandir
+
+        Returns:
+            (tamaño, archivos, mtime, subdirectorios, si contiene artefactos FAILED_*)
+        """
+        self._throttle()
+        size = 0
+        files = 0
+        newest = 0.0
+        subdirs = []
+        failed = False
+        try:
+            with os.scandir(path) as entries:
+                for dir_entry in entries:
+                    try:
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            subdirs.append(dir_entry.path)
+                            continue
+                        stat = dir_entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    size += stat.st_size
+                    files += 1
+                    newest = max(newest, stat.st_mtime)
+                    failed = failed or dir_entry.name.startswith(FAILED_PREFIX)
+        except OSError as e:
+            self.logger.warning(f"Error leyendo {path}: {str(e)}")
+        return size, files, newest, subdirs, failed
+
+    def cleanup_old_files(self, dry_run=False, inventory=None, generate_report=True):
+        """
+        Limpia archivos antiguos que no están en la nueva estructura
+
+        Args:
+            dry_run: Si es True solo devuelve lo que se eliminaría
+            inventory: Inventario ya construido (opcional)
+            generate_report: Si se escribe el reporte de limpieza al terminar
+
+        Returns:
+            Resumen de la limpieza
+        """
         try:
             self.logger.info("Iniciando limpieza de archivos antiguos...")
-            
+
             cleanup_summary = {
                 'evidences_cleaned': 0,
                 'logs_cleaned': 0,
                 'reports_cleaned': 0,
                 'docs_cleaned': 0,
                 'total_size_freed': 0,
+                'dry_run': dry_run,
+                'items': [],
                 'errors': []
             }
-            
-            # Limpiar evidencias antiguas
-            if self.cleanup_old_evidence:
-                evidences_cleaned, size_freed = self._cleanup_old_evidences()
-                cleanup_summary['evidences_cleaned'] = evidences_cleaned
-                cleanup_summary['total_size_freed'] += size_freed
-            
-            # Limpiar logs antiguos
-            if self.cleanup_old_logs:
-                logs_cleaned, size_freed = self._cleanup_old_logs()
-                cleanup_summary['logs_cleaned'] = logs_cleaned
-                cleanup_summary['total_size_freed'] += size_freed
-            
-            # Limpiar reportes antiguos
-            if self.cleanup_old_reports:
-                reports_cleaned, size_freed = self._cleanup_old_reports()
-                cleanup_summary['reports_cleaned'] = reports_cleaned
-                cleanup_summary['total_size_freed'] += size_freed
-            
-            # Limpiar documentación antigua
-            if self.cleanup_old_docs:
-                docs_cleaned, size_freed = self._cleanup_old_docs()
-                cleanup_summary['docs_cleaned'] = docs_cleaned
-                cleanup_summary['total_size_freed'] += size_freed
-            
+
+            categories = self._enabled_categories()
+            if inventory is None:
+                inventory = self.build_inventory(categories)
+
+            for entry in inventory:
+                if not entry['action'] or entry['category'] not in categories:
+                    continue
+
+                if self._cancel_event.is_set():
+                    cleanup_summary['cancelled'] = True
+                    break
+
+                if not dry_run:
+                    error = self._remove_entry(entry)
+                    if error:
+                        cleanup_summary['errors'].append(error)
+                        continue
+
+                cleanup_summary[f"{entry['category']}_cleaned"] += 1
+                cleanup_summary['total_size_freed'] += entry['size']
+                cleanup_summary['items'].append({
+                    'path': entry['path'],
+                    'category': entry['category'],
+                    'reason': entry['action'],
+                    'size': entry['size']
+                })
+
+            if dry_run:
+                cleanup_summary['total_size_freed_mb'] = round(cleanup_summary['total_size_freed'] / (1024 * 1024), 2)
+                self.logger.info(f"Vista previa de limpieza: {len(cleanup_summary['items'])} elementos")
+                return cleanup_summary
+
             # Generar reporte de limpieza
-            self._generate_cleanup_report(cleanup_summary)
-            
-            self.logger.info(f"Limpieza completada: {cleanup_summary}")
+            if generate_report:
+                self._generate_cleanup_report(cleanup_summary)
+
+            self.logger.info(
+                f"Limpieza completada: {cleanup_summary['evidences_cleaned']} evidencias, "
+                f"{cleanup_summary['logs_cleaned']} logs, {cleanup_summary['reports_cleaned']} reportes, "
+                f"{cleanup_summary['docs_cleaned']} docs, {cleanup_summary['total_size_freed']} bytes liberados"
+            )
             return cleanup_summary
-            
+
+        except CleanupCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Error en limpieza de archivos antiguos: {str(e)}")
             return None
-    
-    def _cleanup_old_evidences(self):
-        """Limpia evidencias antiguas que no están en la nueva estructura"""
+
+    def preview_cleanup(self):
+        """Devuelve lo que eliminaría cleanup_old_files sin eliminar nada"""
+        return self.cleanup_old_files(dry_run=True)
+
+    def build_run_inventory(self, categories=None):
+        """
+        Construye el inventario por ejecución usado por la cuota de disco
+
+        Una unidad es una carpeta de ejecución (FAILED_<ts>, execution_<ts>,
+        run_<ts>...) o el grupo de archivos sueltos de una carpeta que
+        pertenecen a la misma ejecución (log, segmentos .gz, eventos, reportes
+        y screenshots). La ejecución y su resultado salen del registro de
+        resultados del EvidenceManager: un archivo pertenece a la ejecución en
+        cuya ventana inicio-fin cae el timestamp de su nombre. Los archivos
+        sin ejecución registrada se agrupan por timestamp.
+
+        Args:
+            categories: Categorías a inventariar (por defecto las de cuota)
+
+        Returns:
+            Lista de unidades con categoría, ruta, archivos, tamaño, último uso
+            y si corresponde a una ejecución fallida
+        """
+        units = []
+        windows = self._load_run_windows()
+        with ThreadPoolExecutor(max_workers=self.inventory_workers) as pool:
+            for category in categories or QUOTA_CATEGORIES:
+                pending = [str(self.base_dir / category)]
+                while pending:
+                    next_level = []
+                    for path, (groups, run_dirs, subdirs) in zip(
+                        pending, pool.map(self._scan_run_units, pending)
+                    ):
+                        for key, group in self._group_by_run(path, groups, windows).items():
+                            unit = self._new_unit(category, key, group['files'], group['size'], group['last_used'])
+                            unit['failed'] = unit['failed'] or group['failed']
+                            units.append(unit)
+                        for run_dir, last_used in run_dirs:
+                            unit = self._new_unit(category, run_dir, None, 0, last_used)
+                            unit['is_dir'] = True
+                            window = self._find_window(os.path.basename(run_dir), windows)
+                            unit['failed'] = (
+                                unit['failed']
+                                or (window is not None and window['failed'])
+                                or os.path.normpath(run_dir) in windows['failed_paths']
+                            )
+                            units.append(unit)
+                        next_level.extend(subdirs)
+                    pending = next_level
+
+        self._measure_directories(units)
+        for unit in units:
+            if unit['is_dir']:
+                unit['last_used'] = max(unit['last_used'], unit['mtime'])
+        return units
+
+    def _load_run_windows(self):
+        """
+        Ventanas de ejecución del registro de resultados
+
+        Las ventanas que se solapan (ejecuciones en paralelo) se fusionan y la
+        fusión cuenta como fallida si alguna de sus ejecuciones falló.
+
+        Returns:
+            {"starts": inicios ordenados, "windows": ventanas disjuntas
+            {"start", "end", "failed"}, "failed_paths": evidencias y logs de
+            ejecuciones fallidas}
+        """
+        entries = read_execution_results(str(self.base_dir / EXECUTION_RESULTS_FILE))
+        windows = []
+        failed_paths = set()
+        for entry in sorted(entries, key=lambda item: item['started_at']):
+            failed = entry.get('status') not in ('SUCCESS', 'PASSED')
+            if failed:
+                for key in ('evidence_dir', 'log_file'):
+                    if entry.get(key):
+                        failed_paths.add(os.path.normpath(str(self.base_dir / entry[key])))
+            start, end = entry['started_at'], entry.get('finished_at') or entry['started_at']
+            if windows and start <= windows[-1]['end']:
+                windows[-1]['end'] = max(windows[-1]['end'], end)
+                windows[-1]['failed'] = windows[-1]['failed'] or failed
+            else:
+                windows.append({'start': start, 'end': end, 'failed': failed})
+        return {
+            'starts': [window['start'] for window in windows],
+            'windows': windows,
+            'failed_paths': failed_paths
+        }
+
+    def _find_window(self, name, windows):
+        """Ventana de ejecución que contiene el timestamp del nombre, o None"""
+        match = RUN_TIMESTAMP_PATTERN.search(name)
+        if not match:
+            return None
+        index = bisect.bisect_right(windows['starts'], match.group(0)) - 1
+        if index >= 0 and match.group(0) <= windows['windows'][index]['end']:
+            return windows['windows'][index]
+        return None
+
+    def _group_by_run(self, path, groups, windows):
+        """Fusiona los grupos por timestamp de una carpeta en grupos por ejecución"""
+        merged = {}
+        for key, group in groups.items():
+            window = self._find_window(os.path.basename(key), windows)
+            if window is not None:
+                key = os.path.join(path, window['start'])
+            target = merged.setdefault(
+                key, {'files': [], 'size': 0, 'last_used': 0.0, 'failed': False}
+            )
+            target['files'].extend(group['files'])
+            target['size'] += group['size']
+            target['last_used'] = max(target['last_used'], group['last_used'])
+            target['failed'] = (
+                target['failed']
+                or (window is not None and window['failed'])
+                or any(os.path.normpath(f) in windows['failed_paths'] for f in group['files'])
+            )
+        return merged
+
+    def _new_unit(self, category, path, files, size, last_used):
+        """Crea una unidad del inventario por ejecución"""
+        parts = set(Path(path).parts)
+        name = Path(path).name
+        return {
+            'category': category,
+            'path': path,
+            'is_dir': False,
+            'paths': files or [],
+            'files': len(files) if files else 0,
+            'size': size,
+            'mtime': last_used,
+            'last_used': last_used,
+            'failed': 'FALLIDOS' in parts or name.startswith(FAILED_PREFIX)
+        }
+
+    def _scan_run_units(self, path):
+        """Lee un directorio y separa grupos de archivos, carpetas de ejecución y subdirectorios"""
+        self._throttle()
+        groups = {}
+        run_dirs = []
+        subdirs = []
         try:
-            evidences_dir = Path("evidences")
-            if not evidences_dir.exists():
-                return 0, 0
-            
-            cleaned_count = 0
-            total_size_freed = 0
-            
-            # Limpiar estructura antigua (sin fecha)
-            for feature_dir in evidences_dir.iterdir():
-                if not feature_dir.is_dir():
-                    continue
-                
-                # Si no es una carpeta de fecha (YYYY-MM-DD), es estructura antigua
-                if not self._is_date_folder(feature_dir.name):
-                    self.logger.info(f"Eliminando estructura antigua de evidencias: {feature_dir}")
-                    
-                    # Calcular tamaño antes de eliminar
-                    size = self._get_directory_size(feature_dir)
-                    total_size_freed += size
-                    
-                    # Eliminar directorio
-                    shutil.rmtree(feature_dir)
-                    cleaned_count += 1
-            
-            # Limpiar evidencias por fecha (más antiguas que retention_days)
-            cutoff_date = datetime.now() - timedelta(days=self.evidence_retention_days)
-            
-            for date_dir in evidences_dir.iterdir():
-                if not date_dir.is_dir() or not self._is_date_folder(date_dir.name):
-                    continue
-                
-                try:
-                    folder_date = datetime.strptime(date_dir.name, "%Y-%m-%d")
-                    if folder_date < cutoff_date:
-                        self.logger.info(f"Eliminando evidencias antiguas: {date_dir}")
-                        
-                        # Calcular tamaño antes de eliminar
-                        size = self._get_directory_size(date_dir)
-                        total_size_freed += size
-                        
-                        # Eliminar directorio
-                        shutil.rmtree(date_dir)
-                        cleaned_count += 1
-                        
-                except ValueError:
-                    # Si no se puede parsear la fecha, mantener el directorio
+            with os.scandir(path) as entries:
+                for dir_entry in entries:
+                    try:
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            if RUN_FOLDER_PATTERN.match(dir_entry.name):
+                                stat = dir_entry.stat(follow_symlinks=False)
+                                run_dirs.append((dir_entry.path, stat.st_mtime))
+                            else:
+                                subdirs.append(dir_entry.path)
+                            continue
+                        stat = dir_entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if dir_entry.name in QUOTA_EXEMPT_FILES:
+                        continue
+
+                    match = RUN_TIMESTAMP_PATTERN.search(dir_entry.name)
+                    key = os.path.join(path, match.group(0)) if match else dir_entry.path
+                    group = groups.setdefault(key, {'files': [], 'size': 0, 'last_used': 0.0})
+                    group['files'].append(dir_entry.path)
+                    group['size'] += stat.st_size
+                    group['last_used'] = max(group['last_used'], stat.st_mtime)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Error leyendo {path}: {str(e)}")
+        return groups, run_dirs, subdirs
+
+    def _get_doc_references(self):
+        """Rutas de logs, evidencias y reportes citadas en la documentación existente"""
+        references = set()
+        docs_dir = self.base_dir / 'docs'
+        pending = [str(docs_dir)]
+        while pending:
+            path = pending.pop()
+            try:
+                with os.scandir(path) as entries:
+                    for dir_entry in entries:
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            pending.append(dir_entry.path)
+                        elif dir_entry.name.endswith('.md'):
+                            try:
+                                with open(dir_entry.path, 'r', encoding='utf-8', errors='replace') as f:
+                                    content = f.read()
+                            except OSError:
+                                continue
+                            for reference in DOC_REFERENCE_PATTERN.findall(content):
+                                references.add(os.path.normpath(reference.replace('\\', '/')))
+            except OSError:
+                continue
+        return references
+
+    def _is_referenced(self, unit, references):
+        """Indica si alguna ruta citada en la documentación pertenece a la unidad"""
+        if unit['is_dir']:
+            unit_path = os.path.normpath(os.path.relpath(unit['path'], self.base_dir))
+            return any(ref == unit_path or ref.startswith(unit_path + os.sep) for ref in references)
+
+        for file_path in unit['paths']:
+            relative = os.path.normpath(os.path.relpath(file_path, self.base_dir))
+            # Los segmentos rotados y eventos se protegen junto con su log citado
+            if relative in references or re.sub(r'\.\d+\.gz$', '', relative) in references:
+                return True
+        return False
+
+    def enforce_quota(self, dry_run=False, generate_report=True):
+        """
+        Aplica la cuota de disco por categoría desalojando las ejecuciones menos usadas
+
+        Por cada categoría que supera su cuota se arma un heap por último uso
+        y se eliminan primero las ejecuciones más antiguas. Nunca se desalojan
+        ejecuciones fallidas, ejecuciones citadas en la documentación ni
+        ejecuciones recientes (quota_protect_recent_minutes).
+
+        Args:
+            dry_run: Si es True solo devuelve lo que se desalojaría
+            generate_report: Si se escribe el reporte de limpieza al terminar
+
+        Returns:
+            Resumen con el estado de cada categoría y los elementos desalojados
+        """
+        summary = {
+            'mode': 'quota',
+            'dry_run': dry_run,
+            'quota_mb': dict(self.quota_mb),
+            'categories': {},
+            'total_size_freed': 0,
+            'items': [],
+            'errors': []
+        }
+        if not self.quota_mb:
+            return summary
+
+        try:
+            units = self.build_run_inventory(list(self.quota_mb))
+            references = self._get_doc_references()
+            recent_cutoff = time.time() - self.quota_protect_recent_minutes * 60
+
+            for category, quota in self.quota_mb.items():
+                category_units = [unit for unit in units if unit['category'] == category]
+                quota_bytes = int(quota * 1024 * 1024)
+                total = sum(unit['size'] for unit in category_units)
+                category_summary = {
+                    'total_bytes': total,
+                    'quota_bytes': quota_bytes,
+                    'evicted': 0,
+                    'protected': 0,
+                    'over_quota': False
+                }
+                summary['categories'][category] = category_summary
+
+                if total <= quota_bytes:
                     continue
-            
-            self.logger.info(f"Evidencias limpiadas: {cleaned_count} directorios, {total_size_freed} bytes liberados")
-            return cleaned_count, total_size_freed
-            
+
+                heap = []
+                for index, unit in enumerate(category_units):
+                    if unit['failed'] or unit['last_used'] >= recent_cutoff or self._is_referenced(unit, references):
+                        category_summary['protected'] += 1
+                        continue
+                    heap.append((unit['last_used'], index, unit))
+                heapq.heapify(heap)
+
+                while total > quota_bytes and heap:
+                    if self._cancel_event.is_set():
+                        summary['cancelled'] = True
+                        break
+                    _, _, unit = heapq.heappop(heap)
+                    if not dry_run:
+                        error = self._remove_unit(unit)
+                        if error:
+                            summary['errors'].append(error)
+                            continue
+                    total -= unit['size']
+                    category_summary['evicted'] += 1
+                    summary['total_size_freed'] += unit['size']
+                    summary['items'].append({
+                        'path': unit['path'],
+                        'category': category,
+                        'reason': 'quota',
+                        'size': unit['size']
+                    })
+
+                category_summary['total_bytes'] = total
+                category_summary['over_quota'] = total > quota_bytes
+                if total > quota_bytes:
+                    self.logger.warning(
+                        f"Cuota de {category} excedida tras desalojar: {total} bytes "
+                        f"(cuota {quota_bytes}); el resto está protegido"
+                    )
+
+            if generate_report and not dry_run and summary['items']:
+                self._generate_cleanup_report(summary)
+
+            self.logger.info(
+                f"Cuota de disco aplicada: {len(summary['items'])} ejecuciones desalojadas, "
+                f"{summary['total_size_freed']} bytes liberados"
+            )
+        except CleanupCancelled:
+            raise
         except Exception as e:
-            self.logger.error(f"Error limpiando evidencias antiguas: {str(e)}")
-            return 0, 0
-    
-    def _cleanup_old_logs(self):
-        """Limpia logs antiguos que no están en la nueva estructura"""
+            self.logger.error(f"Error aplicando cuota de disco: {str(e)}")
+            summary['errors'].append(str(e))
+
+        self.last_quota_summary = summary
+        return summary
+
+    def start_quota_enforcement(self):
+        """
+        Aplica la cuota de disco en un hilo en segundo plano
+
+        Pensado para llamarse desde before_all: solo arranca el hilo y vuelve.
+
+        Returns:
+            El hilo iniciado, o None si no hay cuota configurada
+        """
+        if not self.quota_mb:
+            return None
+        if self._quota_thread is not None and self._quota_thread.is_alive():
+            return self._quota_thread
+
+        self._quota_thread = threading.Thread(
+            target=self.enforce_quota, name='cleanup-quota', daemon=True
+        )
+        self._quota_thread.start()
+        return self._quota_thread
+
+    def start_background_cleanup(self):
+        """
+        Inicia la limpieza de la sesión en un hilo daemon
+
+        Pensado para llamarse una vez desde before_all: aplica la retención y la
+        cuota de disco con pausas de E/S, sin bloquear el inicio de las pruebas.
+
+        Returns:
+            El hilo iniciado
+        """
+        if self._background_thread is not None and self._background_thread.is_alive():
+            return self._background_thread
+
+        self._cancel_event.clear()
+        self._background_thread = threading.Thread(
+            target=self.run_session_cleanup, name='cleanup-session', daemon=True
+        )
+        self._background_thread.start()
+        return self._background_thread
+
+    def stop_background_cleanup(self, timeout=5.0):
+        """
+        Cancela la limpieza en segundo plano y espera a que termine
+
+        Args:
+            timeout: Tiempo máximo de espera en segundos
+
+        Returns:
+            True si el hilo terminó dentro del tiempo límite
+        """
+        thread = self._background_thread
+        if thread is None or not thread.is_alive():
+            return True
+        self._cancel_event.set()
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def run_session_cleanup(self):
+        """
+        Ejecuta la limpieza de la sesión bajo el bloqueo exclusivo
+
+        Aplica la retención y luego la cuota de disco, y escribe un único
+        reporte de limpieza con ambos resultados. Si otro worker tiene el
+        bloqueo no hace nada.
+
+        Returns:
+            Resumen de la limpieza, o None si no se obtuvo el bloqueo
+        """
+        lock_path = self.base_dir / 'reports' / CLEANUP_LOCK_FILE
+        if not self._acquire_lock(lock_path):
+            self.logger.info(f"Limpieza omitida: otro proceso tiene el bloqueo {lock_path}")
+            return None
+
+        previous_workers = self.inventory_workers
+        self.inventory_workers = self.background_workers
+        self.io_delay = self.background_io_delay_ms / 1000.0
+        summary = None
         try:
-            logs_dir = Path("logs")
-            if not logs_dir.exists():
-                return 0, 0
-            
-            cleaned_count = 0
-            total_size_freed = 0
-            
-            # Limpiar estructura antigua (sin fecha)
-            for feature_dir in logs_dir.iterdir():
-                if not feature_dir.is_dir():
-                    continue
-                
-                # Si no es una carpeta de fecha (YYYY-MM-DD), es estructura antigua
-                if not self._is_date_folder(feature_dir.name):
-                    self.logger.info(f"Eliminando estructura antigua de logs: {feature_dir}")
-                    
-                    # Calcular tamaño antes de eliminar
-                    size = self._get_directory_size(feature_dir)
-                    total_size_freed += size
-                    
-                    # Eliminar directorio
-                    shutil.rmtree(feature_dir)
-                    cleaned_count += 1
-            
-            # Limpiar logs por fecha (más antiguos que retention_days)
-            cutoff_date = datetime.now() - timedelta(days=self.logs_retention_days)
-            
-            for date_dir in logs_dir.iterdir():
-                if not date_dir.is_dir() or not self._is_date_folder(date_dir.name):
-                    continue
-                
+            summary = self.cleanup_old_files(generate_report=False)
+            if summary is None:
+                return None
+            if self.quota_mb:
+                quota_summary = self.enforce_quota(generate_report=False)
+                summary['quota'] = quota_summary
+                summary['total_size_freed'] += quota_summary['total_size_freed']
+                summary['items'].extend(quota_summary['items'])
+                summary['errors'].extend(quota_summary['errors'])
+                summary['cancelled'] = summary.get('cancelled') or quota_summary.get('cancelled', False)
+        except CleanupCancelled:
+            self.logger.info("Limpieza en segundo plano cancelada")
+            summary = summary or {'total_size_freed': 0, 'items': [], 'errors': []}
+            summary['cancelled'] = True
+        finally:
+            self.inventory_workers = previous_workers
+            self.io_delay = 0.0
+            self._release_lock(lock_path)
+
+        summary.setdefault('cancelled', False)
+        self._generate_cleanup_report(summary)
+        self.last_session_summary = summary
+        return summary
+
+    def _throttle(self):
+        """Pausa entre operaciones de E/S y corta el trabajo si se canceló"""
+        if self._cancel_event.is_set():
+            raise CleanupCancelled()
+        if self.io_delay:
+            time.sleep(self.io_delay)
+
+    def _acquire_lock(self, lock_path):
+        """Crea el archivo de bloqueo de forma exclusiva (descarta bloqueos abandonados)"""
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
                 try:
-                    folder_date = datetime.strptime(date_dir.name, "%Y-%m-%d")
-                    if folder_date < cutoff_date:
-                        self.logger.info(f"Eliminando logs antiguos: {date_dir}")
-                        
-                        # Calcular tamaño antes de eliminar
-                        size = self._get_directory_size(date_dir)
-                        total_size_freed += size
-                        
-                        # Eliminar directorio
-                        shutil.rmtree(date_dir)
-                        cleaned_count += 1
-                        
-                except ValueError:
-                    # Si no se puede parsear la fecha, mantener el directorio
+                    age = time.time() - lock_path.stat().st_mtime
+                except FileNotFoundError:
                     continue
-            
-            self.logger.info(f"Logs limpiados: {cleaned_count} directorios, {total_size_freed} bytes liberados")
-            return cleaned_count, total_size_freed
-            
-        except Exception as e:
-            self.logger.error(f"Error limpiando logs antiguos: {str(e)}")
-            return 0, 0
-    
-    def _cleanup_old_reports(self):
-        """Limpia reportes antiguos que no están en la nueva estructura"""
+                if age < self.lock_stale_minutes * 60:
+                    return False
+                self.logger.warning(f"Eliminando bloqueo de limpieza abandonado: {lock_path}")
+                try:
+                    lock_path.unlink()
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'pid': os.getpid(), 'started': datetime.now().isoformat()}, f)
+            return True
+        return False
+
+    def _release_lock(self, lock_path):
+        """Elimina el archivo de bloqueo"""
         try:
-            reports_dir = Path("reports")
-            if not reports_dir.exists():
-                return 0, 0
-            
-            cleaned_count = 0
-            total_size_freed = 0
-            
-            # Limpiar reportes antiguos (archivos sueltos sin carpeta de feature)
-            for item in reports_dir.iterdir():
-                if item.is_file():
-                    # Si es un archivo suelto, es estructura antigua
-                    self.logger.info(f"Eliminando reporte antiguo: {item}")
-                    
-                    # Calcular tamaño antes de eliminar
-                    size = item.stat().st_size
-                    total_size_freed += size
-                    
-                    # Eliminar archivo
-                    item.unlink()
-                    cleaned_count += 1
-            
-            # Limpiar carpetas de reportes por fecha (más antiguas que retention_days)
-            cutoff_date = datetime.now() - timedelta(days=self.reports_retention_days)
-            
-            for feature_dir in reports_dir.iterdir():
-                if not feature_dir.is_dir():
-                    continue
-                
-                # Extraer fecha del nombre de la carpeta (formato: YYYY-MM-DD_feature_name)
-                folder_name = feature_dir.name
-                if '_' in folder_name:
-                    date_part = folder_name.split('_')[0]
-                    try:
-                        folder_date = datetime.strptime(date_part, "%Y-%m-%d")
-                        if folder_date < cutoff_date:
-                            self.logger.info(f"Eliminando reportes antiguos: {feature_dir}")
-                            
-                            # Calcular tamaño antes de eliminar
-                            size = self._get_directory_size(feature_dir)
-                            total_size_freed += size
-                            
-                            # Eliminar directorio
-                            shutil.rmtree(feature_dir)
-                            cleaned_count += 1
-                            
-                    except ValueError:
-                        # Si no se puede parsear la fecha, mantener el directorio
-                        continue
-            
-            self.logger.info(f"Reportes limpiados: {cleaned_count} elementos, {total_size_freed} bytes liberados")
-            return cleaned_count, total_size_freed
-            
-        except Exception as e:
-            self.logger.error(f"Error limpiando reportes antiguos: {str(e)}")
-            return 0, 0
-    
-    def _cleanup_old_docs(self):
-        """Limpia documentación antigua que no está en la nueva estructura"""
+            lock_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Error liberando bloqueo de limpieza: {str(e)}")
+
+    def _remove_unit(self, unit):
+        """Elimina una unidad del inventario por ejecución; devuelve el error si falla"""
+        if unit['is_dir']:
+            return self._remove_entry({**unit, 'action': 'quota'})
+        for file_path in unit['paths']:
+            error = self._remove_entry({**unit, 'path': file_path, 'action': 'quota'})
+            if error:
+                return error
+        return None
+
+    def _remove_entry(self, entry):
+        """Elimina un elemento del inventario; devuelve el mensaje de error si falla"""
+        self._throttle()
+        reason = {'legacy': 'estructura antigua', 'quota': 'cuota de disco'}.get(entry['action'], 'antigüedad')
+        self.logger.info(f"Eliminando {entry['path']} ({entry['category']}, {reason})")
         try:
-            docs_dir = Path("docs")
-            if not docs_dir.exists():
-                return 0, 0
-            
-            cleaned_count = 0
-            total_size_freed = 0
-            
-            # Limpiar archivos de documentación antiguos (que no estén en las carpetas organizadas)
-            organized_folders = ['✅_EXITOSOS', '❌_FALLIDOS', '⚠️_PARCIALES', '❓_DESCONOCIDOS']
-            
-            for item in docs_dir.iterdir():
-                if item.is_file() and item.suffix == '.md':
-                    # Si es un archivo .md suelto, es estructura antigua
-                    self.logger.info(f"Eliminando documentación antigua: {item}")
-                    
-                    # Calcular tamaño antes de eliminar
-                    size = item.stat().st_size
-                    total_size_freed += size
-                    
-                    # Eliminar archivo
-                    item.unlink()
-                    cleaned_count += 1
-                elif item.is_dir() and item.name not in organized_folders:
-                    # Si es una carpeta que no está en la estructura organizada, es antigua
-                    self.logger.info(f"Eliminando carpeta de documentación antigua: {item}")
-                    
-                    # Calcular tamaño antes de eliminar
-                    size = self._get_directory_size(item)
-                    total_size_freed += size
-                    
-                    # Eliminar directorio
-                    shutil.rmtree(item)
-                    cleaned_count += 1
-            
-            self.logger.info(f"Documentación limpiada: {cleaned_count} elementos, {total_size_freed} bytes liberados")
-            return cleaned_count, total_size_freed
-            
-        except Exception as e:
-            self.logger.error(f"Error limpiando documentación antigua: {str(e)}")
-            return 0, 0
-    
+            if entry['is_dir']:
+                shutil.rmtree(entry['path'])
+            else:
+                os.remove(entry['path'])
+            return None
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.logger.error(f"Error eliminando {entry['path']}: {str(e)}")
+            return f"{entry['path']}: {str(e)}"
+
+    def _parse_date(self, name):
+        """Extrae la fecha de un nombre de carpeta o archivo (None si no tiene)"""
+        match = DATE_IN_NAME_PATTERN.search(name)
+        if not match:
+            return None
+        try:
+            return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        except ValueError:
+            return None
+
     def _is_date_folder(self, folder_name):
-        """Verifica si el nombre de la carpeta es una fecha en formato YYYY-MM-DD"""
+        """Verifica si el nombre de la carpeta es una fecha (YYYY-MM-DD o YYYY_MM_DD)"""
         try:
-            datetime.strptime(folder_name, "%Y-%m-%d")
+            datetime.strptime(folder_name.replace("_", "-"), "%Y-%m-%d")
             return True
         except ValueError:
             return False
-    
+
     def _get_directory_size(self, directory):
         """Calcula el tamaño total de un directorio"""
         total_size = 0
-        try:
-            for dirpath, dirnames, filenames in os.walk(directory):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(filepath)
-                    except (OSError, FileNotFoundError):
-                        continue
-        except Exception as e:
-            self.logger.warning(f"Error calculando tamaño de {directory}: {str(e)}")
-        
+        pending = [str(directory)]
+        while pending:
+            size, _, _, subdirs, _ = self._scan_directory(pending.pop())
+            total_size += size
+            pending.extend(subdirs)
         return total_size
-    
+
     def _generate_cleanup_report(self, cleanup_summary):
         """Genera un reporte de la limpieza realizada"""
         try:
-            reports_dir = Path("reports")
+            reports_dir = self.base_dir / "reports"
             reports_dir.mkdir(exist_ok=True)
-            
+
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             cleanup_report_path = reports_dir / f"cleanup_report_{timestamp}.json"
-            
+
             cleanup_summary['cleanup_date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             cleanup_summary['total_size_freed_mb'] = round(cleanup_summary['total_size_freed'] / (1024 * 1024), 2)
-            
+
             with open(cleanup_report_path, 'w', encoding='utf-8') as f:
                 json.dump(cleanup_summary, f, indent=2, ensure_ascii=False)
-            
+
             self.logger.info(f"Reporte de limpieza generado: {cleanup_report_path}")
-            
+
         except Exception as e:
             self.logger.error(f"Error generando reporte de limpieza: {str(e)}")
-    
-    def get_cleanup_stats(self):
-        """Obtiene estadísticas de limpieza sin ejecutar la limpieza"""
+
+    def get_cleanup_stats(self, inventory=None):
+        """
+        Obtiene estadísticas de limpieza sin ejecutar la limpieza
+
+        Args:
+            inventory: Inventario ya construido (opcional)
+
+        Returns:
+            Diccionario con el número de elementos a limpiar por categoría y,
+            en 'sizes', el tamaño total y recuperable en bytes por categoría
+        """
         try:
-            stats = {
-                'evidences': self._get_old_evidences_count(),
-                'logs': self._get_old_logs_count(),
-                'reports': self._get_old_reports_count(),
-                'docs': self._get_old_docs_count()
-            }
-            
+            if inventory is None:
+                inventory = self.build_inventory()
+
+            stats = {category: 0 for category in CATEGORIES}
+            sizes = {category: {'total': 0, 'reclaimable': 0} for category in CATEGORIES}
+
+            for entry in inventory:
+                sizes[entry['category']]['total'] += entry['size']
+                if entry['action']:
+                    stats[entry['category']] += 1
+                    sizes[entry['category']]['reclaimable'] += entry['size']
+
+            stats['sizes'] = sizes
             return stats
-            
+
         except Exception as e:
             self.logger.error(f"Error obteniendo estadísticas de limpieza: {str(e)}")
             return None
-    
-    def _get_old_evidences_count(self):
-        """Cuenta evidencias antiguas sin eliminarlas"""
-        try:
-            evidences_dir = Path("evidences")
-            if not evidences_dir.exists():
-                return 0
-            
-            count = 0
-            cutoff_date = datetime.now() - timedelta(days=self.evidence_retention_days)
-            
-            for item in evidences_dir.iterdir():
-                if not item.is_dir():
-                    continue
-                
-                if not self._is_date_folder(item.name):
-                    count += 1
-                else:
-                    try:
-                        folder_date = datetime.strptime(item.name, "%Y-%m-%d")
-                        if folder_date < cutoff_date:
-                            count += 1
-                    except ValueError:
-                        continue
-            
-            return count
-            
-        except Exception as e:
-            self.logger.error(f"Error contando evidencias antiguas: {str(e)}")
-            return 0
-    
-    def _get_old_logs_count(self):
-        """Cuenta logs antiguos sin eliminarlos"""
-        try:
-            logs_dir = Path("logs")
-            if not logs_dir.exists():
-                return 0
-            
-            count = 0
-            cutoff_date = datetime.now() - timedelta(days=self.logs_retention_days)
-            
-            for item in logs_dir.iterdir():
-                if not item.is_dir():
-                    continue
-                
-                if not self._is_date_folder(item.name):
-                    count += 1
-                else:
-                    try:
-                        folder_date = datetime.strptime(item.name, "%Y-%m-%d")
-                        if folder_date < cutoff_date:
-                            count += 1
-                    except ValueError:
-                        continue
-            
-            return count
-            
-        except Exception as e:
-            self.logger.error(f"Error contando logs antiguos: {str(e)}")
-            return 0
-    
-    def _get_old_reports_count(self):
-        """Cuenta reportes antiguos sin eliminarlos"""
-        try:
-            reports_dir = Path("reports")
-            if not reports_dir.exists():
-                return 0
-            
-            count = 0
-            cutoff_date = datetime.now() - timedelta(days=self.reports_retention_days)
-            
-            for item in reports_dir.iterdir():
-                if item.is_file():
-                    count += 1
-                elif item.is_dir():
-                    folder_name = item.name
-                    if '_' in folder_name:
-                        date_part = folder_name.split('_')[0]
-                        try:
-                            folder_date = datetime.strptime(date_part, "%Y-%m-%d")
-                            if folder_date < cutoff_date:
-                                count += 1
-                        except ValueError:
-                            continue
-            
-            return count
-            
-        except Exception as e:
-            self.logger.error(f"Error contando reportes antiguos: {str(e)}")
-            return 0
-    
-    def _get_old_docs_count(self):
-        """Cuenta documentación antigua sin eliminarla"""
-        try:
-            docs_dir = Path("docs")
-            if not docs_dir.exists():
-                return 0
-            
-            count = 0
-            organized_folders = ['✅_EXITOSOS', '❌_FALLIDOS', '⚠️_PARCIALES', '❓_DESCONOCIDOS']
-            
-            for item in docs_dir.iterdir():
-                if item.is_file() and item.suffix == '.md':
-                    count += 1
-                elif item.is_dir() and item.name not in organized_folders:
-                    count += 1
-            
-            return count
-            
-        except Exception as e:
-            self.logger.error(f"Error contando documentación antigua: {str(e)}")
-            return 0
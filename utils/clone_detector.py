@@ -0,0 +1,409 @@
+"""
+Detector de Código Duplicado - Fingerprinting por Winnowing
+Compara la secuencia normalizada del AST (nombres de variables y literales
+abstraídos, sin comentarios ni docstrings) de pages/, features/steps/ y utils/
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import logging
+import os
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_SOURCE_DIRS = ("pages", "features/steps", "utils")
+
+# Incrementar al cambiar la normalización o el winnowing para invalidar la cache
+FINGERPRINT_VERSION = 2
+
+# Con menos archivos sin cache, arrancar el pool de procesos cuesta más que parsear
+POOL_MIN_FILES = 4
+
+
+def normalized_tokens(source: str) -> List[Tuple[str, int]]:
+    """
+    Convierte el código en tokens normalizados a partir de su AST
+
+    Cada nodo aporta su tipo; los atributos conservan su nombre (driver.find_element
+    es significativo) y las variables y literales se abstraen, así que dos bloques
+    que solo difieren en nombres locales o textos producen los mismos tokens. El
+    texto de los f-strings se conserva: en plantillas de reportes y HTML el
+    texto es el contenido, y abstraerlo convierte plantillas distintas en clones.
+
+    Returns:
+        Lista de (token, línea)
+    """
+    tree = ast.parse(source)
+    tokens = []
+
+    def visit(node: ast.AST, line: int):
+        # Docstrings y expresiones de texto sueltas no son código
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+            if isinstance(node.value.value, str):
+                return
+        line = getattr(node, "lineno", line)
+        if isinstance(node, ast.JoinedStr):
+            tokens.append(("JoinedStr", line))
+            for part in node.values:
+                if isinstance(part, ast.Constant):
+                    tokens.append((f"Text.{part.value}", line))
+                else:
+                    visit(part, line)
+            return
+        if isinstance(node, ast.Attribute):
+            token = f"Attr.{node.attr}"
+        elif isinstance(node, ast.Constant):
+            token = f"Const.{type(node.value).__name__}"
+        elif isinstance(node, (ast.expr_context, ast.Name, ast.arg, ast.alias)):
+            token = None if isinstance(node, ast.expr_context) else type(node).__name__
+        else:
+            token = type(node).__name__
+        if token:
+            tokens.append((token, line))
+        for child in ast.iter_child_nodes(node):
+            visit(child, line)
+
+    for statement in tree.body:
+        visit(statement, 1)
+    return tokens
+
+
+def fingerprint_tokens(
+    tokens: Sequence[Tuple[str, int]], k: int, window: int
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Selecciona los fingerprints de una secuencia de tokens por winnowing
+
+    Args:
+        tokens: Lista de (token, línea)
+        k: Tamaño de los k-gramas
+        window: Tamaño de la ventana de winnowing
+
+    Returns:
+        Lista de (hash, posición, línea inicial, línea final)
+    """
+    if len(tokens) < k:
+        return []
+
+    hashes = [
+        zlib.crc32("\x1f".join(token for token, _ in tokens[i : i + k]).encode())
+        for i in range(len(tokens) - k + 1)
+    ]
+
+    fingerprints = []
+    last_selected = -1
+    for start in range(max(1, len(hashes) - window + 1)):
+        window_hashes = hashes[start : start + window]
+        # Mínimo más a la derecha de la ventana (winnowing robusto)
+        minimum = min(window_hashes)
+        position = start + len(window_hashes) - 1 - window_hashes[::-1].index(minimum)
+        if position != last_selected:
+            lines = [line for _, line in tokens[position : position + k]]
+            fingerprints.append((minimum, position, min(lines), max(lines)))
+            last_selected = position
+    return fingerprints
+
+
+def _fingerprint_file(args: Tuple[str, int, int]) -> Tuple[str, List[tuple], Optional[str]]:
+    """Parsea y obtiene los fingerprints de un archivo (se ejecuta en el pool de procesos)"""
+    path, k, window = args
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            tokens = normalized_tokens(f.read())
+        return path, fingerprint_tokens(tokens, k, window), None
+    except (OSError, SyntaxError, ValueError) as e:
+        return path, [], str(e)
+
+
+class CloneDetector:
+    """Detector de clones basado en winnowing sobre el AST normalizado"""
+
+    def __init__(
+        self,
+        project_root: Union[str, Path] = ".",
+        source_dirs: Sequence[str] = DEFAULT_SOURCE_DIRS,
+        k: int = 40,
+        window: int = 20,
+        min_fingerprints: int = 3,
+        max_occurrences: int = 20,
+        max_workers: Optional[int] = None,
+        cache_path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Args:
+            project_root: Raíz del proyecto
+            source_dirs: Directorios a analizar (relativos a la raíz)
+            k: Tamaño de los k-gramas de tokens
+            window: Tamaño de la ventana de winnowing
+            min_fingerprints: Fingerprints coincidentes mínimos para reportar un clon
+            max_occurrences: Los hashes más repetidos que esto se ignoran (boilerplate)
+            max_workers: Procesos para el parseo (None usa el número de CPUs)
+            cache_path: Cache de fingerprints por hash de contenido (por defecto
+                .cache/clone_fingerprints.json en la raíz)
+        """
+        self.project_root = Path(project_root)
+        self.source_dirs = source_dirs
+        self.k = k
+        self.window = window
+        self.min_fingerprints = min_fingerprints
+        self.max_occurrences = max_occurrences
+        self.max_workers = max_workers
+        self.cache_path = (
+            Path(cache_path)
+            if cache_path
+            else self.project_root / ".cache" / "clone_fingerprints.json"
+        )
+        self.errors: Dict[str, str] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def source_files(self) -> List[str]:
+        """Archivos .py de los directorios analizados"""
+        files = []
+        for source_dir in self.source_dirs:
+            directory = self.project_root / source_dir
+            if directory.exists():
+                files.extend(
+                    str(path)
+                    for path in sorted(directory.rglob("*.py"))
+                    if path.name != "__init__.py"
+                )
+        return files
+
+    def fingerprint_files(self, files: Sequence[str]) -> Dict[str, List[tuple]]:
+        """
+        Obtiene los fingerprints de cada archivo, reutilizando los de contenido sin cambios
+
+        Solo se parsean los archivos cuyo hash no está en la cache, en paralelo
+        si son suficientes.
+        """
+        cache = self._load_cache()
+        keys = {}
+        pending = []
+        results = []
+        for path in files:
+            try:
+                with open(path, "rb") as f:
+                    digest = hashlib.sha1(f.read()).hexdigest()
+            except OSError as e:
+                results.append((path, [], str(e)))
+                continue
+            keys[path] = f"{self.k}:{self.window}:{digest}"
+            if keys[path] in cache:
+                entry = cache[keys[path]]
+                results.append((path, entry["fingerprints"], entry["error"]))
+            else:
+                pending.append((path, self.k, self.window))
+
+        if pending:
+            for path, file_fingerprints, error in self._fingerprint_pending(pending):
+                results.append((path, file_fingerprints, error))
+                cache[keys[path]] = {"fingerprints": file_fingerprints, "error": error}
+            # Solo se conservan las entradas de los archivos actuales
+            self._save_cache({key: cache[key] for key in keys.values() if key in cache})
+
+        fingerprints = {}
+        self.errors = {}
+        for path, file_fingerprints, error in results:
+            if error:
+                self.errors[path] = error
+            fingerprints[path] = [tuple(fingerprint) for fingerprint in file_fingerprints]
+        return fingerprints
+
+    def _fingerprint_pending(self, tasks: List[Tuple[str, int, int]]) -> List[tuple]:
+        """Parsea los archivos sin cache, en paralelo si son suficientes"""
+        if len(tasks) >= POOL_MIN_FILES:
+            try:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                    return list(pool.map(_fingerprint_file, tasks))
+            except (OSError, RuntimeError) as e:
+                # Sin soporte de multiprocessing (p. ej. entornos restringidos)
+                self.logger.warning(f"Pool de procesos no disponible, parseo secuencial: {str(e)}")
+        return [_fingerprint_file(task) for task in tasks]
+
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == FINGERPRINT_VERSION:
+                return data.get("files", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Cache de fingerprints inválida: {str(e)}")
+        return {}
+
+    def _save_cache(self, entries: Dict[str, Any]):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": FINGERPRINT_VERSION, "files": entries}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            self.logger.warning(f"No se pudo guardar la cache de fingerprints: {str(e)}")
+
+    def find_clones(self, files: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Busca grupos de código duplicado
+
+        Args:
+            files: Archivos a analizar (por defecto los de source_dirs)
+
+        Returns:
+            Lista de grupos ordenada por tamaño; cada grupo tiene "locations"
+            (archivo, línea inicial y final), "lines" y "fingerprints"
+        """
+        fingerprints = self.fingerprint_files(files or self.source_files())
+
+        # Índice hash -> ubicaciones
+        index = defaultdict(list)
+        for path, file_fingerprints in fingerprints.items():
+            for fingerprint in file_fingerprints:
+                index[fingerprint[0]].append((path, fingerprint))
+
+        # Coincidencias por par de archivos
+        matches = defaultdict(list)
+        for locations in index.values():
+            if len(locations) < 2 or len(locations) > self.max_occurrences:
+                continue
+            for i, (path_a, fp_a) in enumerate(locations):
+                for path_b, fp_b in locations[i + 1 :]:
+                    if path_a == path_b and fp_a[1] == fp_b[1]:
+                        continue
+                    if (path_a, fp_a[1]) > (path_b, fp_b[1]):
+                        path_a, fp_a, path_b, fp_b = path_b, fp_b, path_a, fp_a
+                    matches[(path_a, path_b)].append((fp_a, fp_b))
+
+        regions = []
+        for (path_a, path_b), pairs in matches.items():
+            regions.extend(self._merge_pairs(path_a, path_b, pairs))
+
+        return self._group_regions(regions)
+
+    def _merge_pairs(self, path_a: str, path_b: str, pairs: List[tuple]) -> List[Dict[str, Any]]:
+        """Une coincidencias consecutivas de un par de archivos en regiones clonadas"""
+        pairs.sort(key=lambda pair: (pair[0][1], pair[1][1]))
+        regions = []
+        run = []
+        for pair in pairs:
+            if run:
+                prev_a, prev_b = run[-1]
+                gap_a = pair[0][1] - prev_a[1]
+                gap_b = pair[1][1] - prev_b[1]
+                if not (0 < gap_a <= self.k and 0 < gap_b <= self.k):
+                    regions.append(run)
+                    run = []
+            run.append(pair)
+        if run:
+            regions.append(run)
+
+        result = []
+        for run in regions:
+            if len(run) < self.min_fingerprints:
+                continue
+            location_a = (path_a, min(p[0][2] for p in run), max(p[0][3] for p in run))
+            location_b = (path_b, min(p[1][2] for p in run), max(p[1][3] for p in run))
+            # Descartar regiones de un mismo archivo que se solapan consigo mismas
+            if path_a == path_b and location_a[1] <= location_b[2] and location_b[1] <= location_a[2]:
+                continue
+            result.append({"locations": [location_a, location_b], "fingerprints": len(run)})
+        return result
+
+    def _group_regions(self, regions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Agrupa por par de archivos las regiones que se solapan en ambos lados
+
+        Los grupos son pares: dos regiones solo se unen si son la misma
+        duplicación (solapan en los dos archivos), nunca por una ubicación
+        compartida con un tercer clon.
+        """
+        by_pair = defaultdict(list)
+        for region in regions:
+            a, b = region["locations"]
+            by_pair[(a[0], b[0])].append(region)
+
+        result = []
+        for pair_regions in by_pair.values():
+            pair_regions.sort(key=lambda region: region["locations"][0][1:])
+            merged = []
+            for region in pair_regions:
+                a, b = region["locations"]
+                if merged:
+                    last = merged[-1]
+                    last_a, last_b = last["locations"]
+                    if a[1] <= last_a[2] and b[1] <= last_b[2] and last_b[1] <= b[2]:
+                        last["locations"] = [
+                            (a[0], last_a[1], max(last_a[2], a[2])),
+                            (b[0], min(last_b[1], b[1]), max(last_b[2], b[2])),
+                        ]
+                        last["fingerprints"] += region["fingerprints"]
+                        continue
+                merged.append({"locations": [a, b], "fingerprints": region["fingerprints"]})
+
+            for group in merged:
+                locations = self._collapse_locations(group["locations"])
+                if len(locations) < 2:
+                    continue
+                result.append(
+                    {
+                        "locations": [
+                            {"file": path, "start_line": start, "end_line": end}
+                            for path, start, end in locations
+                        ],
+                        # La copia más corta: el tramo más largo puede incluir
+                        # código intermedio que no está duplicado
+                        "lines": min(end - start + 1 for _, start, end in locations),
+                        "fingerprints": group["fingerprints"],
+                    }
+                )
+        result.sort(key=lambda group: (group["lines"], group["fingerprints"]), reverse=True)
+        return result
+
+    @staticmethod
+    def _collapse_locations(locations) -> List[Tuple[str, int, int]]:
+        """Une las ubicaciones solapadas de un mismo archivo"""
+        collapsed = []
+        for path, start, end in sorted(locations):
+            if collapsed and collapsed[-1][0] == path and start <= collapsed[-1][2]:
+                previous = collapsed[-1]
+                collapsed[-1] = (path, previous[1], max(previous[2], end))
+            else:
+                collapsed.append((path, start, end))
+        return collapsed
+
+
+def format_clone_group(group: Dict[str, Any]) -> str:
+    """Texto de una línea para un grupo de clones"""
+    locations = " ↔ ".join(
+        f"{location['file']}:{location['start_line']}-{location['end_line']}"
+        for location in group["locations"]
+    )
+    return f"Código duplicado (~{group['lines']} líneas): {locations}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Detecta código duplicado por winnowing")
+    parser.add_argument("--project-root", default=".", help="Raíz del proyecto")
+    parser.add_argument("-k", type=int, default=40, help="Tamaño de los k-gramas")
+    parser.add_argument("--window", type=int, default=20, help="Ventana de winnowing")
+    parser.add_argument("--min-lines", type=int, default=10, help="Líneas mínimas por clon")
+    args = parser.parse_args(argv)
+
+    detector = CloneDetector(args.project_root, k=args.k, window=args.window)
+    groups = [g for g in detector.find_clones() if g["lines"] >= args.min_lines]
+    for group in groups:
+        print(format_clone_group(group))
+    for path, error in detector.errors.items():
+        print(f"No se pudo analizar {path}: {error}")
+    print(f"{len(groups)} grupos de código duplicado")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,319 @@
+"""
+Validación de Consistencia - Chequeos sobre un AST por Archivo
+Convenciones de nombres, docstrings faltantes e imports no utilizados; los
+archivos se parsean una sola vez en un pool de procesos y los resultados se
+guardan por hash de contenido
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Cambiar al modificar los chequeos para invalidar la cache
+CHECKS_VERSION = 2
+
+SNAKE_CASE_PATTERN = re.compile(r"^_{0,2}[a-z][a-z0-9_]*_{0,2}$")
+CAP_WORDS_PATTERN = re.compile(r"^_?[A-Z][A-Za-z0-9]*$")
+STEP_DECORATORS = {"given", "when", "then", "step"}
+
+# Por debajo de este número de archivos sin cache no compensa levantar procesos
+POOL_MIN_FILES = 4
+
+
+class _ScopeVisitor(ast.NodeVisitor):
+    """Registra los imports de cada ámbito y los nombres que se leen dentro de él"""
+
+    def __init__(self):
+        self.scopes = []
+        self._stack = []
+        # Textos que están en posición de anotación (def f(x: "Tipo") -> "Tipo")
+        self._annotation_strings = set()
+
+    def _push(self):
+        scope = {"imports": [], "loads": set()}
+        self.scopes.append(scope)
+        self._stack.append(scope)
+        return scope
+
+    def _visit_scope(self, node):
+        self._push()
+        self.generic_visit(node)
+        loads = self._stack.pop()["loads"]
+        # Los nombres leídos en un ámbito anidado también usan los del ámbito exterior
+        if self._stack:
+            self._stack[-1]["loads"].update(loads)
+
+    def visit_Module(self, node):
+        for child in ast.walk(node):
+            annotations = []
+            if isinstance(child, ast.arg):
+                annotations.append(child.annotation)
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                annotations.append(child.returns)
+            elif isinstance(child, ast.AnnAssign):
+                annotations.append(child.annotation)
+            for annotation in filter(None, annotations):
+                self._annotation_strings.update(
+                    id(item)
+                    for item in ast.walk(annotation)
+                    if isinstance(item, ast.Constant) and isinstance(item.value, str)
+                )
+        self._visit_scope(node)
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_Lambda = _visit_scope
+    visit_ClassDef = _visit_scope
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            # "import a.b" enlaza el nombre "a"
+            name = alias.asname or alias.name.split(".")[0]
+            display = f"{alias.name} as {alias.asname}" if alias.asname else alias.name
+            self._stack[-1]["imports"].append((name, node.lineno, display))
+
+    def visit_ImportFrom(self, node):
+        if node.module == "__future__":
+            return
+        for alias in node.names:
+            if alias.name == "*":
+                continue
+            name = alias.asname or alias.name
+            module = "." * node.level + (f"{node.module}." if node.module else "")
+            display = module + alias.name
+            if alias.asname:
+                display += f" as {alias.asname}"
+            self._stack[-1]["imports"].append((name, node.lineno, display))
+
+    def visit_Name(self, node):
+        if not isinstance(node.ctx, ast.Store):
+            self._stack[-1]["loads"].add(node.id)
+
+    def visit_Constant(self, node):
+        # Solo las anotaciones como texto ("OrderedDict[str, Logger]") usan
+        # nombres; cualquier otro texto igual a un import no cuenta
+        if id(node) not in self._annotation_strings:
+            return
+        try:
+            expression = ast.parse(node.value, mode="eval")
+        except SyntaxError:
+            return
+        self._stack[-1]["loads"].update(
+            item.id for item in ast.walk(expression) if isinstance(item, ast.Name)
+        )
+
+
+def _unused_imports(tree: ast.Module, lines: List[str]) -> List[Tuple[str, int]]:
+    """Imports cuyo nombre enlazado nunca se lee en su ámbito (ni en ámbitos anidados)"""
+    visitor = _ScopeVisitor()
+    visitor.visit(tree)
+
+    exported = set()
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "__all__" for target in node.targets
+        ):
+            if isinstance(node.value, (ast.List, ast.Tuple)):
+                exported.update(
+                    element.value for element in node.value.elts if isinstance(element, ast.Constant)
+                )
+
+    unused = []
+    for scope in visitor.scopes:
+        for name, line, display in scope["imports"]:
+            if name in scope["loads"] or name in exported:
+                continue
+            if "noqa" in lines[line - 1]:
+                continue
+            unused.append((display, line))
+    return unused
+
+
+def analyze_source(source: Union[str, bytes], category: str) -> Dict[str, Any]:
+    """
+    Ejecuta todos los chequeos sobre un único AST
+
+    Args:
+        source: Código del archivo
+        category: "page", "locators", "steps", "utility" u "other"
+
+    Returns:
+        Diccionario con "naming", "missing_docstrings" y "unused_imports"
+        (listas de (mensaje, línea)) y "error" si no se pudo parsear
+    """
+    result = {"naming": [], "missing_docstrings": [], "unused_imports": [], "error": None}
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        result["error"] = str(e)
+        return result
+
+    text = source.decode("utf-8", "replace") if isinstance(source, bytes) else source
+    lines = text.splitlines() or [""]
+
+    # Los métodos de clases con base pueden sobrescribir APIs en camelCase
+    # (shouldRollover, visit_Name), así que no se les exige snake_case
+    overrides = {
+        id(item)
+        for node in ast.walk(tree)
+        if isinstance(node, ast.ClassDef) and node.bases
+        for item in node.body
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            if not CAP_WORDS_PATTERN.match(node.name):
+                result["naming"].append((f"Class name should be CapWords: {node.name}", node.lineno))
+            if category == "page" and not node.name.endswith("Page"):
+                result["naming"].append((f"Page class should end with 'Page': {node.name}", node.lineno))
+            if category == "locators" and not node.name.endswith("Locators"):
+                result["naming"].append(
+                    (f"Locator class should end with 'Locators': {node.name}", node.lineno)
+                )
+            if ast.get_docstring(node) is None:
+                result["missing_docstrings"].append((f"class {node.name}", node.lineno))
+
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if not SNAKE_CASE_PATTERN.match(node.name) and id(node) not in overrides:
+                result["naming"].append((f"Function name should be snake_case: {node.name}", node.lineno))
+
+            is_step = any(
+                isinstance(decorator, ast.Call)
+                and getattr(decorator.func, "id", getattr(decorator.func, "attr", "")).lower()
+                in STEP_DECORATORS
+                for decorator in node.decorator_list
+            )
+            if is_step and not node.name.startswith("step_"):
+                result["naming"].append((f"Step function should start with 'step_': {node.name}", node.lineno))
+
+            if not node.name.startswith("_") and ast.get_docstring(node) is None:
+                result["missing_docstrings"].append((f"function {node.name}", node.lineno))
+
+    result["unused_imports"] = _unused_imports(tree, lines)
+    return result
+
+
+def _analyze_file(task: Tuple[str, str]) -> Tuple[str, Dict[str, Any]]:
+    """Lee y analiza un archivo (se ejecuta en el pool de procesos)"""
+    path, category = task
+    with open(path, "rb") as f:
+        return path, analyze_source(f.read(), category)
+
+
+class ConsistencyChecker:
+    """Ejecuta los chequeos de consistencia del proyecto con cache por hash de contenido"""
+
+    def __init__(
+        self,
+        project_root: Union[str, Path] = ".",
+        cache_path: Optional[Union[str, Path]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.project_root = Path(project_root)
+        self.cache_path = (
+            Path(cache_path)
+            if cache_path
+            else self.project_root / ".cache" / "consistency_cache.json"
+        )
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+
+    def source_files(self) -> List[Tuple[str, str]]:
+        """(archivo, categoría) de todos los fuentes a validar"""
+        files = []
+        for directory, pattern, category in (
+            ("pages", "*.py", "page"),
+            ("locators", "*.py", "locators"),
+            ("features", "**/*.py", "steps"),
+            ("utils", "*.py", "utility"),
+        ):
+            base = self.project_root / directory
+            if not base.exists():
+                continue
+            for path in sorted(base.glob(pattern)):
+                if path.name == "__init__.py":
+                    continue
+                file_category = category
+                if category == "steps" and not path.name.endswith("_steps.py"):
+                    file_category = "other"
+                if category == "page" and not path.name.endswith("_page.py"):
+                    file_category = "other"
+                if category == "locators" and not path.name.endswith("_locators.py"):
+                    file_category = "other"
+                files.append((str(path), file_category))
+        return files
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Analiza todos los archivos, reutilizando los resultados de contenido sin cambios
+
+        Returns:
+            Diccionario archivo -> resultado de analyze_source
+        """
+        cache = self._load_cache()
+        results = {}
+        pending = []
+        hashes = {}
+
+        for path, category in self.source_files():
+            try:
+                with open(path, "rb") as f:
+                    digest = hashlib.sha1(f.read()).hexdigest()
+            except OSError as e:
+                self.logger.warning(f"Error leyendo {path}: {str(e)}")
+                continue
+            key = f"{category}:{digest}"
+            hashes[path] = key
+            if key in cache:
+                results[path] = cache[key]
+            else:
+                pending.append((path, category))
+
+        if pending:
+            for path, result in self._analyze_pending(pending):
+                results[path] = result
+                cache[hashes[path]] = result
+            # Solo se conservan las entradas de los archivos actuales
+            self._save_cache({key: cache[key] for key in hashes.values() if key in cache})
+
+        for path, result in results.items():
+            if result.get("error"):
+                self.logger.warning(f"No se pudo parsear {path}: {result['error']}")
+        return results
+
+    def _analyze_pending(self, pending: List[Tuple[str, str]]):
+        """Analiza los archivos sin cache, en paralelo si son suficientes"""
+        if len(pending) >= POOL_MIN_FILES:
+            try:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                    return list(pool.map(_analyze_file, pending))
+            except (OSError, RuntimeError) as e:
+                self.logger.warning(f"Pool de procesos no disponible, análisis secuencial: {str(e)}")
+        return [_analyze_file(task) for task in pending]
+
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CHECKS_VERSION:
+                return data.get("results", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Cache de consistencia inválida: {str(e)}")
+        return {}
+
+    def _save_cache(self, results: Dict[str, Any]):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CHECKS_VERSION, "results": results}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            self.logger.warning(f"No se pudo guardar la cache de consistencia: {str(e)}")
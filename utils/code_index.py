@@ -0,0 +1,290 @@
+"""
+Índice Persistente de Código - Steps, Métodos de Page Objects, Locators y Utilidades
+Construido con ast y guardado en disco; solo se vuelven a parsear los archivos
+cuyo mtime/tamaño y hash cambiaron
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+INDEX_VERSION = 1
+
+STEP_DECORATORS = {"given", "when", "then", "step"}
+
+
+class CodeIndex:
+    """Índice en disco de los elementos reutilizables del proyecto"""
+
+    def __init__(
+        self,
+        project_root: Union[str, Path] = ".",
+        index_path: Optional[Union[str, Path]] = None,
+        refresh_interval: float = 2.0,
+    ):
+        self.project_root = Path(project_root)
+        self.index_path = (
+            Path(index_path)
+            if index_path
+            else self.project_root / ".cache" / "code_index.json"
+        )
+        # Segundos durante los que se confía en el índice sin volver a hacer stat
+        self.refresh_interval = refresh_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._files: Optional[Dict[str, Dict[str, Any]]] = None
+        self._last_scan: Optional[float] = None
+
+    def source_files(self) -> Iterator[Tuple[str, Path]]:
+        """Itera (categoría, archivo) de los fuentes que se indexan"""
+        features_dir = self.project_root / "features"
+        if features_dir.exists():
+            for path in sorted(features_dir.rglob("*_steps.py")):
+                yield "steps", path
+
+        pages_dir = self.project_root / "pages"
+        if pages_dir.exists():
+            for path in sorted(pages_dir.glob("*_page.py")):
+                yield "page", path
+
+        locators_dir = self.project_root / "locators"
+        if locators_dir.exists():
+            for path in sorted(locators_dir.glob("*_locators.py")):
+                yield "locators", path
+
+        utils_dir = self.project_root / "utils"
+        if utils_dir.exists():
+            for path in sorted(utils_dir.glob("*.py")):
+                if path.name != "__init__.py":
+                    yield "utility", path
+
+    def refresh(self, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Actualiza el índice re-parseando solo los archivos modificados
+
+        Args:
+            force: Ignora el intervalo de refresco y revisa todos los archivos
+
+        Returns:
+            Diccionario ruta relativa -> entrada del archivo
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (
+                not force
+                and self._files is not None
+                and self._last_scan is not None
+                and now - self._last_scan < self.refresh_interval
+            ):
+                return self._files
+
+            if self._files is None:
+                self._files = self._load()
+
+            changed = False
+            seen = set()
+            for category, path in self.source_files():
+                key = path.relative_to(self.project_root).as_posix()
+                seen.add(key)
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+
+                entry = self._files.get(key)
+                if (
+                    entry
+                    and entry["mtime"] == stat.st_mtime
+                    and entry["size"] == stat.st_size
+                ):
+                    continue
+
+                try:
+                    data = path.read_bytes()
+                except OSError as e:
+                    self.logger.warning(f"Error leyendo {path}: {str(e)}")
+                    continue
+
+                digest = hashlib.sha1(data).hexdigest()
+                if entry and entry["hash"] == digest:
+                    # Solo cambió el mtime (checkout, touch): no hace falta parsear
+                    entry["mtime"] = stat.st_mtime
+                    entry["size"] = stat.st_size
+                else:
+                    entry = self._parse_file(category, path, data)
+                    entry.update(
+                        {"mtime": stat.st_mtime, "size": stat.st_size, "hash": digest}
+                    )
+                    self._files[key] = entry
+                changed = True
+
+            for key in list(self._files):
+                if key not in seen:
+                    del self._files[key]
+                    changed = True
+
+            if changed:
+                self._save()
+            self._last_scan = now
+            return self._files
+
+    def iter_entries(self, category: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Itera (ruta, entrada) de los archivos indexados de una categoría"""
+        for key, entry in self.refresh().items():
+            if entry["category"] == category:
+                yield key, entry
+
+    def steps(self) -> List[Dict[str, Any]]:
+        """Devuelve todos los steps indexados (tipo, texto, función, archivo y línea)"""
+        return [
+            dict(step, file=str(self.project_root / key))
+            for key, entry in self.iter_entries("steps")
+            for step in entry["steps"]
+        ]
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Carga el índice guardado en disco"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                return data.get("files", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Índice de código inválido, se reconstruye: {str(e)}")
+        return {}
+
+    def _save(self):
+        """Guarda el índice en disco de forma atómica"""
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": INDEX_VERSION, "files": self._files},
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            self.logger.warning(f"No se pudo guardar el índice de código: {str(e)}")
+
+    def _parse_file(self, category: str, path: Path, data: bytes) -> Dict[str, Any]:
+        """Extrae steps, métodos, locators y funciones de un archivo con ast"""
+        entry = {
+            "category": category,
+            "steps": [],
+            "classes": [],
+            "methods": [],
+            "locators": [],
+            "functions": [],
+        }
+        try:
+            tree = ast.parse(data, filename=str(path))
+        except SyntaxError as e:
+            self.logger.warning(f"No se pudo parsear {path}: {str(e)}")
+            entry["error"] = str(e)
+            return entry
+
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                entry["functions"].append(self._function_info(node, None))
+                step = self._step_info(node)
+                if step:
+                    entry["steps"].append(step)
+            elif isinstance(node, ast.ClassDef):
+                entry["classes"].append(
+                    {
+                        "name": node.name,
+                        "line": node.lineno,
+                        "doc": self._first_doc_line(node),
+                    }
+                )
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        entry["methods"].append(self._function_info(item, node.name))
+                        if category == "locators":
+                            entry["locators"].extend(
+                                self._locators_in(item.body, node.name)
+                            )
+                if category == "locators":
+                    entry["locators"].extend(self._locators_in(node.body, node.name))
+
+        return entry
+
+    def _function_info(self, node: ast.AST, class_name: Optional[str]) -> Dict[str, Any]:
+        return {
+            "name": node.name,
+            "class": class_name,
+            "line": node.lineno,
+            "end_line": getattr(node, "end_lineno", node.lineno),
+            "doc": self._first_doc_line(node),
+        }
+
+    def _step_info(self, node: ast.AST) -> Optional[Dict[str, Any]]:
+        """Información del step si la función tiene un decorador @given/@when/@then"""
+        for decorator in node.decorator_list:
+            if not isinstance(decorator, ast.Call) or not decorator.args:
+                continue
+            func = decorator.func
+            name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", "")
+            text = decorator.args[0]
+            if name.lower() in STEP_DECORATORS and isinstance(text, ast.Constant):
+                if isinstance(text.value, str):
+                    return {
+                        "type": name.lower(),
+                        "text": text.value,
+                        "function": node.name,
+                        "line": node.lineno,
+                    }
+        return None
+
+    def _locators_in(self, body: List[ast.stmt], class_name: str) -> List[Dict[str, Any]]:
+        """Locators definidos como NOMBRE = (By.X, "valor") o self.NOMBRE = ..."""
+        locators = []
+        for statement in body:
+            if not isinstance(statement, ast.Assign) or len(statement.targets) != 1:
+                continue
+            target = statement.targets[0]
+            if isinstance(target, ast.Attribute):
+                name = target.attr
+            elif isinstance(target, ast.Name):
+                name = target.id
+            else:
+                continue
+
+            value = statement.value
+            strategy = None
+            if (
+                isinstance(value, ast.Tuple)
+                and len(value.elts) == 2
+                and isinstance(value.elts[0], ast.Attribute)
+            ):
+                strategy = value.elts[0].attr
+                value = value.elts[1]
+            if not (isinstance(value, ast.Constant) and isinstance(value.value, str)):
+                continue
+
+            locators.append(
+                {
+                    "class": class_name,
+                    "name": name,
+                    "strategy": strategy,
+                    "value": value.value,
+                    "line": statement.lineno,
+                }
+            )
+        return locators
+
+    @staticmethod
+    def _first_doc_line(node: ast.AST) -> str:
+        doc = ast.get_docstring(node) or ""
+        return doc.strip().splitlines()[0] if doc.strip() else ""
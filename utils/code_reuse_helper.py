@@ -10,6 +10,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from .clone_detector import CloneDetector, format_clone_group
+from .code_consistency import ConsistencyChecker
+from .code_index import CodeIndex
+from .step_search import StepSearchIndex, tokenize
+
 
 class CodeReuseHelper:
     """Helper para encontrar código reutilizable en el proyecto"""
@@ -22,9 +27,35 @@ class CodeReuseHelper:
         self.utils_dir = self.project_root / "utils"
         self.logger = logging.getLogger(__name__)
 
-        # Cache para optimizar búsquedas
-        self._code_cache = {}
-        self._last_scan = None
+        # Índice persistente (ast) de steps, métodos, locators y utilidades
+        self._code_cache = CodeIndex(self.project_root)
+
+        # Índice invertido BM25 de steps (se reconstruye si cambian los archivos de steps)
+        self._step_search = None
+        self._step_search_signature = None
+
+        # Resultados por archivo de los chequeos de consistencia (un AST por archivo)
+        self._consistency_checker = ConsistencyChecker(self.project_root)
+        self._consistency_results = None
+
+    def search_steps(self, query, top_k=5):
+        """
+        Busca los steps más relevantes con un índice invertido BM25
+
+        Args:
+            query (str): Texto a buscar (acentos y mayúsculas no importan)
+            top_k (int): Número máximo de resultados (None para todos)
+
+        Returns:
+            list: Steps con tipo, texto, función, archivo, línea y score
+        """
+        signature = tuple(
+            (key, entry["hash"]) for key, entry in self._code_cache.iter_entries("steps")
+        )
+        if self._step_search is None or signature != self._step_search_signature:
+            self._step_search = StepSearchIndex().build(self._code_cache.steps())
+            self._step_search_signature = signature
+        return self._step_search.search(query, top_k)
 
     def find_similar_steps(self, step_text):
         """
@@ -38,37 +69,23 @@ class CodeReuseHelper:
         """
         similar_steps = []
 
-        if not self.features_dir.exists():
-            return similar_steps
-
-        # Buscar en archivos de steps
-        steps_files = list(self.features_dir.rglob("*_steps.py"))
-
-        for steps_file in steps_files:
-            try:
-                with open(steps_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Buscar decoradores de steps
-                step_pattern = r'@(given|when|then)\s*\(\s*["\']([^"\']+)["\']'
-                matches = re.findall(step_pattern, content, re.IGNORECASE)
-
-                for step_type, step_content in matches:
-                    # Verificar similitud
-                    if self._is_similar_step(step_text, step_content):
-                        similar_steps.append(
-                            {
-                                "file": str(steps_file),
-                                "type": step_type,
-                                "content": step_content,
-                                "similarity": self._calculate_similarity(
-                                    step_text, step_content
-                                ),
-                            }
-                        )
-
-            except (IOError, OSError) as e:
-                print(f"Error leyendo {steps_file}: {e}")
+        # Solo se comparan los steps que comparten algún término (índice invertido)
+        for step in self.search_steps(step_text, top_k=None):
+            # Verificar similitud
+            if self._is_similar_step(step_text, step["text"]):
+                similar_steps.append(
+                    {
+                        "file": step["file"],
+                        "type": step["type"],
+                        "content": step["text"],
+                        "function": step["function"],
+                        "line": step["line"],
+                        "score": step["score"],
+                        "similarity": self._calculate_similarity(
+                            step_text, step["text"]
+                        ),
+                    }
+                )
 
         # Ordenar por similitud
         similar_steps.sort(key=lambda x: x["similarity"], reverse=True)
@@ -86,39 +103,28 @@ class CodeReuseHelper:
         """
         reusable_pages = []
 
-        if not self.pages_dir.exists():
-            return reusable_pages
-
-        # Buscar archivos de Page Objects
-        page_files = list(self.pages_dir.glob("*_page.py"))
-
-        for page_file in page_files:
-            try:
-                with open(page_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Buscar métodos que puedan ser útiles
-                method_pattern = r"def\s+(\w+)\s*\("
-                methods = re.findall(method_pattern, content)
-
-                # Verificar si algún método es relevante
-                relevant_methods = []
-                for method in methods:
-                    if self._is_relevant_method(method, functionality):
-                        relevant_methods.append(method)
-
-                if relevant_methods:
-                    reusable_pages.append(
-                        {
-                            "file": str(page_file),
-                            "class_name": page_file.stem.replace("_page", "Page"),
-                            "methods": relevant_methods,
-                            "relevance": len(relevant_methods),
-                        }
-                    )
+        for page_file, entry in self._code_cache.iter_entries("page"):
+            # Verificar si algún método es relevante
+            relevant_methods = [
+                method["name"]
+                for method in entry["methods"]
+                if self._is_relevant_method(method["name"], functionality)
+            ]
 
-            except (IOError, OSError) as e:
-                print(f"Error leyendo {page_file}: {e}")
+            if relevant_methods:
+                class_names = [cls["name"] for cls in entry["classes"]]
+                reusable_pages.append(
+                    {
+                        "file": str(self.project_root / page_file),
+                        "class_name": (
+                            class_names[0]
+                            if class_names
+                            else Path(page_file).stem.replace("_page", "Page")
+                        ),
+                        "methods": relevant_methods,
+                        "relevance": len(relevant_methods),
+                    }
+                )
 
         # Ordenar por relevancia
         reusable_pages.sort(key=lambda x: x["relevance"], reverse=True)
@@ -136,42 +142,34 @@ class CodeReuseHelper:
         """
         reusable_locators = []
 
-        if not self.locators_dir.exists():
-            return reusable_locators
-
-        # Buscar archivos de Locators
-        locator_files = list(self.locators_dir.glob("*_locators.py"))
-
-        for locator_file in locator_files:
-            try:
-                with open(locator_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Buscar constantes de locators
-                locator_pattern = r'(\w+)\s*=\s*["\']([^"\']+)["\']'
-                matches = re.findall(locator_pattern, content)
-
-                relevant_locators = []
-                for locator_name, locator_value in matches:
-                    if self._is_relevant_locator(locator_name, element_type):
-                        relevant_locators.append(
-                            {"name": locator_name, "value": locator_value}
-                        )
+        for locator_file, entry in self._code_cache.iter_entries("locators"):
+            relevant_locators = [
+                {
+                    "name": locator["name"],
+                    "value": locator["value"],
+                    "strategy": locator["strategy"],
+                    "line": locator["line"],
+                }
+                for locator in entry["locators"]
+                if self._is_relevant_locator(locator["name"], element_type)
+            ]
 
-                if relevant_locators:
-                    reusable_locators.append(
-                        {
-                            "file": str(locator_file),
-                            "class_name": locator_file.stem.replace(
+            if relevant_locators:
+                class_names = [cls["name"] for cls in entry["classes"]]
+                reusable_locators.append(
+                    {
+                        "file": str(self.project_root / locator_file),
+                        "class_name": (
+                            class_names[0]
+                            if class_names
+                            else Path(locator_file).stem.replace(
                                 "_locators", "Locators"
-                            ),
-                            "locators": relevant_locators,
-                            "relevance": len(relevant_locators),
-                        }
-                    )
-
-            except (IOError, OSError) as e:
-                print(f"Error leyendo {locator_file}: {e}")
+                            )
+                        ),
+                        "locators": relevant_locators,
+                        "relevance": len(relevant_locators),
+                    }
+                )
 
         # Ordenar por relevancia
         reusable_locators.sort(key=lambda x: x["relevance"], reverse=True)
@@ -189,37 +187,21 @@ class CodeReuseHelper:
         """
         reusable_utilities = []
 
-        if not self.utils_dir.exists():
-            return reusable_utilities
-
-        # Buscar archivos de utilidades
-        utility_files = list(self.utils_dir.glob("*.py"))
-
-        for utility_file in utility_files:
-            try:
-                with open(utility_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Buscar funciones que puedan ser útiles
-                function_pattern = r"def\s+(\w+)\s*\("
-                functions = re.findall(function_pattern, content)
-
-                relevant_functions = []
-                for function in functions:
-                    if self._is_relevant_function(function, utility_type):
-                        relevant_functions.append(function)
-
-                if relevant_functions:
-                    reusable_utilities.append(
-                        {
-                            "file": str(utility_file),
-                            "functions": relevant_functions,
-                            "relevance": len(relevant_functions),
-                        }
-                    )
+        for utility_file, entry in self._code_cache.iter_entries("utility"):
+            relevant_functions = [
+                function["name"]
+                for function in entry["functions"] + entry["methods"]
+                if self._is_relevant_function(function["name"], utility_type)
+            ]
 
-            except (IOError, OSError) as e:
-                print(f"Error leyendo {utility_file}: {e}")
+            if relevant_functions:
+                reusable_utilities.append(
+                    {
+                        "file": str(self.project_root / utility_file),
+                        "functions": relevant_functions,
+                        "relevance": len(relevant_functions),
+                    }
+                )
 
         # Ordenar por relevancia
         reusable_utilities.sort(key=lambda x: x["relevance"], reverse=True)
@@ -227,30 +209,12 @@ class CodeReuseHelper:
 
     def _is_similar_step(self, step1, step2):
         """Verifica si dos steps son similares"""
-        # Normalizar textos
-        step1_norm = step1.lower().strip()
-        step2_norm = step2.lower().strip()
-
-        # Verificar palabras clave comunes
-        keywords1 = set(step1_norm.split())
-        keywords2 = set(step2_norm.split())
-
-        # Calcular intersección
-        intersection = keywords1.intersection(keywords2)
-        union = keywords1.union(keywords2)
-
-        # Calcular similitud
-        similarity = len(intersection) / len(union) if union else 0
-
-        return similarity > 0.3  # 30% de similitud
+        return self._calculate_similarity(step1, step2) > 0.3  # 30% de similitud
 
     def _calculate_similarity(self, step1, step2):
-        """Calcula la similitud entre dos steps"""
-        step1_norm = step1.lower().strip()
-        step2_norm = step2.lower().strip()
-
-        keywords1 = set(step1_norm.split())
-        keywords2 = set(step2_norm.split())
+        """Calcula la similitud entre dos steps (tokens sin acentos y con stemming)"""
+        keywords1 = set(tokenize(step1))
+        keywords2 = set(tokenize(step2))
 
         intersection = keywords1.intersection(keywords2)
         union = keywords1.union(keywords2)
@@ -423,12 +387,11 @@ class CodeReuseHelper:
             # Extraer palabras clave del requerimiento
             keywords = self._extract_keywords(new_requirement)
 
+            # Buscar steps relacionados con el requerimiento completo (BM25)
+            suggestions["reusable_steps"] = self.search_steps(new_requirement, top_k=5)
+
             # Buscar código relacionado
             for keyword in keywords:
-                # Buscar steps similares
-                similar_steps = self.find_similar_steps(keyword)
-                suggestions["reusable_steps"].extend(similar_steps[:3])  # Top 3
-
                 # Buscar page objects
                 reusable_pages = self.find_reusable_page_objects(keyword)
                 suggestions["reusable_pages"].extend(reusable_pages[:3])
@@ -469,13 +432,14 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from pages.base_page import BasePage
+from utils.locator_registry import locator_registry
 
 class {functionality.title().replace(' ', '')}Page(BasePage):
     \"\"\"Page Object para {functionality}\"\"\"
 
     def __init__(self, driver):
         super().__init__(driver)
-        self.locators = {functionality.title().replace(' ', '')}Locators()
+        self.locators = locator_registry.get({functionality.title().replace(' ', '')}Locators)
 
     def navigate_to_{functionality.lower().replace(' ', '_')}(self):
         \"\"\"Navegar a la página de {functionality}\"\"\"
@@ -528,6 +492,9 @@ def step_verify_{functionality.lower().replace(' ', '_')}_result(context):
         }
 
         try:
+            # Todos los chequeos comparten un único análisis por archivo
+            self._consistency_results = self._consistency_checker.run()
+
             # Validar convenciones de nombres
             inconsistencies["naming_conventions"] = self._check_naming_conventions()
 
@@ -544,6 +511,8 @@ def step_verify_{functionality.lower().replace(' ', '_')}_result(context):
 
         except Exception as e:
             self.logger.error(f"Error validando consistencia: {e}")
+        finally:
+            self._consistency_results = None
 
         return inconsistencies
 
@@ -657,21 +626,9 @@ result = {utility_files[0].stem if utility_files else 'funcion_ejemplo'}()
         """Analiza patrones comunes en steps"""
         patterns = []
         try:
-            if self.features_dir.exists():
-                steps_files = list(self.features_dir.rglob("*_steps.py"))
-                for steps_file in steps_files:
-                    with open(steps_file, "r", encoding="utf-8") as f:
-                        content = f.read()
-
-                    # Buscar patrones comunes
-                    step_patterns = re.findall(
-                        r'@(given|when|then)\s*\(\s*["\']([^"\']+)["\']', content
-                    )
-                    for step_type, step_content in step_patterns:
-                        if (
-                            len(step_content.split()) >= 3
-                        ):  # Steps con al menos 3 palabras
-                            patterns.append(f"{step_type}: {step_content}")
+            for step in self._code_cache.steps():
+                if len(step["text"].split()) >= 3:  # Steps con al menos 3 palabras
+                    patterns.append(f"{step['type']}: {step['text']}")
         except Exception as e:
             self.logger.error(f"Error analizando patrones de steps: {e}")
         return patterns[:10]  # Top 10
@@ -680,17 +637,10 @@ result = {utility_files[0].stem if utility_files else 'funcion_ejemplo'}()
         """Analiza patrones comunes en métodos"""
         patterns = []
         try:
-            if self.pages_dir.exists():
-                page_files = list(self.pages_dir.glob("*_page.py"))
-                for page_file in page_files:
-                    with open(page_file, "r", encoding="utf-8") as f:
-                        content = f.read()
-
-                    # Buscar métodos comunes
-                    method_patterns = re.findall(r"def\s+(\w+)\s*\(", content)
-                    for method in method_patterns:
-                        if len(method) > 3:  # Métodos con nombres significativos
-                            patterns.append(f"{page_file.stem}: {method}")
+            for page_file, entry in self._code_cache.iter_entries("page"):
+                for method in entry["methods"]:
+                    if len(method["name"]) > 3:  # Métodos con nombres significativos
+                        patterns.append(f"{Path(page_file).stem}: {method['name']}")
         except Exception as e:
             self.logger.error(f"Error analizando patrones de métodos: {e}")
         return patterns[:10]  # Top 10
@@ -699,19 +649,10 @@ result = {utility_files[0].stem if utility_files else 'funcion_ejemplo'}()
         """Analiza patrones comunes en locators"""
         patterns = []
         try:
-            if self.locators_dir.exists():
-                locator_files = list(self.locators_dir.glob("*_locators.py"))
-                for locator_file in locator_files:
-                    with open(locator_file, "r", encoding="utf-8") as f:
-                        content = f.read()
-
-                    # Buscar locators comunes
-                    locator_patterns = re.findall(
-                        r'(\w+)\s*=\s*["\']([^"\']+)["\']', content
-                    )
-                    for locator_name, locator_value in locator_patterns:
-                        if len(locator_name) > 3:  # Locators con nombres significativos
-                            patterns.append(f"{locator_file.stem}: {locator_name}")
+            for locator_file, entry in self._code_cache.iter_entries("locators"):
+                for locator in entry["locators"]:
+                    if len(locator["name"]) > 3:  # Locators con nombres significativos
+                        patterns.append(f"{Path(locator_file).stem}: {locator['name']}")
         except Exception as e:
             self.logger.error(f"Error analizando patrones de locators: {e}")
         return patterns[:10]  # Top 10
@@ -720,20 +661,10 @@ result = {utility_files[0].stem if utility_files else 'funcion_ejemplo'}()
         """Analiza patrones comunes en utilidades"""
         patterns = []
         try:
-            if self.utils_dir.exists():
-                utility_files = list(self.utils_dir.glob("*.py"))
-                for utility_file in utility_files:
-                    if utility_file.name != "__init__.py":
-                        with open(utility_file, "r", encoding="utf-8") as f:
-                            content = f.read()
-
-                        # Buscar funciones comunes
-                        function_patterns = re.findall(r"def\s+(\w+)\s*\(", content)
-                        for function in function_patterns:
-                            if (
-                                len(function) > 3
-                            ):  # Funciones con nombres significativos
-                                patterns.append(f"{utility_file.stem}: {function}")
+            for utility_file, entry in self._code_cache.iter_entries("utility"):
+                for function in entry["functions"] + entry["methods"]:
+                    if len(function["name"]) > 3:  # Funciones con nombres significativos
+                        patterns.append(f"{Path(utility_file).stem}: {function['name']}")
         except Exception as e:
             self.logger.error(f"Error analizando patrones de utilidades: {e}")
         return patterns[:10]  # Top 10
@@ -884,57 +815,84 @@ result = {utility_files[0].stem if utility_files else 'funcion_ejemplo'}()
                         )
 
             # Verificar archivos de steps
-            if self.features_dir.exists():
-                steps_files = list(self.features_dir.rglob("*_steps.py"))
+            steps_dir = self.features_dir / "steps"
+            if steps_dir.exists():
+                steps_files = list(steps_dir.glob("*.py"))
                 for steps_file in steps_files:
-                    if not steps_file.name.endswith("_steps.py"):
+                    if (
+                        not steps_file.name.endswith("_steps.py")
+                        and steps_file.name != "__init__.py"
+                    ):
                         issues.append(
                             f"Steps file should end with '_steps.py': {steps_file}"
                         )
 
+            # Verificar nombres de clases, funciones y steps (AST)
+            for file_path, result in self._get_consistency_results().items():
+                for message, line in result["naming"]:
+                    issues.append(f"{message} ({file_path}:{line})")
+
         except Exception as e:
             self.logger.error(f"Error verificando convenciones de nombres: {e}")
 
         return issues
 
+    def _get_consistency_results(self) -> Dict[str, Dict]:
+        """Resultados del análisis por archivo (los de la validación en curso si existen)"""
+        if self._consistency_results is None:
+            return self._consistency_checker.run()
+        return self._consistency_results
+
     def _check_missing_docstrings(self) -> List[str]:
-        """Verifica docstrings faltantes"""
+        """Verifica docstrings faltantes en clases y funciones públicas"""
         issues = []
         try:
-            # Verificar en pages
-            if self.pages_dir.exists():
-                page_files = list(self.pages_dir.glob("*_page.py"))
-                for page_file in page_files:
-                    with open(page_file, "r", encoding="utf-8") as f:
-                        content = f.read()
-
-                    # Buscar clases sin docstring
-                    class_pattern = r"class\s+(\w+).*?:"
-                    classes = re.findall(class_pattern, content)
-                    for class_name in classes:
-                        if (
-                            f"class {class_name}" in content
-                            and f'"""{class_name}' not in content
-                        ):
-                            issues.append(
-                                f"Missing docstring for class {class_name} in {page_file}"
-                            )
+            for file_path, result in self._get_consistency_results().items():
+                for name, line in result["missing_docstrings"]:
+                    issues.append(f"Missing docstring for {name} in {file_path}:{line}")
 
         except Exception as e:
             self.logger.error(f"Error verificando docstrings: {e}")
 
         return issues
 
+    def find_duplicate_code(self, min_lines: int = 10) -> List[Dict]:
+        """
+        Busca grupos de código duplicado en pages/, features/steps/ y utils/
+
+        Args:
+            min_lines: Líneas mínimas de un clon para reportarlo
+
+        Returns:
+            Lista de grupos con sus ubicaciones (archivo, línea inicial y final)
+        """
+        detector = CloneDetector(self.project_root)
+        groups = detector.find_clones()
+        for path, error in detector.errors.items():
+            self.logger.warning(f"No se pudo analizar {path}: {error}")
+        return [group for group in groups if group["lines"] >= min_lines]
+
     def _check_duplicate_code(self) -> List[str]:
         """Verifica código duplicado"""
         issues = []
-        # Implementación básica - se puede expandir
+        try:
+            for group in self.find_duplicate_code():
+                issues.append(format_clone_group(group))
+        except Exception as e:
+            self.logger.error(f"Error verificando código duplicado: {e}")
         return issues
 
     def _check_unused_imports(self) -> List[str]:
-        """Verifica imports no utilizados"""
+        """Verifica imports no utilizados (nombres enlazados que nunca se leen)"""
         issues = []
-        # Implementación básica - se puede expandir
+        try:
+            for file_path, result in self._get_consistency_results().items():
+                for name, line in result["unused_imports"]:
+                    issues.append(f"Unused import '{name}' in {file_path}:{line}")
+
+        except Exception as e:
+            self.logger.error(f"Error verificando imports no utilizados: {e}")
+
         return issues
 
 
@@ -8,6 +8,8 @@ import re
 from datetime import datetime
 from pathlib import Path
 
+from .log_analyzer import ERROR_PATTERNS, StreamingLogAnalyzer, get_file_info
+from .step_event_log import StepEventReader
 from .pdf_generator import PDFGenerator
 
 
@@ -221,7 +223,11 @@ Esta ejecución se completó **exitosamente** con {summary.get('successful_steps
         steps = execution_data.get("steps", [])
 
         # Analizar el log si está disponible
-        log_analysis = self._analyze_log_file(log_file_path) if log_file_path else {}
+        log_analysis = (
+            self._analyze_log_file(log_file_path, exec_info.get("events_file"))
+            if log_file_path
+            else {}
+        )
 
         content = f"""# Análisis de Fallo - {exec_info.get('test_name', 'Test')}
 
@@ -357,62 +363,46 @@ Esta ejecución se completó **exitosamente** con {summary.get('successful_steps
 
         return content
 
-    def _analyze_log_file(self, log_file_path):
+    def _analyze_log_file(self, log_file_path, events_file=None):
         """Analiza el archivo de log para extraer información de errores"""
         try:
             if not log_file_path or not os.path.exists(log_file_path):
                 return {}
 
+            # Preferir el log estructurado de eventos sobre el parseo del texto
+            if events_file and os.path.exists(events_file):
+                file_info = get_file_info(events_file)
+                log_analysis = {
+                    "file_path": events_file,
+                    "file_size": file_info["file_size"],
+                    "last_modified": file_info["last_modified"],
+                }
+                log_analysis.update(
+                    StepEventReader(events_file).analyze_errors(self._classify_error)
+                )
+                return log_analysis
+
+            file_info = get_file_info(log_file_path)
             log_analysis = {
                 "file_path": log_file_path,
-                "file_size": os.path.getsize(log_file_path),
-                "last_modified": datetime.fromtimestamp(
-                    os.path.getmtime(log_file_path)
-                ).strftime("%Y-%m-%d %H:%M:%S"),
+                "file_size": file_info["file_size"],
+                "last_modified": file_info["last_modified"],
                 "errors": [],
                 "patterns": {},
             }
 
-            with open(log_file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-
-            # Patrones de error comunes
-            error_patterns = [
-                (r"ERROR", "Error General"),
-                (r"FAILED", "Paso Fallido"),
-                (r"Exception", "Excepción"),
-                (r"TimeoutException", "Timeout"),
-                (r"NoSuchElementException", "Elemento No Encontrado"),
-                (r"WebDriverException", "Error de WebDriver"),
-                (r"AssertionError", "Error de Aserción"),
-                (r"AttributeError", "Error de Atributo"),
-                (r"KeyError", "Error de Clave"),
-                (r"ValueError", "Error de Valor"),
-            ]
-
-            # Contar patrones
-            for pattern, name in error_patterns:
-                count = sum(
-                    1 for line in lines if re.search(pattern, line, re.IGNORECASE)
-                )
-                if count > 0:
-                    log_analysis["patterns"][name] = count
-
-            # Extraer errores específicos
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if any(
-                    re.search(pattern, line, re.IGNORECASE)
-                    for pattern, _ in error_patterns
-                ):
-                    error_info = {
-                        "line_number": i + 1,
-                        "timestamp": self._extract_timestamp(line),
-                        "type": self._classify_error(line),
-                        "message": line,
-                        "context": self._get_context(lines, i),
-                    }
-                    log_analysis["errors"].append(error_info)
+            # Recorrido único en streaming con ventanas de contexto acotadas
+            result = StreamingLogAnalyzer().analyze_errors(
+                log_file_path,
+                ERROR_PATTERNS,
+                classifier=self._classify_error,
+                include_context=True,
+                include_rotated=True,
+            )
+            log_analysis["errors"] = result["errors"]
+            log_analysis["patterns"] = result["patterns"]
+            log_analysis["total_errors"] = result["total_errors"]
+            log_analysis["errors_truncated"] = result["errors_truncated"]
 
             return log_analysis
 
@@ -443,15 +433,6 @@ Esta ejecución se completó **exitosamente** con {summary.get('successful_steps
         else:
             return "Error Desconocido"
 
-    def _get_context(self, lines, error_line_index, context_lines=2):
-        """Obtiene contexto alrededor de una línea de error"""
-        start = max(0, error_line_index - context_lines)
-        end = min(len(lines), error_line_index + context_lines + 1)
-        context = lines[start:end]
-        return "\n".join(
-            f"L{start + i + 1}: {line.strip()}" for i, line in enumerate(context)
-        )
-
     def generate_daily_documentation_summary(self):
         """Genera un resumen diario de toda la documentación"""
         try:
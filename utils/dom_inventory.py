@@ -0,0 +1,198 @@
+"""
+Inventario del DOM - Diagnóstico de Elementos en una Sola Consulta
+Serializa los elementos de varias consultas (CSS, XPath o etiqueta) con su
+etiqueta, id, name, clases, texto, visibilidad y posición en un único
+execute_script, sin find_elements ni get_attribute por elemento y sin esperar
+el implicit wait cuando una consulta no encuentra nada
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+# Consulta: (nombre, tipo de By, valor) o (nombre, tipo de By, valor, límite de elementos)
+Query = Union[Tuple[str, str, str], Tuple[str, str, str, Optional[int]]]
+
+INVENTORY_SCRIPT = """
+var queries = arguments[0];
+
+function find(by, value) {
+    if (by === 'xpath') {
+        var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < snapshot.snapshotLength; i++) {
+            if (snapshot.snapshotItem(i).nodeType === 1) { nodes.push(snapshot.snapshotItem(i)); }
+        }
+        return nodes;
+    }
+    if (by === 'tag name') { return Array.prototype.slice.call(document.getElementsByTagName(value)); }
+    if (by === 'id') { value = '#' + CSS.escape(value); }
+    else if (by === 'name') { value = '[name="' + CSS.escape(value) + '"]'; }
+    else if (by === 'class name') { value = '.' + CSS.escape(value); }
+    else if (by !== 'css selector') { throw new Error('Tipo de locator no soportado: ' + by); }
+    return Array.prototype.slice.call(document.querySelectorAll(value));
+}
+
+function describe(element) {
+    var style = window.getComputedStyle(element);
+    var rect = element.getBoundingClientRect();
+    var type = element.getAttribute('type');
+    return {
+        tag: element.tagName.toLowerCase(),
+        id: element.id || null,
+        name: element.getAttribute('name'),
+        type: type,
+        classes: element.getAttribute('class'),
+        text: (element.innerText || '').replace(/\\s+/g, ' ').trim().slice(0, 120) || null,
+        value: type === 'password' ? null : (element.value === undefined ? null : String(element.value) || null),
+        placeholder: element.getAttribute('placeholder'),
+        role: element.getAttribute('role'),
+        data_value: element.getAttribute('data-value'),
+        visible: element.getClientRects().length > 0 && style.visibility !== 'hidden' && style.display !== 'none',
+        box: [Math.round(rect.left), Math.round(rect.top), Math.round(rect.width), Math.round(rect.height)]
+    };
+}
+
+return queries.map(function (query) {
+    try {
+        var elements = find(query[1], query[2]);
+        var limit = query[3] == null ? elements.length : query[3];
+        return {count: elements.length, elements: elements.slice(0, limit).map(describe), error: null};
+    } catch (e) {
+        return {count: 0, elements: [], error: e.name + ': ' + e.message};
+    }
+});
+"""
+
+# Columnas de la tabla del log: (campo, encabezado, ancho máximo)
+TABLE_COLUMNS = (
+    ("tag", "tag", 10),
+    ("id", "id", 24),
+    ("name", "name", 20),
+    ("type", "type", 10),
+    ("classes", "class", 40),
+    ("text", "texto", 40),
+    ("visible", "visible", 7),
+    ("box", "x,y,ancho,alto", 20),
+)
+
+
+def selector_queries(selectors: Sequence[Tuple[str, str]], limit: Optional[int] = None) -> List[Query]:
+    """
+    Consultas a partir de pares (nombre, selector): XPath si empieza con "/" o "(", CSS si no
+
+    Args:
+        selectors: Pares (nombre, selector)
+        limit: Máximo de elementos serializados por consulta (None = todos)
+    """
+    return [
+        (name, "xpath" if selector.startswith(("/", "(")) else "css selector", selector, limit)
+        for name, selector in selectors
+    ]
+
+
+def tag_queries(*tags: Union[str, Tuple[str, Optional[int]]]) -> List[Query]:
+    """
+    Consultas por etiqueta: "input" o ("li", 10) para limitar los elementos serializados
+    """
+    queries = []
+    for tag in tags:
+        name, limit = (tag, None) if isinstance(tag, str) else tag
+        queries.append((name, "tag name", name, limit))
+    return queries
+
+
+def describe_element(element: Dict[str, Any]) -> str:
+    """Resumen de una línea de un elemento del inventario"""
+    text = element.get("text") or element.get("value") or element.get("placeholder") or "Sin texto"
+    return (
+        f"tag={element.get('tag')}, type={element.get('type') or 'Sin tipo'}, text='{text}', "
+        f"class='{element.get('classes') or 'Sin clase'}', id='{element.get('id') or 'Sin ID'}'"
+    )
+
+
+def format_inventory(inventory: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Tabla de texto del inventario para el log (una sección por consulta)
+
+    Returns:
+        Texto con una línea por elemento serializado
+    """
+    lines = []
+    for name, result in inventory.items():
+        if result["error"]:
+            lines.append(f"❌ {name}: {result['error']}")
+            continue
+        shown = len(result["elements"])
+        suffix = f" (se muestran {shown})" if shown < result["count"] else ""
+        lines.append(f"📋 {name}: {result['count']} elementos{suffix}")
+        if not shown:
+            continue
+        rows = [["#"] + [header for _, header, _ in TABLE_COLUMNS]]
+        for index, element in enumerate(result["elements"], 1):
+            row = [str(index)]
+            for field, _, width in TABLE_COLUMNS:
+                value = element.get(field)
+                if field == "box":
+                    value = ",".join(str(coordinate) for coordinate in value)
+                elif field == "visible":
+                    value = "sí" if value else "no"
+                value = "-" if value in (None, "") else str(value)
+                row.append(value if len(value) <= width else value[: width - 1] + "…")
+            rows.append(row)
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        for row in rows:
+            lines.append(
+                "   " + " | ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+            )
+    return "\n".join(lines)
+
+
+class DomInventory:
+    """Inventario de elementos de la página actual en un solo round trip"""
+
+    def __init__(self, driver):
+        """
+        Args:
+            driver: Instancia del WebDriver
+        """
+        self.driver = driver
+        self.logger = logging.getLogger(__name__)
+
+    def collect(self, queries: Sequence[Query]) -> Dict[str, Dict[str, Any]]:
+        """
+        Ejecuta todas las consultas en el navegador con un único execute_script
+
+        Args:
+            queries: Consultas (nombre, tipo de By, valor[, límite])
+
+        Returns:
+            Diccionario nombre -> {"count", "elements", "error"}; los selectores
+            inválidos (p. ej. :contains en CSS) quedan con su error en lugar de
+            interrumpir el resto
+        """
+        normalized = [list(query) + [None] * (4 - len(query)) for query in queries]
+        try:
+            results = self.driver.execute_script(INVENTORY_SCRIPT, normalized)
+        except Exception as e:
+            self.logger.error(f"Error obteniendo inventario del DOM: {str(e)}")
+            results = [{"count": 0, "elements": [], "error": str(e)} for _ in normalized]
+        return {query[0]: result for query, result in zip(normalized, results)}
+
+    def save(self, inventory: Dict[str, Dict[str, Any]], path: Union[str, Path]) -> Optional[str]:
+        """
+        Guarda el inventario como JSON (junto a las evidencias del escenario)
+
+        Returns:
+            Ruta del archivo o None si no se pudo escribir
+        """
+        try:
+            os.makedirs(os.path.dirname(str(path)) or ".", exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(inventory, f, indent=2, ensure_ascii=False)
+            return str(path)
+        except Exception as e:
+            self.logger.error(f"Error guardando inventario del DOM: {str(e)}")
+            return None
@@ -0,0 +1,164 @@
+"""
+Snapshots del DOM - Copia Sanitizada de Cada Pantalla Visitada
+Guarda la última versión del HTML de cada pantalla (login, OKTA, inicio, Gestor
+de catálogos, Zafras) para validar locators sin navegador
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Primera coincidencia gana: (pantalla, patrón sobre la URL o el título)
+SCREEN_PATTERNS = (
+    ("okta", re.compile(r"okta\.com", re.IGNORECASE)),
+    ("zafras", re.compile(r"zafra", re.IGNORECASE)),
+    ("gestor_catalogos", re.compile(r"cat[aá]logo|catalog", re.IGNORECASE)),
+    ("login", re.compile(r"/login", re.IGNORECASE)),
+    ("main", re.compile(r"/home", re.IGNORECASE)),
+)
+
+# URL, título y HTML en una sola consulta al navegador
+CAPTURE_SCRIPT = (
+    "return [window.location.href, document.title, "
+    "document.documentElement ? document.documentElement.outerHTML : ''];"
+)
+
+# Contenido que no se guarda: código, estilos, comentarios y datos escritos por el usuario
+SCRIPT_PATTERN = re.compile(r"<(script|style|noscript)\b([^>]*)>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+COMMENT_PATTERN = re.compile(r"<!--.*?-->", re.DOTALL)
+INPUT_PATTERN = re.compile(r"<input\b[^>]*>", re.IGNORECASE)
+VALUE_ATTRIBUTE_PATTERN = re.compile(r"""(\svalue\s*=\s*)("[^"]*"|'[^']*'|[^\s>]+)""", re.IGNORECASE)
+TEXTAREA_PATTERN = re.compile(r"(<textarea\b[^>]*>).*?(</textarea\s*>)", re.IGNORECASE | re.DOTALL)
+TOKEN_META_PATTERN = re.compile(
+    r"""(<meta\b[^>]*name\s*=\s*["'][^"']*(?:csrf|token)[^"']*["'][^>]*?\scontent\s*=\s*)("[^"]*"|'[^']*')""",
+    re.IGNORECASE,
+)
+
+
+def sanitize_html(html: str) -> str:
+    """
+    Elimina del HTML lo que no sirve para evaluar locators o no debe guardarse
+
+    Quita scripts, estilos y comentarios, y vacía los valores de inputs,
+    textareas y metadatos de tokens (usuarios, contraseñas, CSRF). Se conservan
+    etiquetas, atributos y textos visibles, que es lo que usan los locators.
+    """
+    html = SCRIPT_PATTERN.sub(lambda match: f"<{match.group(1)}{match.group(2)}></{match.group(1)}>", html)
+    html = COMMENT_PATTERN.sub("", html)
+    html = INPUT_PATTERN.sub(lambda match: VALUE_ATTRIBUTE_PATTERN.sub(r'\1""', match.group(0)), html)
+    html = TEXTAREA_PATTERN.sub(r"\1\2", html)
+    html = TOKEN_META_PATTERN.sub(r'\1""', html)
+    return html
+
+
+def classify_screen(url: str, title: str = "") -> str:
+    """
+    Nombre de la pantalla a partir de la URL y el título
+
+    Returns:
+        Una de las pantallas de SCREEN_PATTERNS o, si ninguna coincide, la ruta
+        de la URL normalizada ("configuracion_usuarios")
+    """
+    for screen, pattern in SCREEN_PATTERNS:
+        if pattern.search(url) or pattern.search(title or ""):
+            return screen
+    path = re.sub(r"^[a-z]+://[^/]+", "", url.split("?")[0].split("#")[0])
+    slug = re.sub(r"[^a-z0-9]+", "_", path.lower()).strip("_")
+    return slug or "index"
+
+
+class DomSnapshotManager:
+    """Captura y guarda un snapshot sanitizado por pantalla"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: Sección "dom_snapshots" de config.json (enabled, directory)
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        self.snapshots_dir = Path(config.get("directory", "snapshots"))
+        self.logger = logging.getLogger(__name__)
+
+        # Hash del último contenido guardado por pantalla
+        self._saved_hashes: Dict[str, str] = {}
+
+    def capture(self, driver, screen: Optional[str] = None) -> Optional[Path]:
+        """
+        Guarda el DOM de la pantalla actual si cambió desde el último snapshot
+
+        Args:
+            driver: Instancia del WebDriver
+            screen: Nombre de la pantalla (por defecto se deduce de la URL)
+
+        Returns:
+            Ruta del snapshot escrito o None si no hubo cambios o falló la captura
+        """
+        if not self.enabled or driver is None:
+            return None
+
+        try:
+            url, title, html = driver.execute_script(CAPTURE_SCRIPT)
+            if not html:
+                return None
+
+            screen = screen or classify_screen(url, title)
+            html = sanitize_html(html)
+            digest = hashlib.sha1(html.encode("utf-8")).hexdigest()
+            if self._saved_hashes.get(screen) == digest:
+                return None
+
+            snapshot_path = self.snapshots_dir / f"{screen}.html"
+            if self._saved_hashes.get(screen) is None and self._read_hash(screen) == digest:
+                self._saved_hashes[screen] = digest
+                return None
+
+            self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(snapshot_path, html)
+            self._write_atomic(
+                self.snapshots_dir / f"{screen}.json",
+                json.dumps(
+                    {
+                        "screen": screen,
+                        "url": url.split("?")[0],
+                        "title": title,
+                        "sha1": digest,
+                        "captured_at": datetime.now().isoformat(),
+                    },
+                    indent=2,
+                    ensure_ascii=False,
+                ),
+            )
+            self._saved_hashes[screen] = digest
+            self.logger.debug(f"Snapshot del DOM guardado: {snapshot_path}")
+            return snapshot_path
+
+        except Exception as e:
+            self.logger.warning(f"Error capturando snapshot del DOM: {str(e)}")
+            return None
+
+    def list_snapshots(self) -> List[Path]:
+        """Snapshots guardados (uno por pantalla)"""
+        if not self.snapshots_dir.exists():
+            return []
+        return sorted(self.snapshots_dir.glob("*.html"))
+
+    def _read_hash(self, screen: str) -> Optional[str]:
+        """Hash del snapshot guardado en una ejecución anterior"""
+        try:
+            with open(self.snapshots_dir / f"{screen}.json", "r", encoding="utf-8") as f:
+                return json.load(f).get("sha1")
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str):
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
@@ -5,16 +5,100 @@ Verifica que los elementos existan antes de ejecutar pruebas para evitar fallos
 
 import json
 import logging
-import re
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+
+from .locator_registry import locator_registry
+from .wait_policy import wait_policy
+
+
+# findAll(by, value): resuelve un locator de Selenium en el navegador
+# (by es el valor de By: "xpath", "css selector", ...)
+FIND_ELEMENTS_JS = """
+function findAll(by, value) {
+    switch (by) {
+        case 'id':
+            return document.querySelectorAll('[id="' + CSS.escape(value) + '"]');
+        case 'name':
+            return document.querySelectorAll('[name="' + CSS.escape(value) + '"]');
+        case 'class name':
+            return document.getElementsByClassName(value);
+        case 'tag name':
+            return document.getElementsByTagName(value);
+        case 'css selector':
+            return document.querySelectorAll(value);
+        case 'xpath':
+            var snapshot = document.evaluate(
+                value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                nodes.push(snapshot.snapshotItem(i));
+            }
+            return nodes;
+        case 'link text':
+        case 'partial link text':
+            return Array.prototype.filter.call(document.getElementsByTagName('a'), function (a) {
+                var text = (a.innerText || a.textContent || '').trim();
+                return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+            });
+    }
+    throw new Error('Tipo de locator no soportado: ' + by);
+}
+"""
+
+# Resuelve todos los locators en el navegador y devuelve, por locator, si existe,
+# si es visible y si está habilitado (misma semántica que find_element +
+# is_displayed/is_enabled de Selenium sobre el primer elemento encontrado)
+BATCH_VALIDATION_SCRIPT = (
+    "var locators = arguments[0];\n"
+    + FIND_ELEMENTS_JS
+    + """
+function isDisplayed(element) {
+    if (!element.isConnected || element.getClientRects().length === 0) {
+        return false;
+    }
+    for (var node = element; node && node.nodeType === 1; node = node.parentElement) {
+        var style = window.getComputedStyle(node);
+        if (style.opacity === '0') {
+            return false;
+        }
+        if (node === element && (style.visibility === 'hidden' || style.visibility === 'collapse')) {
+            return false;
+        }
+    }
+    var rect = element.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+
+return locators.map(function (locator) {
+    try {
+        var elements = findAll(locator[0], locator[1]);
+        if (!elements.length) {
+            return {found: 0, displayed: false, enabled: false};
+        }
+        var element = elements[0];
+        return {
+            found: elements.length,
+            displayed: isDisplayed(element),
+            enabled: !(element.matches && element.matches(':disabled'))
+        };
+    } catch (e) {
+        return {found: 0, displayed: false, enabled: false, error: String(e.message || e)};
+    }
+});
+"""
+)
 
 
 class ElementValidationError(Exception):
@@ -26,14 +110,32 @@ class ElementValidationError(Exception):
 class ElementValidator:
     """Sistema avanzado de validación de elementos web"""
 
-    def __init__(self, driver: webdriver.Chrome, timeout: int = 10):
+    def __init__(
+        self,
+        driver: webdriver.Chrome,
+        timeout: int = 10,
+        batch: bool = True,
+        poll_frequency: float = 0.5,
+    ):
+        """
+        Args:
+            driver: Instancia del WebDriver
+            timeout: Segundos de espera; en modo batch es el plazo total de la página
+            batch: Valida todos los locators con un único script por sondeo
+            poll_frequency: Segundos entre sondeos del modo batch
+        """
         self.driver = driver
         self.timeout = timeout
+        self.batch = batch
+        self.poll_frequency = poll_frequency
         self.logger = logging.getLogger(__name__)
         self.validation_results = {}
 
     def validate_page_elements(
-        self, locators: Dict[str, Tuple[str, str]], page_name: str = "Unknown"
+        self,
+        locators: Dict[str, Tuple[str, str]],
+        page_name: str = "Unknown",
+        batch: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """
         Valida que todos los elementos de una página existan
@@ -41,12 +143,16 @@ class ElementValidator:
         Args:
             locators: Diccionario con nombre y locator (tipo, valor)
             page_name: Nombre de la página para logging
+            batch: Fuerza el modo batch o el elemento a elemento (por defecto self.batch)
 
         Returns:
             Diccionario con resultados de validación
         """
         self.logger.info(f"🔍 Validando elementos de la página: {page_name}")
 
+        use_batch = self.batch if batch is None else batch
+        batch_results = self._validate_elements_batch(locators) if use_batch else None
+
         validation_result = {
             "page_name": page_name,
             "timestamp": datetime.now().isoformat(),
@@ -60,9 +166,14 @@ class ElementValidator:
 
         for element_name, (locator_type, locator_value) in locators.items():
             try:
-                is_valid = self._validate_single_element(
-                    locator_type, locator_value, element_name
-                )
+                if batch_results is not None:
+                    reason = batch_results[element_name]
+                    is_valid = reason is None
+                else:
+                    is_valid = self._validate_single_element(
+                        locator_type, locator_value, element_name
+                    )
+                    reason = "Element not found or not interactable"
 
                 if is_valid:
                     validation_result["valid_elements"] += 1
@@ -75,10 +186,10 @@ class ElementValidator:
                             "name": element_name,
                             "locator_type": locator_type,
                             "locator_value": locator_value,
-                            "reason": "Element not found or not interactable",
+                            "reason": reason,
                         }
                     )
-                    self.logger.warning(f"❌ {element_name}: No encontrado")
+                    self.logger.warning(f"❌ {element_name}: {reason}")
 
             except Exception as e:
                 validation_result["invalid_elements"] += 1
@@ -126,7 +237,7 @@ class ElementValidator:
             by_type = self._get_by_type(locator_type)
 
             # Esperar a que el elemento esté presente
-            element = WebDriverWait(self.driver, self.timeout).until(
+            element = wait_policy.wait(self.driver, self.timeout).until(
                 EC.presence_of_element_located((by_type, locator_value))
             )
 
@@ -147,14 +258,91 @@ class ElementValidator:
             self.logger.error(f"Error validando elemento {element_name}: {str(e)}")
             return False
 
+    def _validate_elements_batch(
+        self, locators: Dict[str, Tuple[str, str]]
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Valida todos los locators con un script inyectado por sondeo
+
+        Los locators aún no válidos se vuelven a consultar juntos hasta que
+        lo sean todos o venza el plazo total (self.timeout), así un elemento
+        faltante no cuesta un timeout completo por cada locator.
+
+        Args:
+            locators: Diccionario con nombre y locator (tipo, valor)
+
+        Returns:
+            Diccionario nombre -> None si es válido o el motivo del fallo,
+            o None si el navegador no pudo ejecutar el script
+        """
+        results = {}
+        pending = {}
+        for element_name, (locator_type, locator_value) in locators.items():
+            try:
+                pending[element_name] = (self._get_by_type(locator_type), locator_value)
+            except ValueError as e:
+                results[element_name] = str(e)
+
+        deadline = time.monotonic() + self.timeout
+        round_trips = 0
+        states = {}
+        while pending:
+            names = list(pending)
+            try:
+                response = self.driver.execute_script(
+                    BATCH_VALIDATION_SCRIPT, [list(pending[name]) for name in names]
+                )
+            except WebDriverException as e:
+                self.logger.warning(
+                    f"Validación batch no disponible, se valida elemento a elemento: {str(e)}"
+                )
+                return None
+            round_trips += 1
+
+            for element_name, state in zip(names, response or []):
+                states[element_name] = state or {}
+                if states[element_name].get("error") or self._is_interactable(
+                    states[element_name]
+                ):
+                    del pending[element_name]
+
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
+            time.sleep(min(self.poll_frequency, remaining))
+
+        for element_name, state in states.items():
+            if state.get("error"):
+                results[element_name] = f"Invalid locator: {state['error']}"
+            elif not state.get("found"):
+                results[element_name] = "Element not found"
+            elif not state.get("displayed"):
+                results[element_name] = "Element not displayed"
+            elif not state.get("enabled"):
+                results[element_name] = "Element not enabled"
+            else:
+                results[element_name] = None
+
+        self.logger.debug(
+            f"Validación batch: {len(locators)} locators en {round_trips} consultas"
+        )
+        return results
+
+    @staticmethod
+    def _is_interactable(state: Dict[str, Any]) -> bool:
+        return bool(state.get("found") and state.get("displayed") and state.get("enabled"))
+
     def _get_by_type(self, locator_type: str) -> By:
         """Convierte string de tipo de locator a By enum"""
         locator_map = {
             "id": By.ID,
             "name": By.NAME,
             "class": By.CLASS_NAME,
+            "class_name": By.CLASS_NAME,
             "tag": By.TAG_NAME,
+            "tag_name": By.TAG_NAME,
             "css": By.CSS_SELECTOR,
+            "css_selector": By.CSS_SELECTOR,
             "xpath": By.XPATH,
             "link_text": By.LINK_TEXT,
             "partial_link_text": By.PARTIAL_LINK_TEXT,
@@ -163,6 +351,9 @@ class ElementValidator:
         locator_type_lower = locator_type.lower()
         if locator_type_lower in locator_map:
             return locator_map[locator_type_lower]
+        elif locator_type_lower in locator_map.values():
+            # Valor de By ya resuelto ("css selector", "link text", ...)
+            return locator_type_lower
         else:
             raise ValueError(f"Tipo de locator no válido: {locator_type}")
 
@@ -244,6 +435,10 @@ class ElementValidator:
         """
         Carga locators desde un archivo Python
 
+        Usa el registro de locators compartido (parseado por AST una vez por
+        proceso), que incluye tuplas en varias líneas y locators reutilizados
+        de otras clases.
+
         Args:
             locator_file: Archivo de locators
 
@@ -253,16 +448,7 @@ class ElementValidator:
         locators = {}
 
         try:
-            with open(locator_file, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Buscar patrones de locators (simplificado)
-            # Patrón: VARIABLE = (By.TIPO, "valor")
-            pattern = r'(\w+)\s*=\s*\(By\.(\w+),\s*["\']([^"\']+)["\']\)'
-            matches = re.findall(pattern, content)
-
-            for var_name, by_type, locator_value in matches:
-                locators[var_name] = (by_type.lower(), locator_value)
+            locators = locator_registry.locators_for_file(locator_file)
 
             self.logger.info(f"Cargados {len(locators)} locators desde {locator_file}")
 
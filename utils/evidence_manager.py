@@ -10,6 +10,39 @@ import zipfile
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# Registro de resultados por ejecución (JSON Lines): la cuota de disco lo usa
+# para no desalojar ejecuciones fallidas y para agrupar sus archivos sueltos
+EXECUTION_RESULTS_FILE = "reports/execution_results.jsonl"
+
+# Formato de los timestamps del registro (el mismo de los nombres de archivo)
+RESULT_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+
+def read_execution_results(results_file=EXECUTION_RESULTS_FILE):
+    """
+    Lee el registro de resultados de ejecución
+
+    Args:
+        results_file: Ruta del registro
+
+    Returns:
+        Lista de {"status", "started_at", "finished_at", "evidence_dir", "log_file"}
+        (las líneas inválidas se ignoran)
+    """
+    results = []
+    try:
+        with open(results_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and entry.get("started_at"):
+                    results.append(entry)
+    except OSError:
+        pass
+    return results
+
 
 class EvidenceManager:
     """Gestor de evidencias con organización automática y limpieza"""
@@ -202,6 +235,43 @@ class EvidenceManager:
         except Exception as e:
             self.logger.error(f"Error guardando metadatos: {str(e)}")
 
+    def record_execution_result(
+        self,
+        status,
+        started_at,
+        evidence_dir=None,
+        log_file=None,
+        results_file=EXECUTION_RESULTS_FILE,
+    ):
+        """
+        Agrega el resultado de una ejecución al registro de resultados
+
+        Los archivos de la ejecución (carpeta execution_<ts>, screenshots
+        sueltos, log y reportes) se asocian por su timestamp a la ventana
+        started_at-finished_at de esta entrada.
+
+        Args:
+            status: Resultado (SUCCESS, FAILED, ...)
+            started_at: datetime de inicio del escenario
+            evidence_dir: Carpeta de evidencias de la ejecución
+            log_file: Log del escenario
+            results_file: Ruta del registro
+        """
+        try:
+            finished_at = datetime.now()
+            entry = {
+                "status": str(getattr(status, "name", status)).upper(),
+                "started_at": (started_at or finished_at).strftime(RESULT_TIMESTAMP_FORMAT),
+                "finished_at": finished_at.strftime(RESULT_TIMESTAMP_FORMAT),
+                "evidence_dir": str(evidence_dir) if evidence_dir else None,
+                "log_file": str(log_file) if log_file else None,
+            }
+            os.makedirs(os.path.dirname(results_file) or ".", exist_ok=True)
+            with open(results_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except Exception as e:
+            self.logger.error(f"Error registrando resultado de ejecución: {str(e)}")
+
     def save_performance_metrics(self, execution_dir, metrics):
         """Guarda métricas de rendimiento"""
         try:
@@ -6,8 +6,12 @@ import json
 import logging
 import os
 from datetime import datetime
+from html import escape
 from pathlib import Path
 
+from .run_history import status_text
+from .step_event_log import StepEventReader
+
 
 class ExecutionReportGenerator:
     """Generador de reportes de ejecución con detalles completos"""
@@ -15,8 +19,18 @@ class ExecutionReportGenerator:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def generate_execution_report(self, execution_data):
-        """Genera un reporte completo de la ejecución"""
+    def generate_execution_report(self, execution_data, render_html=True):
+        """
+        Genera un reporte completo de la ejecución
+
+        Args:
+            execution_data: Datos de la ejecución
+            render_html: Si es False solo se escribe el JSON (el HTML lo cubre
+                el reporte agregado de la ejecución)
+
+        Returns:
+            Tupla (ruta HTML o None, ruta JSON)
+        """
         try:
             self.logger.info("Generando reporte de ejecución...")
 
@@ -45,24 +59,29 @@ class ExecutionReportGenerator:
             report_path = feature_reports_dir / report_filename
 
             # Generar contenido del reporte
-            report_content = self._create_report_content(execution_data)
+            if render_html:
+                report_content = self._create_report_content(execution_data)
 
-            # Guardar reporte HTML
-            with open(report_path, "w", encoding="utf-8") as f:
-                f.write(report_content)
+                # Guardar reporte HTML
+                with open(report_path, "w", encoding="utf-8") as f:
+                    f.write(report_content)
 
             # También generar versión JSON para procesamiento automático
             json_report_path = (
                 feature_reports_dir / f"execution_report_{timestamp}.json"
             )
             with open(json_report_path, "w", encoding="utf-8") as f:
-                json.dump(execution_data, f, indent=2, ensure_ascii=False)
+                json.dump(execution_data, f, indent=2, ensure_ascii=False, default=str)
 
-            self.logger.info(f"Reporte generado: {report_path}")
+            if render_html:
+                self.logger.info(f"Reporte generado: {report_path}")
             self.logger.info(f"Reporte JSON generado: {json_report_path}")
             self.logger.info(f"Carpeta de reportes: {feature_reports_dir}")
 
-            return str(report_path), str(json_report_path)
+            return (
+                str(report_path) if render_html else None,
+                str(json_report_path),
+            )
 
         except Exception as e:
             self.logger.error(f"Error generando reporte de ejecución: {str(e)}")
@@ -253,6 +272,24 @@ class ExecutionReportGenerator:
             text-decoration: underline;
         }
 
+        .commands-table {
+            width: 100%;
+            border-collapse: collapse;
+        }
+
+        .commands-table th,
+        .commands-table td {
+            padding: 8px 10px;
+            border-bottom: 1px solid #eee;
+            text-align: left;
+            vertical-align: top;
+        }
+
+        .commands-table th {
+            background: #f8f9fa;
+            color: #667eea;
+        }
+
         .summary-stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
@@ -392,6 +429,8 @@ class ExecutionReportGenerator:
             </ol>
         </div>
 
+        {{ webdriver_commands_section }}
+
         {% if execution_data.features %}
         <div class="section">
             <h2>🔧 Features Ejecutados</h2>
@@ -453,6 +492,7 @@ class ExecutionReportGenerator:
                         <strong>Estado:</strong> {step.get('status', 'UNKNOWN')}<br>
                         <strong>Duración:</strong> {step.get('duration', 'No disponible')}<br>
                         <strong>Timestamp:</strong> {step.get('timestamp', 'No disponible')}
+                        {self._render_step_waits(step)}
                     </div>
                 """
 
@@ -466,6 +506,18 @@ class ExecutionReportGenerator:
                         step_html += f'<a href="{ev.get("path", "#")}" class="evidence-link" target="_blank">{ev.get("name", "Evidencia")} ({ev.get("timestamp", "Sin timestamp")})</a><br>'
                     step_html += "</div>"
 
+                # Inventarios del DOM tomados durante el paso (diagnóstico)
+                inventories = (step.get("events") or {}).get("inventories") or []
+                if inventories:
+                    step_html += '<div class="step-evidence"><strong>🔎 Inventarios del DOM:</strong><br>'
+                    for inventory in inventories:
+                        counts = ", ".join(
+                            f"{escape(str(name))}={count}"
+                            for name, count in (inventory.get("counts") or {}).items()
+                        )
+                        step_html += f'<a href="{escape(str(inventory.get("path") or "#"))}" class="evidence-link" target="_blank">{escape(str(inventory.get("name")))}</a> ({counts})<br>'
+                    step_html += "</div>"
+
                 step_html += "</li>"
                 steps_html += step_html
 
@@ -474,6 +526,12 @@ class ExecutionReportGenerator:
                 steps_html,
             )
 
+            # Tabla de comandos WebDriver por paso (vacía si no hubo driver)
+            html = html.replace(
+                "{{ webdriver_commands_section }}",
+                self._render_webdriver_commands(steps),
+            )
+
             # Reemplazar sección de features
             features_html = ""
             features = data.get("features", [])
@@ -505,6 +563,49 @@ class ExecutionReportGenerator:
             self.logger.error(f"Error renderizando template: {str(e)}")
             return template  # Devolver template original si hay error
 
+    def _render_step_waits(self, step):
+        """Línea con las esperas del paso: tiempo real vs solicitado y timeouts"""
+        events = step.get("events") or {}
+        if not events.get("waits"):
+            return ""
+        return (
+            f"<br><strong>Esperas:</strong> {events['waits']} "
+            f"({events.get('wait_time', 0):.2f}s de {events.get('wait_requested', 0):.2f}s solicitados, "
+            f"{events.get('wait_timeouts', 0)} timeouts)"
+        )
+
+    def _render_webdriver_commands(self, steps):
+        """Sección con los comandos WebDriver, su latencia y el más lento de cada paso"""
+        rows = ""
+        for i, step in enumerate(steps, 1):
+            commands = (step.get("events") or {}).get("webdriver")
+            if not commands:
+                continue
+            slowest = commands.get("slowest") or {}
+            methods = "<br>".join(
+                f"{escape(str(entry['name']))}: {entry['count']} ({entry['time']:.2f}s)"
+                for entry in commands.get("by_method") or []
+            )
+            rows += f"""
+                <tr>
+                    <td>{i}</td>
+                    <td>{escape(str(step.get('name', '')))}</td>
+                    <td>{commands.get('commands', 0)}</td>
+                    <td>{commands.get('total_time', 0):.2f}s</td>
+                    <td>{escape(str(slowest.get('command', '-')))} ({slowest.get('duration', 0):.3f}s)<br>{escape(str(slowest.get('method', '')))}</td>
+                    <td>{methods}</td>
+                </tr>"""
+        if not rows:
+            return ""
+        return f"""<div class="section">
+            <h2>🌐 Comandos WebDriver por Paso</h2>
+            <table class="commands-table">
+                <thead><tr><th>#</th><th>Paso</th><th>Comandos</th><th>Latencia Total</th><th>Comando Más Lento</th><th>Métodos</th></tr></thead>
+                <tbody>{rows}
+                </tbody>
+            </table>
+        </div>"""
+
     def _sanitize_name(self, name):
         """Sanitiza el nombre para usar en nombres de archivos y carpetas"""
         import re
@@ -521,6 +622,8 @@ class ExecutionReportGenerator:
         try:
             # Obtener información de steps desde el scenario de Behave
             steps_data = self._extract_steps_from_scenario(scenario)
+            event_summary = self._load_event_summary(context)
+            self._attach_step_events(steps_data, event_summary)
 
             execution_data = {
                 "execution_info": {
@@ -538,6 +641,7 @@ class ExecutionReportGenerator:
                     "execution_type": self._get_execution_type(scenario, feature),
                     "evidence_directory": self._get_evidence_directory(context),
                     "log_file": getattr(context, "log_file", "No disponible"),
+                    "events_file": getattr(context, "events_file", None),
                     "overall_status": self._get_overall_status(context),
                     "report_generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 },
@@ -553,7 +657,7 @@ class ExecutionReportGenerator:
                 },
                 "steps": steps_data,
                 "features": self._collect_features_data(context, feature),
-                "screenshots": self._collect_screenshots_data(context),
+                "screenshots": self._collect_screenshots_data(context, event_summary),
             }
 
             return execution_data
@@ -573,18 +677,52 @@ class ExecutionReportGenerator:
                 step_data = {
                     "name": step.name,
                     "keyword": step.keyword,
-                    "status": step.status,
+                    "status": status_text(step.status),
                     "duration": getattr(step, "duration", 0),
                     "description": description,
                     "error_message": (
                         getattr(step, "error_message", None)
-                        if step.status == "failed"
+                        if status_text(step.status) == "failed"
                         else None
                     ),
                 }
                 steps_data.append(step_data)
         return steps_data
 
+    def _load_event_summary(self, context):
+        """Carga el resumen por step del log estructurado de eventos, si existe"""
+        events_file = getattr(context, "events_file", None)
+        if not events_file or not os.path.exists(events_file):
+            return {}
+        try:
+            return StepEventReader(events_file).summarize_steps()
+        except Exception as e:
+            self.logger.warning(f"Error leyendo log de eventos: {str(e)}")
+            return {}
+
+    def _attach_step_events(self, steps_data, event_summary):
+        """Asocia a cada step sus esperas, screenshots, errores, comandos WebDriver e inventarios"""
+        pending = [
+            entry
+            for index, entry in sorted(event_summary.items())
+            if index and entry.get("name") is not None
+        ]
+        for step in steps_data:
+            for i, entry in enumerate(pending):
+                if entry["name"] == step["name"]:
+                    step["events"] = {
+                        "waits": entry["waits"],
+                        "wait_time": round(entry["wait_time"], 3),
+                        "wait_requested": round(entry.get("wait_requested", 0.0), 3),
+                        "wait_timeouts": entry.get("wait_timeouts", 0),
+                        "screenshots": len(entry["screenshots"]),
+                        "errors": entry["errors"],
+                        "webdriver": entry.get("webdriver"),
+                        "inventories": entry.get("inventories", []),
+                    }
+                    del pending[: i + 1]
+                    break
+
     def _create_step_description(self, step_name, keyword):
         """Crea una descripción detallada para cada paso"""
         descriptions = {
@@ -640,9 +778,27 @@ class ExecutionReportGenerator:
             self.logger.error(f"Error contando screenshots: {str(e)}")
         return 0
 
-    def _collect_screenshots_data(self, context):
+    def _collect_screenshots_data(self, context, event_summary=None):
         """Recolecta información de los screenshots"""
         screenshots_data = []
+
+        # Con log estructurado no hace falta listar el directorio ni parsear nombres
+        if event_summary:
+            for step_index, entry in sorted(event_summary.items()):
+                for path in entry["screenshots"]:
+                    screenshots_data.append(
+                        {
+                            "filename": os.path.basename(path),
+                            "path": path,
+                            "timestamp": self._extract_timestamp_from_filename(
+                                os.path.basename(path)
+                            ),
+                            "step_index": step_index,
+                        }
+                    )
+            if screenshots_data:
+                return screenshots_data
+
         try:
             evidence_dir = self._get_evidence_directory(context)
             if evidence_dir != "No disponible" and os.path.exists(evidence_dir):
@@ -715,7 +871,8 @@ class ExecutionReportGenerator:
                 return "PARTIAL"
             else:
                 return "FAILED"
-        return "UNKNOWN"
+        # Estado calculado en after_scenario a partir del resultado de behave
+        return getattr(context, "overall_status", "UNKNOWN")
 
     def _count_screenshots(self, context):
         """Cuenta el número de screenshots tomados"""
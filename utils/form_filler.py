@@ -0,0 +1,189 @@
+"""
+Llenado de Formularios por Lotes - Todos los Campos en un Round Trip
+Localiza todos los campos de un formulario y asigna sus valores con un único
+execute_script (setter nativo de value + eventos input/change, que React y
+Material-UI reconocen), y verifica todos los valores con una sola consulta.
+Los campos que el framework revierte se reescriben con Input.insertText de CDP
+"""
+
+import logging
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from .element_validator import FIND_ELEMENTS_JS
+
+Locator = Tuple[str, str]
+
+# Asigna cada valor con el setter nativo del prototipo (los inputs controlados
+# por React ignoran element.value = ...) y dispara input/change con burbujeo.
+# Los selectores inválidos o sin resultados pasan al siguiente del campo.
+FILL_SCRIPT = (
+    "var fields = arguments[0];\n"
+    + FIND_ELEMENTS_JS
+    + """
+function locate(selectors) {
+    for (var i = 0; i < selectors.length; i++) {
+        try {
+            var nodes = findAll(selectors[i][0], selectors[i][1]);
+            if (nodes.length && nodes[0].nodeType === 1) { return [i, nodes[0]]; }
+        } catch (e) {}
+    }
+    return [null, null];
+}
+
+function setNativeValue(element, value) {
+    var proto = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : element instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+        : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(element, value);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+}
+
+return fields.map(function (field) {
+    var found = locate(field[0]);
+    var element = found[1];
+    if (!element) { return {selector: null, error: 'Campo no encontrado'}; }
+    if (element.disabled || element.readOnly) {
+        return {selector: found[0], error: 'Campo deshabilitado o de solo lectura'};
+    }
+    try {
+        setNativeValue(element, field[1]);
+        return {selector: found[0], error: null};
+    } catch (e) {
+        return {selector: found[0], error: e.name + ': ' + e.message};
+    }
+});
+"""
+)
+
+# Lee el valor actual de cada campo con el selector que lo encontró
+VERIFY_SCRIPT = (
+    "var fields = arguments[0];\n"
+    + FIND_ELEMENTS_JS
+    + """
+return fields.map(function (field) {
+    try {
+        var nodes = findAll(field[0], field[1]);
+        return nodes.length ? (nodes[0].value === undefined ? null : String(nodes[0].value)) : null;
+    } catch (e) {
+        return null;
+    }
+});
+"""
+)
+
+# Enfoca un campo de texto y selecciona su contenido para que Input.insertText
+# lo reemplace (false si no existe o no acepta texto tecleado, p. ej. el input
+# oculto de un select de Material-UI)
+FOCUS_SCRIPT = (
+    "var by = arguments[0], value = arguments[1];\n"
+    + FIND_ELEMENTS_JS
+    + """
+var element = findAll(by, value)[0];
+var textual = element instanceof HTMLTextAreaElement || (element instanceof HTMLInputElement
+    && ['hidden', 'checkbox', 'radio', 'file', 'submit', 'button'].indexOf(element.type) === -1);
+if (!textual || element.getClientRects().length === 0) { return false; }
+element.focus();
+if (element.select) { element.select(); }
+return document.activeElement === element;
+"""
+)
+
+
+class FormFiller:
+    """Llena formularios completos con un mínimo de comandos WebDriver"""
+
+    def __init__(self, driver, use_cdp: bool = True):
+        """
+        Args:
+            driver: Instancia del WebDriver
+            use_cdp: Reescribir con Input.insertText de CDP los campos que el
+                framework revierte (solo Chrome/Edge)
+        """
+        self.driver = driver
+        self.use_cdp = use_cdp
+        self.logger = logging.getLogger(__name__)
+
+    def fill(
+        self, values: Mapping[str, str], locators: Mapping[str, Sequence[Locator]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Asigna y verifica todos los valores
+
+        Args:
+            values: Campo -> valor. Solo se verifica que el campo quede con
+                ese valor: los selects cuyas opciones se eligen por texto
+                visible deben seleccionarse aparte
+            locators: Campo -> selectores en orden de preferencia
+
+        Returns:
+            Campo -> {"ok", "selector", "method" ("native" o "cdp"), "value", "error"}
+        """
+        names = list(values)
+        results: Dict[str, Dict[str, Any]] = {
+            name: {"ok": False, "selector": None, "method": None, "value": None, "error": None}
+            for name in names
+        }
+        try:
+            filled = self.driver.execute_script(
+                FILL_SCRIPT,
+                [[[list(locator) for locator in locators[name]], str(values[name])] for name in names],
+            )
+        except Exception as e:
+            self.logger.error(f"Error llenando formulario por lotes: {str(e)}")
+            for result in results.values():
+                result["error"] = str(e)
+            return results
+
+        for name, outcome in zip(names, filled):
+            result = results[name]
+            result["error"] = outcome["error"]
+            if outcome["selector"] is not None:
+                result["selector"] = list(locators[name][outcome["selector"]])
+            if not outcome["error"]:
+                result["method"] = "native"
+
+        self._verify(values, results)
+        reverted = [name for name in names if results[name]["method"] and not results[name]["ok"]]
+        if reverted and self.use_cdp and hasattr(self.driver, "execute_cdp_cmd"):
+            for name in reverted:
+                self._insert_text(name, str(values[name]), results[name])
+            self._verify(values, results)
+        return results
+
+    @staticmethod
+    def failed(results: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Campos que no quedaron con el valor esperado"""
+        return [name for name, result in results.items() if not result["ok"]]
+
+    def _verify(self, values: Mapping[str, str], results: Dict[str, Dict[str, Any]]):
+        """Compara los valores actuales de los campos localizados en una sola consulta"""
+        located = [name for name, result in results.items() if result["selector"]]
+        if not located:
+            return
+        try:
+            current = self.driver.execute_script(
+                VERIFY_SCRIPT, [results[name]["selector"] for name in located]
+            )
+        except Exception as e:
+            self.logger.error(f"Error verificando formulario: {str(e)}")
+            return
+        for name, value in zip(located, current):
+            result = results[name]
+            result["value"] = value
+            result["ok"] = value == str(values[name])
+            if result["method"] and not result["ok"]:
+                result["error"] = f"El campo quedó con '{value}' en lugar de '{values[name]}'"
+            elif result["ok"]:
+                result["error"] = None
+
+    def _insert_text(self, name: str, value: str, result: Dict[str, Any]):
+        """Reescribe un campo de texto como si se tecleara (Input.insertText de CDP)"""
+        by, selector = result["selector"]
+        try:
+            if not self.driver.execute_script(FOCUS_SCRIPT, by, selector):
+                return
+            self.driver.execute_cdp_cmd("Input.insertText", {"text": value})
+            result["method"] = "cdp"
+        except Exception as e:
+            self.logger.warning(f"No se pudo reescribir '{name}' con CDP: {str(e)}")
@@ -0,0 +1,295 @@
+"""
+Modelo de Latencias - Timeouts Adaptativos a partir del Historial
+Guarda el tiempo hasta que cada elemento lógico (condición + locator) y cada
+navegación estuvieron listos, ejecución tras ejecución, y propone el timeout de
+cada espera como el percentil histórico por un factor de seguridad, acotado
+por un mínimo y un máximo de config.json
+"""
+
+import argparse
+import logging
+import math
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS element_latencies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL,
+    elapsed REAL NOT NULL,
+    success INTEGER NOT NULL,
+    recorded_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_element_latencies_key ON element_latencies(key, id);
+CREATE TABLE IF NOT EXISTS element_ready (
+    key TEXT PRIMARY KEY,
+    first_ready_at TEXT
+);
+"""
+
+# Clave de las navegaciones (comando "get" del driver)
+PAGE_LOAD_KEY = "page_load"
+
+DEFAULT_ADAPTIVE_TIMEOUTS = {
+    "enabled": True,
+    "percentile": 99,
+    "safety_factor": 2.0,
+    # Límites de los timeouts de esperas de elementos (segundos)
+    "floor": 0.5,
+    "ceiling": 30,
+    # Muestras mínimas de una clave antes de reemplazar su timeout fijo
+    "min_samples": 10,
+    # Muestras recientes que se conservan por clave
+    "window": 200,
+    # Las claves que nunca estuvieron listas vuelven a probar el timeout
+    # solicitado cada tantas esperas fallidas con el mínimo
+    "recheck_every": 10,
+    # Límites del timeout de carga de página (set_page_load_timeout)
+    "page_load": {"floor": 10, "ceiling": 90},
+}
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada"""
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class LatencyModel:
+    """Historial de tiempos hasta "listo" por elemento lógico y navegación"""
+
+    def __init__(self, db_path: Union[str, Path] = "reports/run_history.db"):
+        """
+        Args:
+            db_path: Base de datos SQLite (la misma del historial de ejecuciones)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path)
+        self.config: Dict[str, Any] = dict(DEFAULT_ADAPTIVE_TIMEOUTS)
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[Tuple[float, bool]]] = {}
+        self._pending: List[Tuple[str, float, int, str]] = []
+        # Claves que alguna vez estuvieron listas (el historial por clave se recorta)
+        self._ready: Set[str] = set()
+        # Esperas consecutivas fallidas con un timeout acortado por el modelo
+        self._early_timeouts: Dict[str, int] = {}
+        self._loaded = False
+
+    def configure(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Aplica la sección "adaptive_timeouts" de config.json y carga el historial
+
+        Args:
+            config: enabled, percentile, safety_factor, floor, ceiling,
+                min_samples, window, recheck_every, page_load (floor/ceiling)
+                y db_path
+        """
+        self.config = dict(DEFAULT_ADAPTIVE_TIMEOUTS)
+        self.config.update(config or {})
+        if self.config.get("db_path"):
+            self.db_path = Path(self.config["db_path"])
+        with self._lock:
+            self._samples = {}
+            self._ready = set()
+            self._early_timeouts = {}
+            self._loaded = False
+        self._load()
+
+    def timeout_for(self, key: str, requested: Optional[float]) -> Optional[float]:
+        """
+        Timeout adaptativo de una espera
+
+        Sin historial suficiente se usa el timeout solicitado. Si la clave nunca
+        estuvo lista (sondeos de selectores alternativos que se espera que
+        fallen), se usa el mínimo para fallar rápido, volviendo al solicitado
+        cada recheck_every fallos. Si estuvo lista antes pero no en las muestras
+        recientes (una caída del ambiente) o su última espera falló con un
+        timeout acortado, se usa el solicitado. En otro caso: percentil × factor
+        de seguridad, acotado.
+
+        Args:
+            key: Elemento lógico ("element_to_be_clickable //button[...]") o PAGE_LOAD_KEY
+            requested: Timeout fijo del código
+
+        Returns:
+            Segundos de espera
+        """
+        if not self.config.get("enabled"):
+            return requested
+        self._load()
+        floor, ceiling = self._bounds(key)
+        with self._lock:
+            samples = self._samples.get(key)
+            if not samples or len(samples) < self.config["min_samples"]:
+                return requested
+            successes = sorted(elapsed for elapsed, success in samples if success)
+            ever_ready = key in self._ready
+            early_timeouts = self._early_timeouts.get(key, 0)
+        if early_timeouts and (ever_ready or early_timeouts % self.config["recheck_every"] == 0):
+            return requested
+        if not successes:
+            return requested if ever_ready else floor
+        timeout = percentile(successes, self.config["percentile"]) * self.config["safety_factor"]
+        return round(min(max(timeout, floor), ceiling), 3)
+
+    def observe(self, key: str, elapsed: float, success: bool = True):
+        """Registra una muestra (se escribe en la base de datos con flush)"""
+        if not self.config.get("enabled"):
+            return
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.config["window"])).append(
+                (elapsed, success)
+            )
+            self._pending.append((key, elapsed, int(success), datetime.now().isoformat()))
+            # Una clave que estuvo lista sigue con el solicitado hasta recuperarse
+            if success or key not in self._ready:
+                self._early_timeouts.pop(key, None)
+            if success:
+                self._ready.add(key)
+
+    def timed_out_early(self, key: str):
+        """
+        Registra una espera fallida con un timeout que el modelo acortó
+
+        No se guarda como muestra (no prueba que el elemento falle con el
+        timeout del código): la siguiente espera de una clave que estuvo lista
+        usa el solicitado, y una que nunca lo estuvo lo vuelve a probar cada
+        recheck_every fallos.
+        """
+        if not self.config.get("enabled"):
+            return
+        with self._lock:
+            self._early_timeouts[key] = self._early_timeouts.get(key, 0) + 1
+
+    def observe_command(self, command: str, elapsed: float, failed: bool):
+        """Callback del perfilador de comandos: las navegaciones alimentan PAGE_LOAD_KEY"""
+        if command == "get":
+            self.observe(PAGE_LOAD_KEY, elapsed, not failed)
+
+    def flush(self):
+        """Guarda las muestras pendientes y recorta el historial a la ventana por clave"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT INTO element_latencies (key, elapsed, success, recorded_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    pending,
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO element_ready (key, first_ready_at) VALUES (?, ?)",
+                    [(key, recorded_at) for key, _, success, recorded_at in pending if success],
+                )
+                conn.execute(
+                    "DELETE FROM element_latencies WHERE id IN (SELECT id FROM ("
+                    "SELECT id, ROW_NUMBER() OVER (PARTITION BY key ORDER BY id DESC) AS age "
+                    "FROM element_latencies) WHERE age > ?)",
+                    (self.config["window"],),
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"No se pudo guardar el historial de latencias: {str(e)}")
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Estado del modelo por clave
+
+        Returns:
+            Lista de {"key", "samples", "successes", "p50", "p99", "timeout"}
+            ordenada por timeout descendente
+        """
+        self._load()
+        rows = []
+        with self._lock:
+            items = [(key, list(samples)) for key, samples in self._samples.items()]
+        for key, samples in items:
+            successes = sorted(elapsed for elapsed, success in samples if success)
+            rows.append(
+                {
+                    "key": key,
+                    "samples": len(samples),
+                    "successes": len(successes),
+                    "p50": round(percentile(successes, 50), 3) if successes else None,
+                    "p99": round(percentile(successes, 99), 3) if successes else None,
+                    # None: sin historial suficiente, se usa el timeout fijo del código
+                    "timeout": self.timeout_for(key, None),
+                }
+            )
+        return sorted(rows, key=lambda row: (row["timeout"] is None, -(row["timeout"] or 0)))
+
+    def _bounds(self, key: str) -> Tuple[float, float]:
+        if key == PAGE_LOAD_KEY:
+            page_load = self.config.get("page_load") or {}
+            return page_load.get("floor", 10), page_load.get("ceiling", 90)
+        return self.config["floor"], self.config["ceiling"]
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path))
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _load(self):
+        """Carga las muestras recientes de cada clave (una vez por proceso)"""
+        if self._loaded or not self.config.get("enabled"):
+            return
+        samples: Dict[str, Deque[Tuple[float, bool]]] = {}
+        ready: Set[str] = set()
+        if self.db_path.exists():
+            try:
+                with self._connect() as conn:
+                    for key, elapsed, success in conn.execute(
+                        "SELECT key, elapsed, success FROM element_latencies ORDER BY id"
+                    ):
+                        samples.setdefault(key, deque(maxlen=self.config["window"])).append(
+                            (elapsed, bool(success))
+                        )
+                        if success:
+                            ready.add(key)
+                    ready.update(key for (key,) in conn.execute("SELECT key FROM element_ready"))
+            except sqlite3.Error as e:
+                self.logger.warning(f"No se pudo leer el historial de latencias: {str(e)}")
+        with self._lock:
+            if self._loaded:
+                return
+            for key, pending in self._samples.items():
+                samples.setdefault(key, deque(maxlen=self.config["window"])).extend(pending)
+            self._samples = samples
+            self._ready.update(ready)
+            self._loaded = True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos: timeouts adaptativos actuales"""
+    parser = argparse.ArgumentParser(description="Timeouts adaptativos por elemento")
+    parser.add_argument("--db", default="reports/run_history.db", help="Base de datos del historial")
+    parser.add_argument("--top", type=int, default=30, help="Claves a mostrar")
+    args = parser.parse_args(argv)
+
+    model = LatencyModel(args.db)
+    model.configure({"db_path": args.db})
+    rows = model.summary()
+    if not rows:
+        print(f"Sin muestras de latencia en {args.db}")
+        return 1
+    for row in rows[: args.top]:
+        p99 = f"{row['p99']:.2f}s" if row["p99"] is not None else "-"
+        timeout = "fijo" if row["timeout"] is None else f"{row['timeout']:.2f}s"
+        print(
+            f"{timeout:>7} p99={p99:>7} {row['successes']}/{row['samples']} listos  {row['key']}"
+        )
+    return 0
+
+
+# Instancia global para uso fácil
+latency_model = LatencyModel()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
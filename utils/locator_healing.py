@@ -0,0 +1,443 @@
+"""
+Auto-reparación de Locators - Huellas de Elementos y Reparaciones en Cache
+Cuando fallan el locator principal y sus alternativos, busca en el DOM el
+elemento más parecido a la huella guardada en ejecuciones exitosas, continúa
+con él si supera el umbral y guarda el locator reparado para revisión
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+
+from .wait_policy import wait_policy
+
+DEFAULT_FINGERPRINTS_PATH = ".cache/locator_fingerprints.json"
+DEFAULT_REPAIRS_PATH = "reports/healed_locators.json"
+DEFAULT_THRESHOLD = 0.7
+# Ventaja mínima del mejor candidato sobre el segundo (p. ej. botones hermanos
+# con la misma etiqueta, clases y padre empatan y no se puede elegir uno)
+DEFAULT_MIN_MARGIN = 0.05
+
+# Peso de cada rasgo en la similitud (los atributos no listados usan "attribute")
+SIMILARITY_WEIGHTS = {
+    "tag": 1.0,
+    "id": 3.0,
+    "data-testid": 3.0,
+    "name": 2.0,
+    "aria-label": 2.0,
+    "placeholder": 1.5,
+    "href": 1.5,
+    "attribute": 1.0,
+    "classes": 2.0,
+    "text": 3.0,
+    "parent": 0.5,
+}
+
+# Huella de un elemento: etiqueta, atributos estables, clases, texto y padre
+FINGERPRINT_JS = """
+var FINGERPRINT_ATTRIBUTES = ['id', 'name', 'type', 'placeholder', 'aria-label', 'title',
+                              'alt', 'role', 'href', 'data-testid', 'data-test', 'data-qa'];
+
+function fingerprint(element) {
+    var attributes = {};
+    FINGERPRINT_ATTRIBUTES.forEach(function (name) {
+        var value = element.getAttribute(name);
+        if (value) { attributes[name] = value; }
+    });
+    return {
+        tag: element.tagName.toLowerCase(),
+        classes: Array.prototype.slice.call(element.classList),
+        attributes: attributes,
+        text: (element.textContent || '').replace(/\\s+/g, ' ').trim().slice(0, 120),
+        parent: element.parentElement ? element.parentElement.tagName.toLowerCase() : null
+    };
+}
+"""
+
+FINGERPRINT_SCRIPT = FINGERPRINT_JS + "return fingerprint(arguments[0]);"
+
+# Recorre el DOM una sola vez y devuelve los candidatos más parecidos a la huella
+HEAL_SCRIPT = (
+    FINGERPRINT_JS
+    + """
+var target = arguments[0], weights = arguments[1], requireVisible = arguments[2], limit = arguments[3];
+var SKIP = {script: 1, style: 1, head: 1, meta: 1, link: 1, title: 1, html: 1, body: 1, noscript: 1};
+
+function bigrams(text) {
+    var result = {};
+    text = text.toLowerCase();
+    for (var i = 0; i < text.length - 1; i++) {
+        var pair = text.substr(i, 2);
+        result[pair] = (result[pair] || 0) + 1;
+    }
+    return result;
+}
+
+function similarity(a, b) {
+    if (a === b) { return 1; }
+    if (!a || !b) { return 0; }
+    if (a.length < 2 || b.length < 2) { return a.toLowerCase() === b.toLowerCase() ? 1 : 0; }
+    var first = bigrams(a), second = bigrams(b), shared = 0, total = 0;
+    for (var pair in first) {
+        total += first[pair];
+        if (second[pair]) { shared += Math.min(first[pair], second[pair]); }
+    }
+    for (pair in second) { total += second[pair]; }
+    return 2 * shared / total;
+}
+
+function jaccard(a, b) {
+    if (!a.length && !b.length) { return 1; }
+    var union = {}, shared = 0;
+    a.forEach(function (item) { union[item] = 1; });
+    b.forEach(function (item) { if (union[item] === 1) { shared++; } union[item] = 2; });
+    return shared / Object.keys(union).length;
+}
+
+function score(candidate) {
+    var total = 0, weight = 0;
+    function add(w, value) { total += w * value; weight += w; }
+    add(weights.tag, candidate.tag === target.tag ? 1 : 0);
+    for (var name in target.attributes) {
+        add(weights[name] || weights.attribute,
+            similarity(target.attributes[name], candidate.attributes[name] || ''));
+    }
+    if (target.classes.length) { add(weights.classes, jaccard(target.classes, candidate.classes)); }
+    if (target.text) { add(weights.text, similarity(target.text, candidate.text)); }
+    if (target.parent) { add(weights.parent, candidate.parent === target.parent ? 1 : 0); }
+    return weight ? total / weight : 0;
+}
+
+function pathOf(element) {
+    var path = [];
+    for (var node = element; node && node !== document.documentElement; node = node.parentElement) {
+        path.unshift(Array.prototype.indexOf.call(node.parentElement.children, node));
+    }
+    return path;
+}
+
+var scored = [];
+var elements = document.getElementsByTagName('*');
+for (var i = 0; i < elements.length; i++) {
+    var element = elements[i];
+    if (SKIP[element.tagName.toLowerCase()]) { continue; }
+    if (requireVisible && element.getClientRects().length === 0) { continue; }
+    scored.push({score: score(fingerprint(element)), element: element});
+}
+scored.sort(function (a, b) { return b.score - a.score; });
+return scored.slice(0, limit).map(function (item) {
+    return {score: item.score, element: item.element, path: pathOf(item.element),
+            fingerprint: fingerprint(item.element)};
+});
+"""
+)
+
+
+class HealingStore:
+    """Huellas de los elementos encontrados y reparaciones aplicadas, persistidas en disco"""
+
+    def __init__(
+        self,
+        fingerprints_path: str = DEFAULT_FINGERPRINTS_PATH,
+        repairs_path: str = DEFAULT_REPAIRS_PATH,
+    ):
+        self.enabled = True
+        self.threshold = DEFAULT_THRESHOLD
+        self.min_margin = DEFAULT_MIN_MARGIN
+        self.fingerprints_path = Path(fingerprints_path)
+        self.repairs_path = Path(repairs_path)
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._fingerprints: Optional[Dict[str, Any]] = None
+        self._repairs: Optional[Dict[str, Any]] = None
+        # Locators cuya huella ya se actualizó en este proceso
+        self._remembered = set()
+
+    def configure(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Aplica la sección "locator_healing" de config.json
+
+        Args:
+            config: enabled, threshold, min_margin, fingerprints_path, repairs_path
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", self.enabled)
+        self.threshold = config.get("threshold", self.threshold)
+        self.min_margin = config.get("min_margin", self.min_margin)
+        if config.get("fingerprints_path"):
+            self.fingerprints_path = Path(config["fingerprints_path"])
+            self._fingerprints = None
+        if config.get("repairs_path"):
+            self.repairs_path = Path(config["repairs_path"])
+            self._repairs = None
+
+    def needs_fingerprint(self, key: str) -> bool:
+        return self.enabled and key not in self._remembered
+
+    def remember(self, key: str, fingerprint: Dict[str, Any]):
+        """Guarda la huella del elemento encontrado (una vez por locator y proceso)"""
+        with self._lock:
+            fingerprints = self._load_fingerprints()
+            self._remembered.add(key)
+            if fingerprints.get(key, {}).get("fingerprint") == fingerprint:
+                return
+            fingerprints[key] = {
+                "fingerprint": fingerprint,
+                "updated_at": datetime.now().isoformat(),
+            }
+            self._write(self.fingerprints_path, fingerprints)
+
+    def fingerprint(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._load_fingerprints().get(key)
+            return entry["fingerprint"] if entry else None
+
+    def repair(self, key: str) -> Optional[Dict[str, Any]]:
+        """Reparación guardada para un locator (se prueba antes de volver a reparar)"""
+        with self._lock:
+            return self._load_repairs().get(key)
+
+    def record_repair(self, key: str, repair: Dict[str, Any]):
+        """Guarda un locator reparado para que se revise y se pase a locators/"""
+        with self._lock:
+            repairs = self._load_repairs()
+            previous = repairs.get(key, {})
+            repair["times_used"] = previous.get("times_used", 0) + 1
+            repairs[key] = repair
+            self._write(self.repairs_path, repairs)
+
+    def forget_repair(self, key: str):
+        """Descarta una reparación guardada que no sirve (p. ej. sin locator reparado)"""
+        with self._lock:
+            repairs = self._load_repairs()
+            if repairs.pop(key, None) is not None:
+                self._write(self.repairs_path, repairs)
+
+    def _load_fingerprints(self) -> Dict[str, Any]:
+        if self._fingerprints is None:
+            self._fingerprints = self._read(self.fingerprints_path)
+        return self._fingerprints
+
+    def _load_repairs(self) -> Dict[str, Any]:
+        if self._repairs is None:
+            self._repairs = self._read(self.repairs_path)
+        return self._repairs
+
+    def _read(self, path: Path) -> Dict[str, Any]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Archivo de auto-reparación inválido {path}: {str(e)}")
+            return {}
+
+    def _write(self, path: Path, data: Dict[str, Any]):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"No se pudo guardar {path}: {str(e)}")
+
+
+class LocatorHealer:
+    """Búsqueda de elementos con locators alternativos y auto-reparación como último recurso"""
+
+    def __init__(self, driver, locators, store: Optional[HealingStore] = None):
+        """
+        Args:
+            driver: Instancia del WebDriver
+            locators: Conjunto de locators de la página (LocatorSet del registro)
+            store: Almacén de huellas y reparaciones (por defecto el global)
+        """
+        self.driver = driver
+        self.locators = locators
+        self.store = store or healing_store
+        self.logger = logging.getLogger(__name__)
+
+    def find(self, condition: Callable, *names: str, timeout: float = 1):
+        """
+        Espera el elemento probando cada locator en orden y, si todos fallan, lo repara
+
+        Args:
+            condition: Condición de expected_conditions (element_to_be_clickable, ...)
+            names: Nombres de los locators en self.locators (principal primero)
+            timeout: Segundos de espera por locator
+
+        Returns:
+            WebElement encontrado
+
+        Raises:
+            TimeoutException: Si ningún locator funciona y no hay reparación posible
+        """
+        key = f"{type(self.locators).__name__}.{names[0]}"
+        last_error = None
+        for position, name in enumerate(names):
+            try:
+                element = wait_policy.wait(self.driver, timeout).until(
+                    condition(getattr(self.locators, name))
+                )
+                suffix = " con selector alternativo" if position else ""
+                self.logger.info(f"✅ {name} encontrado{suffix}")
+                self._remember(key, element)
+                return element
+            except TimeoutException as e:
+                last_error = e
+                if position + 1 < len(names):
+                    self.logger.info("Intentando con selector alternativo...")
+
+        element = self.heal(names[0], condition)
+        if element is None:
+            raise last_error
+        return element
+
+    def heal(self, name: str, condition: Callable = EC.presence_of_element_located):
+        """
+        Busca el elemento por similitud con su última huella conocida
+
+        Primero se prueba la reparación guardada; si no existe o ya no funciona,
+        se puntúan todos los elementos del DOM en una sola consulta.
+
+        Args:
+            name: Nombre del locator principal en self.locators
+            condition: Condición de expected_conditions a cumplir
+
+        Returns:
+            WebElement reparado o None
+        """
+        if not self.store.enabled:
+            return None
+        key = f"{type(self.locators).__name__}.{name}"
+        started = time.monotonic()
+
+        repair = self.store.repair(key)
+        if repair and not repair.get("healed"):
+            # Reparaciones guardadas sin locator (versiones anteriores) no se pueden reutilizar
+            self.store.forget_repair(key)
+        elif repair:
+            try:
+                element = wait_policy.wait(self.driver, 0.2).until(condition(tuple(repair["healed"])))
+                self.store.record_repair(key, dict(repair, last_used_at=datetime.now().isoformat()))
+                self.logger.warning(
+                    f"🩹 {key} reparado con locator en cache: {repair['healed'][1]}"
+                )
+                return element
+            except (TimeoutException, TypeError, WebDriverException):
+                pass
+
+        fingerprint = self.store.fingerprint(key)
+        if not fingerprint:
+            self.logger.info(f"Sin huella previa para {key}; no se puede reparar")
+            return None
+
+        try:
+            require_visible = condition is not EC.presence_of_element_located
+            candidates = self.driver.execute_script(
+                HEAL_SCRIPT, fingerprint, SIMILARITY_WEIGHTS, require_visible, 3
+            )
+        except WebDriverException as e:
+            self.logger.error(f"Error en la auto-reparación de {key}: {str(e)}")
+            return None
+
+        if not candidates or candidates[0]["score"] < self.store.threshold:
+            best = round(candidates[0]["score"], 3) if candidates else 0
+            self.logger.warning(
+                f"Auto-reparación de {key} descartada: mejor similitud {best} < {self.store.threshold}"
+            )
+            return None
+
+        best = candidates[0]
+        runner_up = candidates[1]["score"] if len(candidates) > 1 else 0
+        if best["score"] - runner_up < self.store.min_margin:
+            self.logger.warning(
+                f"Auto-reparación de {key} descartada: candidatos empatados "
+                f"({best['score']:.3f} vs {runner_up:.3f})"
+            )
+            return None
+
+        healed = self._healed_locator(best["path"])
+        element = self._satisfying(condition, best["element"], healed)
+        if element is None:
+            self.logger.warning(
+                f"Auto-reparación de {key} descartada: el elemento no cumple la condición de la espera"
+            )
+            return None
+
+        # Sin locator sintetizado el elemento se usa igual, pero no queda reparación reutilizable
+        if healed:
+            self.store.record_repair(
+                key,
+                {
+                    "original": list(getattr(self.locators, name)),
+                    "healed": list(healed),
+                    "score": round(best["score"], 3),
+                    "runner_up_score": (
+                        round(candidates[1]["score"], 3) if len(candidates) > 1 else None
+                    ),
+                    "expected": fingerprint,
+                    "found": best["fingerprint"],
+                    "url": self.driver.current_url,
+                    "healed_at": datetime.now().isoformat(),
+                },
+            )
+        self.logger.warning(
+            f"🩹 {key} reparado por similitud ({best['score']:.2f}) en {time.monotonic() - started:.2f}s"
+            + (f": {healed[1]}" if healed else "")
+        )
+        return element
+
+    def _satisfying(self, condition: Callable, element, healed):
+        """
+        Elemento reparado si cumple la condición de la espera, o None
+
+        Con locator reparado se evalúa la condición una vez sobre él; sin él
+        solo se puede comprobar que el elemento esté habilitado si se esperaba
+        que fuera clickeable (la consulta ya exige que sea visible).
+        """
+        try:
+            if healed:
+                return condition(tuple(healed))(self.driver) or None
+            if condition is EC.element_to_be_clickable and not element.is_enabled():
+                return None
+            return element
+        except (TypeError, WebDriverException):
+            return None
+
+    def _remember(self, key: str, element):
+        """Actualiza la huella del elemento la primera vez que se encuentra en el proceso"""
+        if not self.store.needs_fingerprint(key):
+            return
+        try:
+            self.store.remember(key, self.driver.execute_script(FINGERPRINT_SCRIPT, element))
+        except WebDriverException as e:
+            self.logger.debug(f"No se pudo guardar la huella de {key}: {str(e)}")
+
+    def _healed_locator(self, path):
+        """Selector CSS único del elemento reparado, para reutilizarlo y revisarlo"""
+        try:
+            from .selector_synthesizer import SelectorSynthesizer
+
+            content = self.driver.execute_script("return document.documentElement.outerHTML;")
+            synthesizer = SelectorSynthesizer(content.encode("utf-8"))
+            results = synthesizer.synthesize(synthesizer.element_at(path), alternatives=1)
+            return ("css selector", results[0]["selector"]) if results else None
+        except Exception as e:
+            self.logger.warning(f"No se pudo generar el locator reparado: {str(e)}")
+            return None
+
+
+# Instancia global del almacén de auto-reparación
+healing_store = HealingStore()
@@ -0,0 +1,438 @@
+"""
+Perfilador y Linter de Locators - Costo de Evaluación en el Navegador
+Mide con performance.now() cuánto tarda cada locator en resolverse sobre el DOM
+real o sobre los snapshots guardados, y ordena los locators más costosos con
+reglas estáticas y una sugerencia de selector más barato
+"""
+
+import argparse
+import json
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .element_validator import FIND_ELEMENTS_JS
+from .locator_registry import locator_registry
+
+DEFAULT_PROFILE_PATH = "reports/locator_profile.json"
+
+# Cada locator se evalúa una vez de calentamiento y luego `rounds` rondas de
+# `iterations` evaluaciones; se toma la mediana del promedio por ronda (la
+# resolución de performance.now() no alcanza para medir una sola evaluación)
+PROFILE_SCRIPT = (
+    "var locators = arguments[0], iterations = arguments[1], rounds = arguments[2];\n"
+    + FIND_ELEMENTS_JS
+    + """
+var domSize = document.getElementsByTagName('*').length;
+var results = locators.map(function (locator) {
+    try {
+        var matches = findAll(locator[0], locator[1]).length;
+        var samples = [];
+        for (var r = 0; r < rounds; r++) {
+            var start = performance.now();
+            for (var i = 0; i < iterations; i++) {
+                findAll(locator[0], locator[1]).length;
+            }
+            samples.push((performance.now() - start) / iterations);
+        }
+        samples.sort(function (a, b) { return a - b; });
+        return {
+            matches: matches,
+            median_ms: samples[Math.floor(samples.length / 2)],
+            max_ms: samples[samples.length - 1]
+        };
+    } catch (e) {
+        return {matches: 0, error: String(e.message || e)};
+    }
+});
+return {dom_size: domSize, results: results};
+"""
+)
+
+# Reglas estáticas: (regla, peso, patrón, mensaje)
+XPATH_RULES = (
+    (
+        "xpath-universal-descendant",
+        5,
+        re.compile(r"//\*"),
+        "//* recorre todos los elementos del DOM",
+    ),
+    (
+        "xpath-text-contains",
+        3,
+        re.compile(r"contains\(\s*(text\(\)|\.)\s*,"),
+        "contains(text(), ...) compara el texto de cada candidato",
+    ),
+    (
+        "xpath-class-contains",
+        2,
+        re.compile(r"contains\(\s*@class\s*,"),
+        "contains(@class, ...) en XPath; un selector CSS de clase usa el índice del navegador",
+    ),
+)
+CSS_SUBSTRING_ATTRIBUTE = re.compile(r"\[[\w-]+\s*[*^$|]=")
+CSS_KEY_ANCHOR = re.compile(r"^[a-zA-Z][\w-]*|[#.][\w-]")
+XPATH_OR = re.compile(r"\sor\s")
+# Pseudoclases de jQuery/Sizzle que querySelectorAll rechaza
+CSS_INVALID_PSEUDO = re.compile(r":(contains|eq|gt|lt)\(")
+
+
+def _split_selector_list(selector: str) -> List[str]:
+    """Separa una lista de selectores CSS por comas que no estén entre corchetes, paréntesis o comillas"""
+    parts, depth, quote, current = [], 0, None, ""
+    for char in selector:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        current += char
+    parts.append(current.strip())
+    return [part for part in parts if part]
+
+
+def _key_compound(selector: str) -> str:
+    """Último selector compuesto (el que el navegador evalúa contra cada elemento)"""
+    compound = re.split(r"\s*[>+~]\s*(?![^\[]*\])|\s+(?![^\[]*\])", selector.strip())
+    return compound[-1] if compound else selector
+
+
+def lint_locator(by: str, value: str) -> List[Dict[str, Any]]:
+    """
+    Aplica las reglas de costo estáticas a un locator
+
+    Args:
+        by: Valor de By ("xpath", "css selector", ...)
+        value: Expresión del locator
+
+    Returns:
+        Lista de hallazgos {"rule", "weight", "message"}
+    """
+    findings = []
+    if by == "xpath":
+        for rule, weight, pattern, message in XPATH_RULES:
+            if pattern.search(value):
+                findings.append({"rule": rule, "weight": weight, "message": message})
+        alternatives = len(XPATH_OR.findall(value))
+        if alternatives:
+            findings.append(
+                {
+                    "rule": "xpath-or",
+                    "weight": alternatives,
+                    "message": f"{alternatives + 1} alternativas con 'or' sobre los mismos candidatos",
+                }
+            )
+        if value.startswith("//") and "@id" not in value and not findings:
+            findings.append(
+                {
+                    "rule": "xpath-descendant-scan",
+                    "weight": 1,
+                    "message": "búsqueda // desde la raíz sin anclar a un id",
+                }
+            )
+
+    elif by == "css selector":
+        branches = _split_selector_list(value)
+        if len(branches) > 1:
+            findings.append(
+                {
+                    "rule": "css-selector-list",
+                    "weight": len(branches) - 1,
+                    "message": f"{len(branches)} selectores alternativos; cada uno recorre el DOM y pueden coincidir varios",
+                }
+            )
+        for branch in branches:
+            invalid = CSS_INVALID_PSEUDO.search(branch)
+            if invalid:
+                findings.append(
+                    {
+                        "rule": "css-invalid",
+                        "weight": 10,
+                        "message": f"'{branch}' usa :{invalid.group(1)}(), que no es CSS válido; el navegador rechaza toda la lista y el locator nunca coincide",
+                    }
+                )
+                continue
+            key = _key_compound(branch)
+            if CSS_SUBSTRING_ATTRIBUTE.search(key) and not CSS_KEY_ANCHOR.search(
+                CSS_SUBSTRING_ATTRIBUTE.split(key)[0]
+            ):
+                findings.append(
+                    {
+                        "rule": "css-substring-key",
+                        "weight": 3,
+                        "message": f"'{branch}' filtra por subcadena de atributo sin etiqueta, id ni clase",
+                    }
+                )
+            elif key in ("*", "html", "body"):
+                findings.append(
+                    {
+                        "rule": "css-broad-key",
+                        "weight": 2,
+                        "message": f"'{branch}' coincide con elementos genéricos",
+                    }
+                )
+
+    elif by in ("link text", "partial link text"):
+        findings.append(
+            {
+                "rule": "link-text-scan",
+                "weight": 1,
+                "message": "compara el texto visible de todos los enlaces",
+            }
+        )
+    return findings
+
+
+def suggest_selector(by: str, value: str) -> Optional[Tuple[str, str]]:
+    """
+    Propone un locator más barato que coincide exactamente con los mismos elementos
+
+    Solo se reescriben formas cuyo conjunto de coincidencias es idéntico; p. ej.
+    [class*='x'] no pasa a .x porque también coincide con class="x-y".
+
+    Returns:
+        (by, valor) sugerido o None
+    """
+    if by != "xpath":
+        return None
+    match = re.fullmatch(r"//\*\[@id\s*=\s*(['\"])([^'\"\\]+)\1\]", value)
+    if match:
+        return ("id", match.group(2))
+    match = re.fullmatch(r"//(\*|[a-zA-Z][\w-]*)\[@([\w-]+)\s*=\s*(['\"])([^'\"\\]+)\3\]", value)
+    if match:
+        tag = "" if match.group(1) == "*" else match.group(1)
+        return ("css selector", f"{tag}[{match.group(2)}='{match.group(4)}']")
+    match = re.fullmatch(
+        r"//(\*|[a-zA-Z][\w-]*)\[contains\(\s*@class\s*,\s*(['\"])([\w-]+)\2\s*\)\]", value
+    )
+    if match:
+        tag = "" if match.group(1) == "*" else match.group(1)
+        return ("css selector", f"{tag}[class*='{match.group(3)}']")
+    return None
+
+
+class LocatorProfiler:
+    """Mide en el navegador el tiempo de evaluación y las coincidencias de cada locator"""
+
+    def __init__(self, driver, iterations: int = 20, rounds: int = 5):
+        """
+        Args:
+            driver: Instancia del WebDriver
+            iterations: Evaluaciones por ronda
+            rounds: Rondas por locator (se reporta la mediana)
+        """
+        self.driver = driver
+        self.iterations = iterations
+        self.rounds = rounds
+        self.logger = logging.getLogger(__name__)
+
+    def profile(self, locators: Sequence[Tuple[str, str]]) -> Dict[str, Any]:
+        """
+        Perfila una lista de locators sobre la página actual (un único script)
+
+        Args:
+            locators: Lista de (by, valor)
+
+        Returns:
+            {"dom_size": n, "results": [{"by", "value", "matches", "median_ms", "max_ms"} ...]}
+        """
+        locators = [list(locator) for locator in locators]
+        response = self.driver.execute_script(
+            PROFILE_SCRIPT, locators, self.iterations, self.rounds
+        )
+        return {
+            "dom_size": response.get("dom_size", 0),
+            "results": [
+                dict(result, by=by, value=value)
+                for (by, value), result in zip(locators, response.get("results", []))
+            ],
+        }
+
+    def profile_registry(self, class_names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Perfila todos los locators únicos del registro sobre la página actual"""
+        return self.profile(_unique_locators(class_names))
+
+    def profile_snapshots(
+        self,
+        snapshots_dir: Union[str, Path] = "snapshots",
+        class_names: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Carga cada snapshot en el navegador y perfila los locators del registro
+
+        Returns:
+            Perfil con una entrada por pantalla en "screens"
+        """
+        locators = _unique_locators(class_names)
+        screens = {}
+        for snapshot in sorted(Path(snapshots_dir).glob("*.html")):
+            try:
+                self.driver.get(snapshot.resolve().as_uri())
+                screens[snapshot.stem] = self.profile(locators)
+                self.logger.info(
+                    f"Perfil de locators en {snapshot.stem}: {len(locators)} locators, {screens[snapshot.stem]['dom_size']} nodos"
+                )
+            except Exception as e:
+                self.logger.error(f"Error perfilando {snapshot}: {str(e)}")
+        return self.build_report(screens)
+
+    def build_report(self, screens: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Perfil serializable con los parámetros de la medición"""
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "iterations": self.iterations,
+            "rounds": self.rounds,
+            "screens": screens,
+        }
+
+
+def _unique_locators(class_names: Optional[Sequence[str]] = None) -> List[Tuple[str, str]]:
+    """(by, valor) distintos de las clases del registro, en orden de definición"""
+    classes = locator_registry.load()
+    unique = {}
+    for class_name in class_names or sorted(classes):
+        for locator in classes[class_name].locators().values():
+            unique.setdefault(locator, None)
+    return list(unique)
+
+
+class LocatorLinter:
+    """Ordena los locators del proyecto por costo estimado y medido"""
+
+    def __init__(self, registry=locator_registry):
+        self.registry = registry
+
+    def lint(
+        self,
+        profile: Optional[Dict[str, Any]] = None,
+        class_names: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Analiza los locators y los ordena del más al menos costoso
+
+        Args:
+            profile: Perfil de LocatorProfiler (opcional); con él se ordena por
+                el peor tiempo medido y se marcan los locators ambiguos
+            class_names: Clases de locators a analizar (por defecto todas)
+
+        Returns:
+            Lista de {"class", "name", "by", "value", "score", "findings",
+            "suggestion", "measured_ms", "matches"}
+        """
+        measured = self._merge_profile(profile) if profile else {}
+        classes = self.registry.load()
+        report = []
+        for class_name in class_names or sorted(classes):
+            for name, (by, value) in classes[class_name].locators().items():
+                findings = lint_locator(by, value)
+                timing = measured.get((by, value), {})
+                if timing.get("matches", 0) > 1:
+                    findings.append(
+                        {
+                            "rule": "ambiguous",
+                            "weight": 2,
+                            "message": f"coincide con {timing['matches']} elementos (se usa el primero)",
+                        }
+                    )
+                if not findings:
+                    continue
+                report.append(
+                    {
+                        "class": class_name,
+                        "name": name,
+                        "by": by,
+                        "value": value,
+                        "score": sum(finding["weight"] for finding in findings),
+                        "findings": findings,
+                        "suggestion": suggest_selector(by, value),
+                        "measured_ms": timing.get("median_ms"),
+                        "matches": timing.get("matches"),
+                    }
+                )
+
+        report.sort(key=lambda item: (item["measured_ms"] or 0, item["score"]), reverse=True)
+        return report
+
+    @staticmethod
+    def _merge_profile(profile: Dict[str, Any]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Peor tiempo y mayor número de coincidencias de cada locator entre pantallas"""
+        screens = profile.get("screens") or {"current": profile}
+        merged = {}
+        for screen in screens.values():
+            for result in screen.get("results", []):
+                if result.get("error"):
+                    continue
+                key = (result["by"], result["value"])
+                current = merged.setdefault(key, {"median_ms": 0.0, "matches": 0})
+                current["median_ms"] = max(current["median_ms"], result.get("median_ms") or 0.0)
+                current["matches"] = max(current["matches"], result.get("matches") or 0)
+        return merged
+
+
+def _start_headless_chrome():
+    """Chrome sin interfaz para perfilar snapshots desde la línea de comandos"""
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--allow-file-access-from-files")
+    return webdriver.Chrome(options=options)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Perfila y analiza el costo de los locators")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    profile_parser = subparsers.add_parser("profile", help="Mide los locators sobre los snapshots en Chrome")
+    profile_parser.add_argument("--snapshots", default="snapshots", help="Directorio de snapshots")
+    profile_parser.add_argument("--output", default=DEFAULT_PROFILE_PATH, help="Archivo JSON del perfil")
+    profile_parser.add_argument("--iterations", type=int, default=20, help="Evaluaciones por ronda")
+
+    lint_parser = subparsers.add_parser("lint", help="Ordena los locators más costosos")
+    lint_parser.add_argument("--profile", help="Perfil JSON generado con 'profile'")
+    lint_parser.add_argument("--top", type=int, default=15, help="Número de locators a mostrar")
+    lint_parser.add_argument("--class", dest="classes", action="append", help="Clase de locators (repetible)")
+    args = parser.parse_args(argv)
+
+    if args.command == "profile":
+        driver = _start_headless_chrome()
+        try:
+            report = LocatorProfiler(driver, iterations=args.iterations).profile_snapshots(args.snapshots)
+        finally:
+            driver.quit()
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Perfil de {len(report['screens'])} pantallas guardado en {output}")
+        return 0
+
+    profile = None
+    if args.profile:
+        with open(args.profile, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+
+    report = LocatorLinter().lint(profile, args.classes)
+    for item in report[: args.top]:
+        measured = f" {item['measured_ms']:.3f} ms" if item["measured_ms"] is not None else ""
+        print(f"[{item['score']:2}]{measured} {item['class']}.{item['name']} ({item['by']}: {item['value']})")
+        for finding in item["findings"]:
+            print(f"      - {finding['message']}")
+        if item["suggestion"]:
+            print(f"      sugerencia: {item['suggestion'][0]}: {item['suggestion'][1]}")
+    print(f"{len(report)} locators con hallazgos")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,285 @@
+"""
+Registro de Locators - Carga por AST y Conjuntos Inmutables Compartidos
+Extrae las asignaciones (By.X, "...") de locators/*_locators.py sin ejecutar
+el código (incluidas las tuplas en varias líneas y las referencias a otras
+clases de locators) y las compila una sola vez por proceso en objetos con
+__slots__ que comparten validadores y page objects
+"""
+
+import ast
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from selenium.webdriver.common.by import By
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# By.XPATH -> "xpath", By.CSS_SELECTOR -> "css selector", ...
+BY_ATTRIBUTES = {
+    attr: getattr(By, attr)
+    for attr in dir(By)
+    if attr.isupper() and isinstance(getattr(By, attr), str)
+}
+
+
+class LocatorSet:
+    """Conjunto inmutable de locators de una clase (un atributo por slot)"""
+
+    __slots__ = ()
+    _names: Tuple[str, ...] = ()
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(
+            f"{type(self).__name__} es inmutable: no se puede asignar '{name}'"
+        )
+
+    def __delattr__(self, name: str):
+        raise AttributeError(
+            f"{type(self).__name__} es inmutable: no se puede eliminar '{name}'"
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {len(self._names)} atributos>"
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """Todos los atributos (locators y constantes como URLs) en orden de definición"""
+        return [(name, getattr(self, name)) for name in self._names]
+
+    def locators(self) -> Dict[str, Tuple[str, str]]:
+        """Solo los locators (tipo de By, valor)"""
+        return {
+            name: value
+            for name, value in self.items()
+            if isinstance(value, tuple) and len(value) == 2
+        }
+
+
+def _compile(class_name: str, values: Dict[str, Any]) -> LocatorSet:
+    """Crea la clase con __slots__ para los atributos y su única instancia"""
+    names = tuple(values)
+    locator_class = type(
+        class_name,
+        (LocatorSet,),
+        {"__slots__": names, "_names": names, "__module__": __name__},
+    )
+    instance = object.__new__(locator_class)
+    for name, value in values.items():
+        object.__setattr__(instance, name, value)
+    return instance
+
+
+def parse_locator_source(source: Union[str, bytes]) -> Dict[str, Dict[str, Any]]:
+    """
+    Extrae las definiciones de las clases de locators de un archivo
+
+    Se reconocen atributos de clase y asignaciones self.NOMBRE en __init__ con
+    valor (By.X, "valor"), una constante (URLs) o una referencia a otro
+    atributo (self.OTRO o instancia.OTRO de otra clase de locators).
+
+    Args:
+        source: Código del archivo
+
+    Returns:
+        Diccionario clase -> {"bases": [...], "attributes": {nombre: spec}},
+        donde spec es ("value", valor) o ("ref", clase, atributo)
+    """
+    tree = ast.parse(source)
+    classes = {}
+
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        attributes = {}
+        statements = list(node.body)
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef) and item.name == "__init__":
+                statements.extend(item.body)
+
+        # instancia local -> clase (base_locators = AltaCatalogoLocators())
+        instances = {}
+        for statement in statements:
+            if not isinstance(statement, ast.Assign) or len(statement.targets) != 1:
+                continue
+            target = statement.targets[0]
+            value = statement.value
+
+            if (
+                isinstance(target, ast.Name)
+                and isinstance(value, ast.Call)
+                and isinstance(value.func, ast.Name)
+            ):
+                instances[target.id] = value.func.id
+                continue
+
+            if isinstance(target, ast.Attribute) and getattr(target.value, "id", None) == "self":
+                name = target.attr
+            elif isinstance(target, ast.Name) and statement in node.body:
+                name = target.id
+            else:
+                continue
+
+            spec = _value_spec(value, node.name, instances)
+            if spec is not None:
+                attributes[name] = spec
+
+        classes[node.name] = {
+            "bases": [base.id for base in node.bases if isinstance(base, ast.Name)],
+            "attributes": attributes,
+        }
+    return classes
+
+
+def _value_spec(value: ast.AST, class_name: str, instances: Dict[str, str]) -> Optional[tuple]:
+    """Especificación de un valor asignado o None si no es un locator reconocible"""
+    if (
+        isinstance(value, ast.Tuple)
+        and len(value.elts) == 2
+        and isinstance(value.elts[0], ast.Attribute)
+        and value.elts[0].attr in BY_ATTRIBUTES
+        and isinstance(value.elts[1], ast.Constant)
+        and isinstance(value.elts[1].value, str)
+    ):
+        return ("value", (BY_ATTRIBUTES[value.elts[0].attr], value.elts[1].value))
+
+    if isinstance(value, ast.Constant) and isinstance(value.value, (str, int, float)):
+        return ("value", value.value)
+
+    if isinstance(value, ast.Attribute) and isinstance(value.value, ast.Name):
+        owner = value.value.id
+        if owner == "self":
+            return ("ref", class_name, value.attr)
+        if owner in instances:
+            return ("ref", instances[owner], value.attr)
+    return None
+
+
+class LocatorRegistry:
+    """Registro por proceso de los locators del proyecto, compilados una sola vez"""
+
+    def __init__(self, locators_dir: Optional[Union[str, Path]] = None):
+        self.locators_dir = Path(locators_dir) if locators_dir else PROJECT_ROOT / "locators"
+        self.logger = logging.getLogger(__name__)
+        self.errors: Dict[str, str] = {}
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._files: Dict[Path, List[str]] = {}
+        self._compiled: Dict[str, LocatorSet] = {}
+
+    def load(self) -> Dict[str, LocatorSet]:
+        """
+        Parsea y compila todos los archivos de locators (solo la primera vez)
+
+        Returns:
+            Diccionario nombre de clase -> LocatorSet
+        """
+        with self._lock:
+            if not self._loaded:
+                if self.locators_dir.exists():
+                    for path in sorted(self.locators_dir.glob("*_locators.py")):
+                        self._parse_file(path)
+                for class_name in list(self._specs):
+                    self._resolve(class_name)
+                self._loaded = True
+                self.logger.debug(
+                    f"Registro de locators: {len(self._compiled)} clases compiladas"
+                )
+            return dict(self._compiled)
+
+    def get(self, locator_class: Union[str, type]) -> LocatorSet:
+        """
+        Devuelve el conjunto compartido de una clase de locators
+
+        Args:
+            locator_class: Clase de locators o su nombre
+
+        Returns:
+            LocatorSet inmutable con los mismos atributos que una instancia de la clase
+        """
+        class_name = locator_class if isinstance(locator_class, str) else locator_class.__name__
+        self.load()
+        with self._lock:
+            if class_name not in self._compiled:
+                raise KeyError(f"Clase de locators no encontrada: {class_name}")
+            return self._compiled[class_name]
+
+    def locators_for_file(self, locator_file: Union[str, Path]) -> Dict[str, Tuple[str, str]]:
+        """
+        Locators (tipo de By, valor) de todas las clases de un archivo
+
+        Args:
+            locator_file: Archivo de locators (se parsea si está fuera del directorio registrado)
+
+        Returns:
+            Diccionario nombre -> (tipo, valor)
+        """
+        self.load()
+        path = Path(locator_file).resolve()
+        with self._lock:
+            if path not in self._files:
+                for class_name in self._parse_file(path):
+                    self._resolve(class_name)
+            locators = {}
+            for class_name in self._files.get(path, []):
+                if class_name in self._compiled:
+                    locators.update(self._compiled[class_name].locators())
+            return locators
+
+    def _parse_file(self, path: Path) -> List[str]:
+        """Registra las especificaciones de las clases de un archivo"""
+        path = path.resolve()
+        try:
+            classes = parse_locator_source(path.read_bytes())
+        except (OSError, SyntaxError, ValueError) as e:
+            self.errors[str(path)] = str(e)
+            self.logger.error(f"Error cargando locators desde {path}: {str(e)}")
+            self._files[path] = []
+            return []
+
+        self._specs.update(classes)
+        self._files[path] = list(classes)
+        return list(classes)
+
+    def _resolve(self, class_name: str, stack: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        """Resuelve herencia y referencias de una clase y compila su LocatorSet"""
+        if class_name in self._compiled:
+            compiled = self._compiled[class_name]
+            return dict(compiled.items())
+        if class_name in stack or class_name not in self._specs:
+            return {}
+
+        spec = self._specs[class_name]
+        stack = stack + (class_name,)
+        values = {}
+        for base in spec["bases"]:
+            values.update(self._resolve(base, stack))
+
+        for name, value_spec in spec["attributes"].items():
+            if value_spec[0] == "value":
+                values[name] = value_spec[1]
+                continue
+            _, owner, attribute = value_spec
+            source = values if owner == class_name else self._resolve(owner, stack)
+            if attribute in source:
+                values[name] = source[attribute]
+            else:
+                self.errors[f"{class_name}.{name}"] = f"Referencia no resuelta: {owner}.{attribute}"
+                self.logger.warning(
+                    f"Locator {class_name}.{name} referencia {owner}.{attribute}, que no existe"
+                )
+
+        self._compiled[class_name] = _compile(class_name, values)
+        return values
+
+
+# Instancia global del registro de locators
+locator_registry = LocatorRegistry()
@@ -0,0 +1,273 @@
+"""
+Analizador de Logs en Streaming - Lectura con mmap y Contexto Acotado
+Permite analizar logs de cientos de MB con memoria constante
+"""
+
+import mmap
+import os
+import re
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .log_rotation import get_log_segments, open_log_binary
+
+# Patrones de error comunes (patrón, nombre legible)
+ERROR_PATTERNS = [
+    (r"ERROR", "Error General"),
+    (r"FAILED", "Paso Fallido"),
+    (r"Exception", "Excepción"),
+    (r"TimeoutException", "Timeout"),
+    (r"NoSuchElementException", "Elemento No Encontrado"),
+    (r"WebDriverException", "Error de WebDriver"),
+    (r"AssertionError", "Error de Aserción"),
+    (r"AttributeError", "Error de Atributo"),
+    (r"KeyError", "Error de Clave"),
+    (r"ValueError", "Error de Valor"),
+]
+
+TIMESTAMP_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})")
+
+
+class LogLine:
+    """Línea de log con su posición dentro del archivo"""
+
+    __slots__ = ("number", "offset", "end_offset", "text", "segment")
+
+    def __init__(
+        self,
+        number: int,
+        offset: int,
+        end_offset: int,
+        text: str,
+        segment: Optional[str] = None,
+    ):
+        self.number = number
+        self.offset = offset
+        self.end_offset = end_offset
+        self.text = text
+        self.segment = segment
+
+
+class StreamingLogAnalyzer:
+    """Analizador de logs que recorre el archivo una sola vez sin cargarlo en memoria"""
+
+    def __init__(
+        self,
+        context_lines: int = 2,
+        max_errors: int = 500,
+        encoding: str = "utf-8",
+    ):
+        self.context_lines = context_lines
+        self.max_errors = max_errors
+        self.encoding = encoding
+
+    def iter_lines(
+        self, log_file: Union[str, Path], include_rotated: bool = False
+    ) -> Iterator[LogLine]:
+        """
+        Itera las líneas de un log usando mmap, con su número y offset en bytes
+
+        Args:
+            log_file: Archivo de log a recorrer (acepta segmentos .gz)
+            include_rotated: Si se deben recorrer antes los segmentos rotados
+
+        Returns:
+            Iterador de LogLine (la línea se entrega sin salto de línea final);
+            los offsets son relativos al segmento indicado en LogLine.segment
+        """
+        segments = get_log_segments(log_file) if include_rotated else [Path(log_file)]
+        number = 0
+        for segment in segments:
+            for line in self._iter_segment(segment, number):
+                number = line.number
+                yield line
+
+    def _iter_segment(self, segment: Path, first_number: int) -> Iterator[LogLine]:
+        """Itera las líneas de un único archivo (plano con mmap o comprimido)"""
+        if not segment.exists() or segment.stat().st_size == 0:
+            return
+
+        with open_log_binary(segment) as f:
+            source = None
+            if not str(segment).endswith(".gz"):
+                try:
+                    source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):
+                    # Algunos sistemas de archivos no soportan mmap
+                    source = None
+
+            readline = source.readline if source is not None else f.readline
+            tell = source.tell if source is not None else f.tell
+
+            try:
+                number = first_number
+                offset = 0
+                while True:
+                    raw = readline()
+                    if not raw:
+                        break
+                    number += 1
+                    end_offset = tell()
+                    text = raw.decode(self.encoding, errors="replace").rstrip("\r\n")
+                    yield LogLine(number, offset, end_offset, text, str(segment))
+                    offset = end_offset
+            finally:
+                if source is not None:
+                    source.close()
+
+    def read_window(
+        self, log_file: Union[str, Path], start_offset: int, end_offset: int
+    ) -> str:
+        """
+        Lee una ventana del log a partir de offsets en bytes
+
+        Args:
+            log_file: Archivo (o segmento .gz) al que pertenecen los offsets
+            start_offset: Offset inicial (inclusive)
+            end_offset: Offset final (exclusivo)
+
+        Returns:
+            Texto de la ventana solicitada
+        """
+        with open_log_binary(log_file) as f:
+            f.seek(start_offset)
+            data = f.read(max(0, end_offset - start_offset))
+        return data.decode(self.encoding, errors="replace")
+
+    def analyze_errors(
+        self,
+        log_file: Union[str, Path],
+        error_patterns: Optional[List[Tuple[str, str]]] = None,
+        classifier: Optional[Callable[[str], str]] = None,
+        include_context: bool = True,
+        include_rotated: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Busca errores en el log en una sola pasada con buffers de contexto acotados
+
+        Args:
+            log_file: Archivo de log a analizar
+            error_patterns: Lista de (regex, nombre); usa ERROR_PATTERNS por defecto
+            classifier: Función que clasifica una línea de error por su contenido
+            include_context: Si se deben construir las ventanas de contexto
+            include_rotated: Si se deben analizar también los segmentos rotados
+
+        Returns:
+            Diccionario con "errors", "patterns", "total_lines" y "errors_truncated"
+        """
+        error_patterns = error_patterns or ERROR_PATTERNS
+        compiled = [
+            (re.compile(pattern, re.IGNORECASE), name)
+            for pattern, name in error_patterns
+        ]
+        # Prefiltro: una sola búsqueda por línea antes de evaluar cada patrón
+        any_error = re.compile(
+            "|".join(f"(?:{pattern})" for pattern, _ in error_patterns),
+            re.IGNORECASE,
+        )
+
+        result = {
+            "errors": [],
+            "patterns": {},
+            "total_lines": 0,
+            "total_errors": 0,
+            "errors_truncated": False,
+        }
+
+        before = deque(maxlen=self.context_lines)
+        pending = deque()
+
+        for line in self.iter_lines(log_file, include_rotated):
+            result["total_lines"] = line.number
+
+            # Completar las ventanas de contexto que esperan líneas posteriores
+            for window in pending:
+                window[1].append(line)
+                window[2] -= 1
+            while pending and pending[0][2] <= 0:
+                self._close_window(*pending.popleft()[:2])
+
+            if any_error.search(line.text):
+                for regex, name in compiled:
+                    if regex.search(line.text):
+                        result["patterns"][name] = result["patterns"].get(name, 0) + 1
+
+                result["total_errors"] += 1
+                if len(result["errors"]) < self.max_errors:
+                    message = line.text.strip()
+                    error_info = {
+                        "line_number": line.number,
+                        "byte_offset": line.offset,
+                        "segment": line.segment,
+                        "timestamp": self._extract_timestamp(message),
+                        "type": classifier(message) if classifier else "Error",
+                        "message": message,
+                    }
+                    result["errors"].append(error_info)
+                    if include_context:
+                        pending.append(
+                            [error_info, list(before) + [line], self.context_lines]
+                        )
+                else:
+                    result["errors_truncated"] = True
+
+            before.append(line)
+
+        while pending:
+            self._close_window(*pending.popleft()[:2])
+
+        return result
+
+    def read_context(self, error_info: Dict[str, Any]) -> str:
+        """
+        Relee del disco la ventana de contexto de un error
+
+        Args:
+            error_info: Error de analyze_errors con "context_ranges"
+
+        Returns:
+            Texto de la ventana (puede abarcar varios segmentos rotados)
+        """
+        return "".join(
+            self.read_window(item["segment"], item["start_offset"], item["end_offset"])
+            for item in error_info.get("context_ranges", [])
+        )
+
+    def _close_window(self, error_info: Dict[str, Any], lines: List[LogLine]):
+        """Cierra una ventana de contexto y la guarda en el error"""
+        # Los offsets son relativos a cada segmento: una ventana que cruza una
+        # rotación se guarda como un rango por segmento
+        ranges = []
+        for line in lines:
+            if ranges and ranges[-1]["segment"] == line.segment:
+                ranges[-1]["end_offset"] = line.end_offset
+            else:
+                ranges.append(
+                    {
+                        "segment": line.segment,
+                        "start_offset": line.offset,
+                        "end_offset": line.end_offset,
+                    }
+                )
+        error_info["context_ranges"] = ranges
+        error_info["context"] = "\n".join(
+            f"L{line.number}: {line.text.strip()}" for line in lines
+        )
+
+    def _extract_timestamp(self, line: str) -> str:
+        """Extrae timestamp de una línea de log"""
+        match = TIMESTAMP_PATTERN.search(line)
+        return match.group(1) if match else "N/A"
+
+
+def get_file_info(log_file_path: Union[str, Path]) -> Dict[str, Any]:
+    """Obtiene tamaño y fecha de modificación de un log en una sola llamada a stat"""
+    stat = os.stat(log_file_path)
+    return {
+        "file_size": stat.st_size,
+        "last_modified": datetime.fromtimestamp(stat.st_mtime).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        ),
+    }
@@ -0,0 +1,113 @@
+"""
+Rotación de Logs - Segmentos por Tamaño y Antigüedad Comprimidos con gzip
+"""
+
+import gzip
+import io
+import os
+import re
+import shutil
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import IO, List, Optional, Union
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+
+class CompressedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler que rota por tamaño o antigüedad y comprime los segmentos
+
+    Los segmentos rotados quedan como `<log>.1.gz`, `<log>.2.gz`, ... donde el
+    número más alto es el más antiguo.
+    """
+
+    def __init__(
+        self,
+        filename: Union[str, Path],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        max_age_seconds: Optional[float] = None,
+        encoding: str = "utf-8",
+    ):
+        super().__init__(
+            str(filename),
+            mode="a",
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding=encoding,
+            delay=False,
+        )
+        self.max_age_seconds = max_age_seconds
+        self._opened_at = time.monotonic()
+        self.namer = self._gzip_namer
+        self.rotator = self._gzip_rotator
+
+    def shouldRollover(self, record) -> bool:
+        if self.max_age_seconds and self.stream and self.stream.tell() > 0:
+            if time.monotonic() - self._opened_at >= self.max_age_seconds:
+                return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        self._opened_at = time.monotonic()
+
+    @staticmethod
+    def _gzip_namer(name: str) -> str:
+        return name + ".gz"
+
+    @staticmethod
+    def _gzip_rotator(source: str, dest: str):
+        with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+
+def get_log_segments(log_file: Union[str, Path]) -> List[Path]:
+    """
+    Obtiene los segmentos de un log en orden cronológico (más antiguo primero)
+
+    Args:
+        log_file: Log actual (sin sufijo de rotación)
+
+    Returns:
+        Lista con los segmentos `.N.gz` existentes seguidos del log actual
+    """
+    log_file = Path(log_file)
+    pattern = re.compile(re.escape(log_file.name) + r"\.(\d+)\.gz$")
+    rotated = []
+    if log_file.parent.exists():
+        for candidate in log_file.parent.iterdir():
+            match = pattern.match(candidate.name)
+            if match:
+                rotated.append((int(match.group(1)), candidate))
+
+    segments = [path for _, path in sorted(rotated, reverse=True)]
+    if log_file.exists():
+        segments.append(log_file)
+    return segments
+
+
+def base_log_path(segment: Union[str, Path]) -> Path:
+    """Devuelve la ruta del log actual a partir de cualquiera de sus segmentos"""
+    return Path(re.sub(r"\.\d+\.gz$", "", str(segment)))
+
+
+def is_log_file(path: Union[str, Path]) -> bool:
+    """Indica si una ruta es un log o un segmento rotado comprimido"""
+    return bool(re.search(r"\.log(\.\d+\.gz)?$", str(path)))
+
+
+def open_log_binary(path: Union[str, Path]) -> IO[bytes]:
+    """Abre un log o segmento en modo binario, descomprimiendo si es .gz"""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def open_log_text(path: Union[str, Path], encoding: str = "utf-8") -> IO[str]:
+    """Abre un log o segmento en modo texto, descomprimiendo si es .gz"""
+    return io.TextIOWrapper(open_log_binary(path), encoding=encoding, errors="replace")
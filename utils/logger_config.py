@@ -59,6 +59,19 @@ def get_test_logger(feature_name, scenario_name, execution_date=None):
     return advanced_logger.get_test_logger(feature_name, scenario_name, execution_date)
 
 
+def release_test_logger(logger):
+    """
+    Libera el logger de un test al terminar su escenario, cerrando sus handlers
+
+    Args:
+        logger: Logger (o su nombre) obtenido con get_test_logger
+
+    Returns:
+        True si el logger estaba registrado
+    """
+    return advanced_logger.release_test_logger(logger)
+
+
 def log_step_execution(
     logger, step_name, step_type, status, duration=None, details=None
 ):
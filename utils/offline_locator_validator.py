@@ -0,0 +1,221 @@
+"""
+Validación Offline de Locators - Evaluación sobre Snapshots del DOM
+Evalúa los locators CSS y XPath del registro contra los snapshots guardados
+(lxml para XPath, BeautifulSoup/soupsieve para CSS), un proceso por snapshot,
+sin navegador ni red
+"""
+
+import argparse
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+from .locator_registry import locator_registry
+
+DEFAULT_SNAPSHOTS_DIR = "snapshots"
+
+# Extensiones de soupsieve/jQuery que el navegador rechaza (InvalidSelectorException)
+NON_STANDARD_CSS = re.compile(r":(-soup-)?contains\(|:-soup-", re.IGNORECASE)
+
+
+def _to_query(by: str, value: str) -> Tuple[str, str]:
+    """
+    Traduce un locator de Selenium a ("css" | "xpath", expresión)
+
+    id/name/class/tag se evalúan como CSS igual que hace Selenium, y los
+    textos de enlace como XPath sobre el texto normalizado de <a>.
+    """
+    if by == "xpath":
+        return "xpath", value
+    if by == "css selector":
+        return "css", value
+    if by == "id":
+        return "css", f'[id="{value}"]'
+    if by == "name":
+        return "css", f'[name="{value}"]'
+    if by == "class name":
+        return "css", f".{value}"
+    if by == "tag name":
+        return "css", value
+    literal = f'"{value}"' if '"' not in value else f"'{value}'"
+    if by == "link text":
+        return "xpath", f"//a[normalize-space(.)={literal}]"
+    if by == "partial link text":
+        return "xpath", f"//a[contains(normalize-space(.), {literal})]"
+    raise ValueError(f"Tipo de locator no soportado: {by}")
+
+
+def _evaluate_snapshot(task: Tuple[str, List[Tuple[str, str]]]) -> Tuple[str, Dict[int, Any]]:
+    """
+    Evalúa todos los locators contra un snapshot (se ejecuta en el pool de procesos)
+
+    Returns:
+        (snapshot, {índice del locator: número de coincidencias o texto del error})
+    """
+    snapshot_path, locators = task
+    with open(snapshot_path, "rb") as f:
+        content = f.read()
+
+    tree = lxml_html.fromstring(content)
+    soup = BeautifulSoup(content, "lxml")
+    results = {}
+    for index, (by, value) in enumerate(locators):
+        try:
+            kind, query = _to_query(by, value)
+            if kind == "xpath":
+                matches = tree.xpath(query)
+                if isinstance(matches, list):
+                    results[index] = sum(1 for match in matches if isinstance(match, etree._Element))
+                else:
+                    # Expresiones que devuelven un valor (count(), boolean())
+                    results[index] = 1 if matches else 0
+            else:
+                if NON_STANDARD_CSS.search(query):
+                    raise ValueError("pseudo-clase no soportada por el navegador (:contains)")
+                results[index] = len(soup.select(query))
+        except Exception as e:
+            results[index] = f"{type(e).__name__}: {e}"
+    return snapshot_path, results
+
+
+class OfflineLocatorValidator:
+    """Valida los locators del registro contra snapshots del DOM, en paralelo por archivo"""
+
+    def __init__(
+        self,
+        snapshots_dir: Union[str, Path] = DEFAULT_SNAPSHOTS_DIR,
+        registry=locator_registry,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            snapshots_dir: Directorio con los snapshots (*.html) de DomSnapshotManager
+            registry: Registro de locators a validar
+            max_workers: Procesos para evaluar snapshots (None usa el número de CPUs)
+        """
+        self.snapshots_dir = Path(snapshots_dir)
+        self.registry = registry
+        self.max_workers = max_workers
+
+    def validate(self, class_names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Evalúa cada locator en todos los snapshots
+
+        Un locator está "broken" si no coincide en ningún snapshot, "ambiguous" si
+        en algún snapshot coincide con más de un elemento, "invalid" si la
+        expresión no se puede evaluar y "ok" en otro caso.
+
+        Args:
+            class_names: Clases de locators a validar (por defecto todas)
+
+        Returns:
+            Diccionario con "snapshots", "locators" (uno por clase y atributo con
+            su estado y coincidencias por snapshot) y "summary" (conteo por estado)
+        """
+        snapshots = sorted(str(path) for path in self.snapshots_dir.glob("*.html"))
+        classes = self.registry.load()
+        selected = class_names or sorted(classes)
+
+        # Cada (tipo, valor) se evalúa una sola vez aunque lo reutilicen varias clases
+        unique = {}
+        entries = []
+        for class_name in selected:
+            for name, locator in classes[class_name].locators().items():
+                index = unique.setdefault(locator, len(unique))
+                entries.append((class_name, name, locator, index))
+
+        matches = self._evaluate(snapshots, list(unique))
+
+        locators = []
+        summary = {"ok": 0, "broken": 0, "ambiguous": 0, "invalid": 0}
+        for class_name, name, (by, value), index in entries:
+            counts = {
+                Path(snapshot).stem: matches[snapshot].get(index, 0) for snapshot in snapshots
+            }
+            errors = [count for count in counts.values() if isinstance(count, str)]
+            if errors:
+                status = "invalid"
+            elif not any(counts.values()):
+                status = "broken"
+            elif any(count > 1 for count in counts.values()):
+                status = "ambiguous"
+            else:
+                status = "ok"
+            summary[status] += 1
+            locators.append(
+                {
+                    "class": class_name,
+                    "name": name,
+                    "by": by,
+                    "value": value,
+                    "status": status,
+                    "matches": {
+                        screen: count for screen, count in counts.items() if count
+                    },
+                    "error": errors[0] if errors else None,
+                }
+            )
+
+        return {
+            "snapshots": [Path(snapshot).stem for snapshot in snapshots],
+            "locators": locators,
+            "summary": summary,
+        }
+
+    def _evaluate(
+        self, snapshots: List[str], locators: List[Tuple[str, str]]
+    ) -> Dict[str, Dict[int, Any]]:
+        """Evalúa los locators en cada snapshot, un proceso por archivo"""
+        tasks = [(snapshot, locators) for snapshot in snapshots]
+        if len(tasks) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                    return dict(pool.map(_evaluate_snapshot, tasks))
+            except (OSError, RuntimeError):
+                # Sin soporte de multiprocessing (p. ej. entornos restringidos)
+                pass
+        return dict(_evaluate_snapshot(task) for task in tasks)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Valida los locators contra snapshots del DOM, sin navegador"
+    )
+    parser.add_argument("--snapshots", default=DEFAULT_SNAPSHOTS_DIR, help="Directorio de snapshots")
+    parser.add_argument("--class", dest="classes", action="append", help="Clase de locators (repetible)")
+    parser.add_argument("--all", action="store_true", help="Mostrar también los locators correctos")
+    args = parser.parse_args(argv)
+
+    validator = OfflineLocatorValidator(args.snapshots)
+    result = validator.validate(args.classes)
+    if not result["snapshots"]:
+        print(f"No hay snapshots en {args.snapshots}; ejecuta las pruebas para generarlos")
+        return 1
+
+    for locator in result["locators"]:
+        if locator["status"] == "ok" and not args.all:
+            continue
+        detail = locator["error"] or ", ".join(
+            f"{screen}={count}" for screen, count in locator["matches"].items()
+        )
+        print(
+            f"{locator['status'].upper():9} {locator['class']}.{locator['name']} "
+            f"({locator['by']}: {locator['value']}) {detail}"
+        )
+
+    summary = result["summary"]
+    print(
+        f"{len(result['locators'])} locators en {len(result['snapshots'])} snapshots: "
+        f"{summary['ok']} ok, {summary['ambiguous']} ambiguos, "
+        f"{summary['broken']} rotos, {summary['invalid']} inválidos"
+    )
+    return 1 if summary["broken"] or summary["invalid"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
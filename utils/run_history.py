@@ -0,0 +1,379 @@
+"""
+Historial de Ejecuciones - Base de Datos SQLite con Tendencias por Step
+Permite comparar ejecuciones y detectar regresiones de latencia
+"""
+
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT UNIQUE,
+    source_mtime REAL,
+    test_name TEXT,
+    feature_name TEXT,
+    scenario_name TEXT,
+    execution_date TEXT,
+    start_time TEXT,
+    overall_status TEXT,
+    ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS step_durations (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    step_index INTEGER NOT NULL,
+    step_name TEXT NOT NULL,
+    keyword TEXT,
+    status TEXT,
+    duration REAL,
+    PRIMARY KEY (run_id, step_index)
+);
+CREATE INDEX IF NOT EXISTS idx_step_durations_name ON step_durations(step_name);
+"""
+
+
+def status_text(status: Any) -> Optional[str]:
+    """Estado como texto (los steps en vivo traen el enum Status de behave)"""
+    if status is None:
+        return None
+    return str(getattr(status, "name", status))
+
+
+class RunHistoryStore:
+    """Almacén histórico de ejecuciones con tendencias y detección de regresiones"""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path] = "reports/run_history.db",
+        reports_dir: Union[str, Path] = "reports",
+        config: Optional[Dict[str, Any]] = None,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.config = config or {}
+        self.db_path = Path(db_path)
+        self.reports_dir = Path(reports_dir)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Configuración por defecto
+        self.window = self.config.get("window", 20)
+        self.min_runs = self.config.get("min_runs", 5)
+        self.regression_threshold = self.config.get("regression_threshold", 0.25)
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre una conexión a la base de datos histórica"""
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def ingest_reports(self) -> int:
+        """
+        Carga en la base de datos los reportes que aún no se han ingerido
+
+        Busca `reports/<fecha>_<test>/execution_report_*.json` y los reportes
+        del formatter JSON de behave (`reports/execution_*/report.json`).
+
+        Returns:
+            Número de ejecuciones nuevas ingeridas
+        """
+        ingested = 0
+        if not self.reports_dir.exists():
+            return ingested
+
+        with self._connect() as conn:
+            known = dict(conn.execute("SELECT source, source_mtime FROM runs"))
+
+        for json_file in sorted(self.reports_dir.glob("*/execution_report_*.json")):
+            if self._is_known(json_file, known):
+                continue
+            try:
+                with open(json_file, "r", encoding="utf-8") as f:
+                    execution_data = json.load(f)
+                if self.ingest_execution_data(execution_data, source=json_file):
+                    ingested += 1
+            except Exception as e:
+                self.logger.warning(f"No se pudo ingerir {json_file}: {str(e)}")
+
+        for json_file in sorted(self.reports_dir.glob("execution_*/report.json")):
+            if self._is_known(json_file, known):
+                continue
+            try:
+                ingested += self.ingest_behave_json(json_file)
+            except Exception as e:
+                self.logger.warning(f"No se pudo ingerir {json_file}: {str(e)}")
+
+        self.logger.info(f"Historial actualizado: {ingested} ejecuciones nuevas")
+        return ingested
+
+    def _is_known(self, json_file: Path, known: Dict[str, float]) -> bool:
+        """Indica si un archivo ya fue ingerido y no ha cambiado"""
+        return known.get(str(json_file)) == json_file.stat().st_mtime
+
+    def ingest_execution_data(
+        self, execution_data: Dict[str, Any], source: Union[str, Path, None] = None
+    ) -> Optional[int]:
+        """
+        Guarda una ejecución (formato de ExecutionReportGenerator) en el historial
+
+        Args:
+            execution_data: Datos de la ejecución
+            source: Archivo de origen (se usa para no duplicar ingestas)
+
+        Returns:
+            ID de la ejecución guardada o None si no tiene steps
+        """
+        exec_info = execution_data.get("execution_info", {})
+        steps = [
+            {
+                "name": step.get("name", f"Paso {i}"),
+                "keyword": step.get("keyword"),
+                "status": step.get("status"),
+                "duration": step.get("duration"),
+            }
+            for i, step in enumerate(execution_data.get("steps", []), 1)
+        ]
+        if not steps:
+            return None
+
+        return self._save_run(
+            {
+                "test_name": exec_info.get("test_name"),
+                "feature_name": exec_info.get("feature_name"),
+                "scenario_name": exec_info.get("scenario_name"),
+                "execution_date": exec_info.get("execution_date"),
+                "start_time": exec_info.get("start_time"),
+                "overall_status": exec_info.get("overall_status"),
+            },
+            steps,
+            source,
+        )
+
+    def ingest_behave_json(self, json_file: Union[str, Path]) -> int:
+        """
+        Guarda los scenarios de un reporte del formatter JSON de behave
+
+        Args:
+            json_file: Archivo generado con `--format json`
+
+        Returns:
+            Número de scenarios ingeridos
+        """
+        json_file = Path(json_file)
+        with open(json_file, "r", encoding="utf-8") as f:
+            features = json.load(f)
+
+        execution_date = datetime.fromtimestamp(json_file.stat().st_mtime).strftime(
+            "%Y-%m-%d"
+        )
+        ingested = 0
+        for feature in features:
+            for scenario in feature.get("elements", []):
+                if scenario.get("type") != "scenario":
+                    continue
+                steps = [
+                    {
+                        "name": step.get("name"),
+                        "keyword": step.get("keyword"),
+                        "status": step.get("result", {}).get("status"),
+                        "duration": step.get("result", {}).get("duration"),
+                    }
+                    for step in scenario.get("steps", [])
+                ]
+                if not steps:
+                    continue
+                # Cada scenario es una ejecución; la fuente se hace única por scenario
+                source = f"{json_file}#{scenario.get('location', ingested)}"
+                self._save_run(
+                    {
+                        "test_name": scenario.get("name"),
+                        "feature_name": feature.get("name"),
+                        "scenario_name": scenario.get("name"),
+                        "execution_date": execution_date,
+                        "start_time": None,
+                        "overall_status": scenario.get("status"),
+                    },
+                    steps,
+                    source,
+                )
+                ingested += 1
+
+        # Marcar el archivo completo como ingerido
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs (source, source_mtime, ingested_at) "
+                "VALUES (?, ?, ?)",
+                (str(json_file), json_file.stat().st_mtime, datetime.now().isoformat()),
+            )
+        return ingested
+
+    def _save_run(
+        self,
+        run_info: Dict[str, Any],
+        steps: List[Dict[str, Any]],
+        source: Union[str, Path, None],
+    ) -> int:
+        """Inserta (o reemplaza) una ejecución y sus duraciones por step"""
+        source_mtime = None
+        if source is not None and Path(str(source)).exists():
+            source_mtime = Path(str(source)).stat().st_mtime
+
+        with self._connect() as conn:
+            if source is not None:
+                conn.execute("DELETE FROM runs WHERE source = ?", (str(source),))
+            cursor = conn.execute(
+                "INSERT INTO runs (source, source_mtime, test_name, feature_name, "
+                "scenario_name, execution_date, start_time, overall_status, "
+                "ingested_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(source) if source is not None else None,
+                    source_mtime,
+                    run_info.get("test_name"),
+                    run_info.get("feature_name"),
+                    run_info.get("scenario_name"),
+                    run_info.get("execution_date"),
+                    run_info.get("start_time"),
+                    status_text(run_info.get("overall_status")),
+                    datetime.now().isoformat(),
+                ),
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO step_durations (run_id, step_index, step_name, keyword, "
+                "status, duration) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        i,
+                        step["name"],
+                        step.get("keyword"),
+                        status_text(step.get("status")),
+                        self._to_seconds(step.get("duration")),
+                    )
+                    for i, step in enumerate(steps, 1)
+                ],
+            )
+        return run_id
+
+    def _to_seconds(self, duration: Any) -> Optional[float]:
+        """Normaliza una duración a segundos (float)"""
+        try:
+            return float(duration) if duration is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    def load_step_durations(self) -> pd.DataFrame:
+        """
+        Carga las duraciones de steps exitosos ordenadas por fecha de ejecución
+
+        Se ordena por execution_date/start_time y no por run_id: una ejecución
+        antigua re-ingerida recibe un run_id nuevo y no debe contar como la última.
+
+        Returns:
+            DataFrame con run_id, execution_date, step_name, status y duration
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT s.run_id, r.execution_date, r.feature_name, s.step_name, "
+                "s.status, s.duration FROM step_durations s "
+                "JOIN runs r ON r.id = s.run_id "
+                "WHERE s.duration IS NOT NULL "
+                "AND s.status IN ('passed', 'SUCCESS') "
+                "ORDER BY r.execution_date, r.start_time, s.run_id",
+                conn,
+            )
+
+    def compute_step_trends(self, window: Optional[int] = None) -> pd.DataFrame:
+        """
+        Calcula p50/p95 móviles por step sobre las últimas `window` ejecuciones
+
+        Args:
+            window: Tamaño de la ventana móvil (usa la configuración si es None)
+
+        Returns:
+            DataFrame con una fila por ejecución/step y columnas rolling_p50,
+            rolling_p95 y baseline_p95 (p95 de las ejecuciones previas)
+        """
+        window = window or self.window
+        df = self.load_step_durations()
+        if df.empty:
+            return df.assign(rolling_p50=[], rolling_p95=[], baseline_p95=[], runs=[])
+
+        grouped = df.groupby("step_name", sort=False)["duration"]
+        rolling = grouped.rolling(window, min_periods=1)
+        df["rolling_p50"] = rolling.quantile(0.5).reset_index(level=0, drop=True)
+        df["rolling_p95"] = rolling.quantile(0.95).reset_index(level=0, drop=True)
+        # Línea base: p95 de la ventana anterior, sin incluir la ejecución actual
+        df["baseline_p95"] = df.groupby("step_name", sort=False)["rolling_p95"].shift(1)
+        df["runs"] = grouped.cumcount() + 1
+        return df
+
+    def detect_regressions(
+        self, threshold: Optional[float] = None, window: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Detecta steps cuya última duración supera la línea base p95 por un umbral
+
+        Args:
+            threshold: Fracción tolerada sobre el p95 histórico (0.25 = +25%)
+            window: Tamaño de la ventana móvil
+
+        Returns:
+            Lista de regresiones ordenadas de mayor a menor degradación
+        """
+        threshold = self.regression_threshold if threshold is None else threshold
+        trends = self.compute_step_trends(window)
+        if trends.empty:
+            return []
+
+        latest = trends.groupby("step_name", sort=False).tail(1)
+        latest = latest[latest["runs"] > self.min_runs]
+        limit = latest["baseline_p95"] * (1 + threshold)
+        regressed = latest[
+            latest["baseline_p95"].notna() & (latest["duration"] > limit)
+        ].copy()
+        if regressed.empty:
+            return []
+
+        regressed["ratio"] = np.round(
+            regressed["duration"] / regressed["baseline_p95"], 2
+        )
+        regressed = regressed.sort_values("ratio", ascending=False)
+
+        regressions = []
+        for row in regressed.itertuples(index=False):
+            regressions.append(
+                {
+                    "step_name": row.step_name,
+                    "feature_name": row.feature_name,
+                    "run_id": int(row.run_id),
+                    "execution_date": row.execution_date,
+                    "duration": round(float(row.duration), 3),
+                    "baseline_p95": round(float(row.baseline_p95), 3),
+                    "rolling_p50": round(float(row.rolling_p50), 3),
+                    "ratio": float(row.ratio),
+                }
+            )
+        return regressions
+
+    def log_regressions(self, regressions: Optional[List[Dict[str, Any]]] = None):
+        """Registra en el log las regresiones detectadas"""
+        if regressions is None:
+            regressions = self.detect_regressions()
+        if not regressions:
+            self.logger.info("📈 Sin regresiones de latencia en los steps")
+            return
+        self.logger.warning(f"🐢 {len(regressions)} steps con regresión de latencia:")
+        for regression in regressions:
+            self.logger.warning(
+                f"   {regression['step_name']}: {regression['duration']}s "
+                f"(p95 histórico {regression['baseline_p95']}s, x{regression['ratio']})"
+            )
@@ -0,0 +1,350 @@
+"""
+Generador de Reporte Agregado por Ejecución - Un Índice para Todos los Scenarios
+Cada scenario agrega un registro JSON Lines y al final se genera un único índice HTML
+"""
+
+import html
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class RunReportGenerator:
+    """Generador del reporte agregado de una ejecución completa (run)"""
+
+    RECORDS_FILENAME = "scenarios.jsonl"
+    INDEX_FILENAME = "index.html"
+
+    def __init__(self, run_id: Optional[str] = None, reports_dir: str = "reports"):
+        self.logger = logging.getLogger(__name__)
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.run_dir = Path(reports_dir) / f"run_{self.run_id}"
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.records_path = self.run_dir / self.RECORDS_FILENAME
+        self.index_path = self.run_dir / self.INDEX_FILENAME
+
+    def append_scenario(
+        self,
+        execution_data: Dict[str, Any],
+        duration: Optional[float] = None,
+        json_report: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Agrega el registro de un scenario al archivo JSON Lines de la ejecución
+
+        Args:
+            execution_data: Datos de la ejecución (formato de ExecutionReportGenerator)
+            duration: Duración del scenario en segundos (opcional)
+            json_report: Ruta del reporte JSON completo del scenario (opcional)
+
+        Returns:
+            Registro agregado o None si hubo error
+        """
+        try:
+            exec_info = execution_data.get("execution_info", {})
+            steps = [
+                {
+                    "name": step.get("name"),
+                    "keyword": step.get("keyword"),
+                    "status": step.get("status"),
+                    "duration": self._to_seconds(step.get("duration")),
+                    "error_message": step.get("error_message"),
+                    "webdriver": self._webdriver_totals(step),
+                    "waits": self._wait_totals(step),
+                }
+                for step in execution_data.get("steps", [])
+            ]
+            if duration is None:
+                duration = sum(step["duration"] or 0 for step in steps)
+
+            record = {
+                "feature_name": exec_info.get("feature_name"),
+                "scenario_name": exec_info.get("scenario_name"),
+                "status": exec_info.get("overall_status", "UNKNOWN"),
+                "execution_date": exec_info.get("execution_date"),
+                "start_time": exec_info.get("start_time"),
+                "end_time": exec_info.get("end_time"),
+                "duration": round(float(duration), 3),
+                "log_file": exec_info.get("log_file"),
+                "evidence_directory": exec_info.get("evidence_directory"),
+                "json_report": json_report,
+                "summary": execution_data.get("summary", {}),
+                "steps": steps,
+            }
+
+            # Una sola línea por scenario, en modo append
+            with open(self.records_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+            return record
+
+        except Exception as e:
+            self.logger.error(f"Error agregando scenario al reporte agregado: {str(e)}")
+            return None
+
+    def load_records(self) -> List[Dict[str, Any]]:
+        """Carga los registros JSON Lines de la ejecución"""
+        records = []
+        if not self.records_path.exists():
+            return records
+
+        with open(self.records_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    self.logger.warning("Registro inválido en el reporte agregado")
+        return records
+
+    def generate_index(self) -> Optional[str]:
+        """
+        Genera el índice HTML único de la ejecución
+
+        Returns:
+            Ruta del índice generado o None si no hay registros
+        """
+        try:
+            records = self.load_records()
+            if not records:
+                return None
+
+            content = self._create_index_content(records)
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+            self.logger.info(f"Reporte agregado generado: {self.index_path}")
+            return str(self.index_path)
+
+        except Exception as e:
+            self.logger.error(f"Error generando reporte agregado: {str(e)}")
+            return None
+
+    def _to_seconds(self, duration: Any) -> Optional[float]:
+        """Normaliza una duración a segundos (float)"""
+        try:
+            return round(float(duration), 3) if duration is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    def _webdriver_totals(self, step: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Comandos WebDriver del step y su latencia total (sin el desglose)"""
+        commands = (step.get("events") or {}).get("webdriver")
+        if not commands:
+            return None
+        return {"commands": commands.get("commands"), "total_time": commands.get("total_time")}
+
+    def _wait_totals(self, step: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Esperas del step: cantidad, tiempo real, tiempo solicitado y timeouts"""
+        events = step.get("events") or {}
+        if not events.get("waits"):
+            return None
+        return {
+            "count": events["waits"],
+            "time": events.get("wait_time"),
+            "requested": events.get("wait_requested"),
+            "timeouts": events.get("wait_timeouts"),
+        }
+
+    def _aggregate_steps(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Agrega los tiempos de cada step a lo largo de todos los scenarios"""
+        aggregated = {}
+        for record in records:
+            for step in record.get("steps", []):
+                duration = step.get("duration")
+                if duration is None:
+                    continue
+                entry = aggregated.setdefault(
+                    step.get("name"),
+                    {
+                        "name": step.get("name"),
+                        "count": 0,
+                        "total": 0.0,
+                        "max": 0.0,
+                        "failed": 0,
+                    },
+                )
+                entry["count"] += 1
+                entry["total"] += duration
+                entry["max"] = max(entry["max"], duration)
+                if step.get("status") in ("failed", "FAILED"):
+                    entry["failed"] += 1
+
+        for entry in aggregated.values():
+            entry["mean"] = entry["total"] / entry["count"]
+        return sorted(aggregated.values(), key=lambda e: e["total"], reverse=True)
+
+    def _create_index_content(self, records: List[Dict[str, Any]]) -> str:
+        """Crea el contenido HTML del índice agregado"""
+        esc = html.escape
+        passed = len([r for r in records if r.get("status") == "SUCCESS"])
+        failed = len([r for r in records if r.get("status") == "FAILED"])
+        total_duration = sum(r.get("duration") or 0 for r in records)
+
+        scenario_rows = ""
+        for i, record in enumerate(records):
+            status = str(record.get("status", "UNKNOWN"))
+            summary = record.get("summary", {})
+            scenario_rows += f"""
+                <tr class="status-{esc(status.lower())}" data-index="{i}">
+                    <td data-value="{i + 1}">{i + 1}</td>
+                    <td>{esc(str(record.get('feature_name')))}</td>
+                    <td><a href="#scenario-{i}" onclick="showDetail({i})">{esc(str(record.get('scenario_name')))}</a></td>
+                    <td>{esc(status)}</td>
+                    <td data-value="{record.get('duration') or 0}">{record.get('duration') or 0:.2f}</td>
+                    <td data-value="{summary.get('total_steps', 0)}">{summary.get('total_steps', 0)}</td>
+                    <td data-value="{summary.get('failed_steps', 0)}">{summary.get('failed_steps', 0)}</td>
+                </tr>"""
+
+        step_rows = ""
+        for entry in self._aggregate_steps(records):
+            step_rows += f"""
+                <tr>
+                    <td>{esc(str(entry['name']))}</td>
+                    <td data-value="{entry['count']}">{entry['count']}</td>
+                    <td data-value="{entry['mean']}">{entry['mean']:.2f}</td>
+                    <td data-value="{entry['max']}">{entry['max']:.2f}</td>
+                    <td data-value="{entry['total']}">{entry['total']:.2f}</td>
+                    <td data-value="{entry['failed']}">{entry['failed']}</td>
+                </tr>"""
+
+        # Los detalles se renderizan en el navegador al abrir cada scenario
+        records_json = json.dumps(records, ensure_ascii=False, default=str).replace(
+            "</", "<\\/"
+        )
+
+        return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Reporte de Ejecución - run {esc(self.run_id)}</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f5f5f5; }}
+        .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
+        .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 10px; margin-bottom: 30px; text-align: center; }}
+        .section {{ background: white; margin-bottom: 30px; padding: 25px; border-radius: 10px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+        .section h2 {{ color: #667eea; margin-bottom: 20px; border-bottom: 2px solid #667eea; padding-bottom: 10px; }}
+        .summary-stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; }}
+        .stat-card {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 10px; text-align: center; }}
+        .stat-number {{ font-size: 2.5em; font-weight: bold; }}
+        table {{ width: 100%; border-collapse: collapse; }}
+        th, td {{ padding: 8px 10px; border-bottom: 1px solid #eee; text-align: left; }}
+        th {{ cursor: pointer; background: #f8f9fa; color: #667eea; user-select: none; }}
+        tr.status-failed td {{ background: #ffebee; }}
+        tr.status-partial td {{ background: #fff3e0; }}
+        #detail {{ display: none; }}
+        .footer {{ text-align: center; margin-top: 40px; padding: 20px; color: #666; border-top: 1px solid #ddd; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>📊 Reporte de Ejecución</h1>
+            <div>Run {esc(self.run_id)}</div>
+        </div>
+
+        <div class="section">
+            <h2>📈 Resumen</h2>
+            <div class="summary-stats">
+                <div class="stat-card"><div class="stat-number">{len(records)}</div>Scenarios</div>
+                <div class="stat-card"><div class="stat-number">{passed}</div>Exitosos</div>
+                <div class="stat-card"><div class="stat-number">{failed}</div>Fallidos</div>
+                <div class="stat-card"><div class="stat-number">{total_duration:.1f}s</div>Duración Total</div>
+            </div>
+        </div>
+
+        <div class="section">
+            <h2>🧪 Scenarios</h2>
+            <table class="sortable">
+                <thead><tr><th>#</th><th>Feature</th><th>Scenario</th><th>Estado</th><th>Duración (s)</th><th>Pasos</th><th>Fallidos</th></tr></thead>
+                <tbody>{scenario_rows}
+                </tbody>
+            </table>
+        </div>
+
+        <div class="section" id="detail"></div>
+
+        <div class="section">
+            <h2>⏱️ Tiempos por Step</h2>
+            <table class="sortable">
+                <thead><tr><th>Step</th><th>Ejecuciones</th><th>Media (s)</th><th>Máx (s)</th><th>Total (s)</th><th>Fallidos</th></tr></thead>
+                <tbody>{step_rows}
+                </tbody>
+            </table>
+        </div>
+
+        <div class="footer">
+            <p>Reporte generado automáticamente el {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+            <p>Sistema de Automatización de Pruebas - Zucarmex</p>
+        </div>
+    </div>
+    <script id="records" type="application/json">{records_json}</script>
+    <script>
+        var records = null;
+
+        function escapeHtml(value) {{
+            return String(value == null ? "" : value).replace(/[&<>"']/g, function (c) {{
+                return {{"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}}[c];
+            }});
+        }}
+
+        function showDetail(index) {{
+            if (records === null) {{
+                records = JSON.parse(document.getElementById("records").textContent);
+            }}
+            var record = records[index];
+            var rows = record.steps.map(function (step, i) {{
+                return "<tr><td>" + (i + 1) + "</td><td>" + escapeHtml(step.keyword) + " " +
+                    escapeHtml(step.name) + "</td><td>" + escapeHtml(step.status) + "</td><td>" +
+                    (step.duration == null ? "-" : step.duration.toFixed(2)) + "</td><td>" +
+                    escapeHtml(step.error_message || "") + "</td><td>" +
+                    (step.webdriver ? step.webdriver.commands + " (" +
+                        step.webdriver.total_time.toFixed(2) + "s)" : "-") + "</td><td>" +
+                    (step.waits ? step.waits.count + " (" + step.waits.time.toFixed(2) + "s / " +
+                        step.waits.requested.toFixed(2) + "s, " + step.waits.timeouts + " timeouts)" : "-") +
+                    "</td></tr>";
+            }}).join("");
+            var detail = document.getElementById("detail");
+            detail.innerHTML = "<h2>🔎 " + escapeHtml(record.scenario_name) + "</h2>" +
+                "<p><strong>Feature:</strong> " + escapeHtml(record.feature_name) +
+                " | <strong>Estado:</strong> " + escapeHtml(record.status) +
+                " | <strong>Log:</strong> " + escapeHtml(record.log_file) +
+                (record.json_report ? " | <a href=\\"../../" + escapeHtml(record.json_report) + "\\">JSON</a>" : "") +
+                "</p><table><thead><tr><th>#</th><th>Step</th><th>Estado</th><th>Duración (s)</th><th>Error</th><th>Comandos WebDriver</th><th>Esperas (real / solicitado)</th></tr></thead><tbody>" +
+                rows + "</tbody></table>";
+            detail.style.display = "block";
+            detail.scrollIntoView();
+        }}
+
+        document.querySelectorAll("table.sortable th").forEach(function (th) {{
+            th.addEventListener("click", function () {{
+                var table = th.closest("table");
+                var column = Array.prototype.indexOf.call(th.parentNode.children, th);
+                var ascending = th.dataset.order !== "asc";
+                th.dataset.order = ascending ? "asc" : "desc";
+                var body = table.tBodies[0];
+                var rows = Array.prototype.slice.call(body.rows);
+                rows.sort(function (a, b) {{
+                    var x = a.cells[column].dataset.value || a.cells[column].textContent;
+                    var y = b.cells[column].dataset.value || b.cells[column].textContent;
+                    var nx = parseFloat(x), ny = parseFloat(y);
+                    var cmp = (!isNaN(nx) && !isNaN(ny)) ? nx - ny : x.localeCompare(y);
+                    return ascending ? cmp : -cmp;
+                }});
+                rows.forEach(function (row) {{ body.appendChild(row); }});
+            }});
+        }});
+
+        if (location.hash.indexOf("#scenario-") === 0) {{
+            showDetail(parseInt(location.hash.substring(10), 10));
+        }}
+    </script>
+</body>
+</html>
+"""
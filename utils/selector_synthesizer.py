@@ -0,0 +1,506 @@
+"""
+Sintetizador de Selectores Únicos - CSS Estable y Barato desde el DOM
+Dado un elemento objetivo (snapshot + locator aproximado, o clic en el navegador)
+busca el selector CSS único más corto sobre id, data-testid, aria, name y clases,
+priorizando los que el navegador evalúa más rápido, y genera la entrada lista
+para pegar en la clase de locators
+"""
+
+import argparse
+import itertools
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+from .locator_registry import locator_registry
+
+# Atributos de prueba: los más estables y baratos después del id
+TEST_ATTRIBUTES = ("data-testid", "data-test", "data-qa", "data-cy")
+ARIA_ATTRIBUTES = ("aria-label", "aria-labelledby", "role")
+OTHER_ATTRIBUTES = ("type", "placeholder", "title", "alt", "for", "href")
+
+# Costo de cada tipo de átomo (menor = más rápido y estable)
+ATOM_COSTS = {"id": 1, "test": 2, "name": 3, "aria": 4, "class": 5, "attr": 6, "tag": 8}
+ANCESTOR_COST = 2
+POSITIONAL_COST = 10
+MAX_CLASS_COMBINATION = 3
+MAX_ANCESTOR_DEPTH = 6
+
+# Valores generados por frameworks o builds (no sobreviven a un redeploy)
+DYNAMIC_VALUE_PATTERN = re.compile(
+    r"\d{2,}|^(ng|css|sc|jss|emotion|mat|mui|ember|react|svelte)-|(?=[a-z]*\d)(?=\d*[a-z])[a-z0-9]{6,}",
+    re.IGNORECASE,
+)
+# Ids de useId de React: «r2o», :r2o:, _r_2o_ o el valor sin delimitadores
+# (r2o), que cambian al agregar o quitar componentes
+REACT_ID_PATTERN = re.compile(r"^(«.*»|:.*:|_r_\w+_|r(?=[a-z]*\d)[0-9a-z]{1,4})$", re.IGNORECASE)
+# Clases de estado que cambian con la interacción
+STATE_CLASS_PATTERN = re.compile(
+    r"^(is-|has-|ng-)|^(active|focus|focused|hover|selected|disabled|open|opened|show|hidden|visible|collapsed|expanded)$",
+    re.IGNORECASE,
+)
+CSS_IDENTIFIER_PATTERN = re.compile(r"^-?[_a-zA-Z][\w-]*$")
+
+# Selector de elementos en el navegador: resalta al pasar el mouse y guarda la
+# ruta (índices entre hijos) del elemento en el que se hace clic
+PICKER_SCRIPT = """
+if (!window.__selectorPicker) {
+    window.__selectorPicker = {picked: null};
+    var previous = null;
+    document.addEventListener('mouseover', function (event) {
+        if (previous) { previous.style.outline = previous.__outline || ''; }
+        previous = event.target;
+        previous.__outline = previous.style.outline;
+        previous.style.outline = '2px solid #e91e63';
+    }, true);
+    document.addEventListener('click', function (event) {
+        event.preventDefault();
+        event.stopPropagation();
+        var path = [];
+        for (var node = event.target; node && node !== document.documentElement; node = node.parentElement) {
+            path.unshift(Array.prototype.indexOf.call(node.parentElement.children, node));
+        }
+        if (previous) { previous.style.outline = previous.__outline || ''; }
+        window.__selectorPicker.picked = {path: path, tag: event.target.tagName.toLowerCase()};
+    }, true);
+}
+"""
+PICKED_SCRIPT = (
+    "var p = window.__selectorPicker && window.__selectorPicker.picked;"
+    "return p ? [p, document.documentElement.outerHTML] : null;"
+)
+
+
+def css_string(value: str) -> str:
+    """Literal CSS entre comillas simples"""
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def is_stable_value(value: str) -> bool:
+    """True si el valor no parece generado (ids de frameworks, hashes, contadores)"""
+    return (
+        bool(value)
+        and len(value) <= 60
+        and not DYNAMIC_VALUE_PATTERN.search(value)
+        and not REACT_ID_PATTERN.match(value)
+    )
+
+
+class DomIndex:
+    """Índice invertido de un DOM: cada átomo CSS -> conjunto de elementos que lo cumplen"""
+
+    def __init__(self, root: etree._Element):
+        self.root = root
+        self.elements: List[etree._Element] = [
+            element for element in root.iter() if isinstance(element.tag, str)
+        ]
+        self.position = {element: index for index, element in enumerate(self.elements)}
+        self._atoms: Dict[Tuple[str, ...], Set[int]] = defaultdict(set)
+        for index, element in enumerate(self.elements):
+            self._atoms[("tag", element.tag)].add(index)
+            for name, value in element.attrib.items():
+                if name == "class":
+                    for class_name in value.split():
+                        self._atoms[("class", class_name)].add(index)
+                else:
+                    self._atoms[("attr", name, value)].add(index)
+
+    def matches(self, atoms: Sequence[Tuple[str, ...]]) -> Set[int]:
+        """Elementos que cumplen todos los átomos de un selector compuesto"""
+        sets = sorted((self._atoms.get(atom, set()) for atom in atoms), key=len)
+        return set.intersection(*sets) if sets else set()
+
+    def parent_index(self, index: int) -> Optional[int]:
+        parent = self.elements[index].getparent()
+        return self.position.get(parent) if parent is not None else None
+
+
+class SelectorSynthesizer:
+    """Busca el selector CSS único más barato para un elemento de un DOM"""
+
+    def __init__(self, content: bytes):
+        """
+        Args:
+            content: HTML del documento (snapshot o DOM del navegador)
+        """
+        # Sin <meta charset>, lxml interpreta los bytes como latin-1 y los
+        # valores no ASCII («r2o», "Descripción") dejan de coincidir
+        if isinstance(content, bytes):
+            try:
+                content = content.decode("utf-8")
+            except UnicodeDecodeError:
+                pass
+        self.content = content
+        try:
+            self.tree = lxml_html.fromstring(content)
+        except ValueError:
+            # Texto con declaración de encoding XML: lxml solo la acepta en bytes
+            self.tree = lxml_html.fromstring(content.encode("utf-8"))
+        self.index = DomIndex(self.tree)
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path: str) -> "SelectorSynthesizer":
+        with open(snapshot_path, "rb") as f:
+            return cls(f.read())
+
+    def find_target(self, by: str, value: str, position: int = 0) -> etree._Element:
+        """
+        Resuelve el locator aproximado al elemento objetivo
+
+        Args:
+            by: "xpath" o "css selector"
+            value: Expresión del locator
+            position: Cuál de las coincidencias usar (por defecto la primera, como Selenium)
+        """
+        if by == "xpath":
+            matches = [m for m in self.tree.xpath(value) if isinstance(m, etree._Element)]
+        elif by == "css selector":
+            soup = BeautifulSoup(self.content, "lxml")
+            matches = [self.element_at(self._soup_path(tag)) for tag in soup.select(value)]
+        else:
+            raise ValueError(f"Tipo de locator no soportado: {by}")
+        if len(matches) <= position:
+            raise LookupError(f"El locator no coincide con el elemento {position + 1}: {value}")
+        return matches[position]
+
+    def element_at(self, path: Sequence[int]) -> etree._Element:
+        """Elemento en una ruta de índices entre hijos desde <html>"""
+        element = self.tree
+        for child_index in path:
+            children = [child for child in element if isinstance(child.tag, str)]
+            element = children[child_index]
+        return element
+
+    @staticmethod
+    def _soup_path(tag) -> List[int]:
+        path = []
+        while tag.parent is not None and tag.parent.name != "[document]":
+            siblings = [child for child in tag.parent.children if getattr(child, "name", None)]
+            path.insert(0, next(i for i, sibling in enumerate(siblings) if sibling is tag))
+            tag = tag.parent
+        return path
+
+    def atoms_for(self, element: etree._Element) -> List[Tuple[int, str, List[Tuple[str, ...]]]]:
+        """
+        Selectores compuestos candidatos de un elemento, del más barato al más caro
+
+        Returns:
+            Lista de (costo, texto CSS, átomos)
+        """
+        tag = element.tag
+        tag_atom = ("tag", tag)
+        candidates = []
+
+        element_id = element.get("id")
+        if element_id and is_stable_value(element_id):
+            text = f"#{element_id}" if CSS_IDENTIFIER_PATTERN.match(element_id) else f"[id={css_string(element_id)}]"
+            candidates.append((ATOM_COSTS["id"], text, [("attr", "id", element_id)]))
+
+        for kind, names in (("test", TEST_ATTRIBUTES), ("name", ("name",)), ("aria", ARIA_ATTRIBUTES)):
+            for name in names:
+                value = element.get(name)
+                if value and is_stable_value(value):
+                    candidates.append(
+                        (
+                            ATOM_COSTS[kind],
+                            f"{tag}[{name}={css_string(value)}]",
+                            [tag_atom, ("attr", name, value)],
+                        )
+                    )
+
+        classes = [
+            class_name
+            for class_name in dict.fromkeys((element.get("class") or "").split())
+            if CSS_IDENTIFIER_PATTERN.match(class_name)
+            and is_stable_value(class_name)
+            and not STATE_CLASS_PATTERN.search(class_name)
+        ]
+        for size in range(1, min(MAX_CLASS_COMBINATION, len(classes)) + 1):
+            for combination in itertools.combinations(classes, size):
+                candidates.append(
+                    (
+                        ATOM_COSTS["class"] + size - 1,
+                        tag + "".join(f".{class_name}" for class_name in combination),
+                        [tag_atom] + [("class", class_name) for class_name in combination],
+                    )
+                )
+
+        for name in OTHER_ATTRIBUTES:
+            value = element.get(name)
+            if value and is_stable_value(value):
+                candidates.append(
+                    (
+                        ATOM_COSTS["attr"],
+                        f"{tag}[{name}={css_string(value)}]",
+                        [tag_atom, ("attr", name, value)],
+                    )
+                )
+
+        candidates.append((ATOM_COSTS["tag"], tag, [tag_atom]))
+        candidates.sort(key=lambda candidate: (candidate[0], len(candidate[1])))
+        return candidates
+
+    def synthesize(self, target: etree._Element, alternatives: int = 3) -> List[Dict[str, Any]]:
+        """
+        Busca los selectores CSS únicos más baratos para el elemento
+
+        Primero se prueban los selectores del propio elemento; si ninguno es
+        único se anclan a un ancestro (hijo directo "A > B" o descendiente "A B").
+
+        Args:
+            target: Elemento objetivo
+            alternatives: Número de selectores únicos a devolver
+
+        Returns:
+            Lista de {"selector", "cost"} ordenada por costo (vacía si no hay ninguno estable)
+        """
+        target_index = self.index.position[target]
+        found = []
+
+        own = self.atoms_for(target)
+        for cost, text, atoms in own:
+            if self.index.matches(atoms) == {target_index}:
+                found.append({"selector": text, "cost": cost})
+
+        if len(found) < alternatives:
+            found.extend(self._anchored(target_index, own, alternatives - len(found)))
+        if not found:
+            found.append(self._positional(target_index))
+
+        found.sort(key=lambda item: (item["cost"], len(item["selector"])))
+        return found[:alternatives]
+
+    def _anchored(
+        self, target_index: int, own: List[tuple], limit: int
+    ) -> List[Dict[str, Any]]:
+        """Selectores 'ancestro > objetivo' o 'ancestro objetivo' que resultan únicos"""
+        results = []
+        ancestor = self.index.parent_index(target_index)
+        depth = 1
+        while ancestor is not None and depth <= MAX_ANCESTOR_DEPTH and len(results) < limit:
+            ancestor_element = self.index.elements[ancestor]
+            for ancestor_cost, ancestor_text, ancestor_atoms in self.atoms_for(ancestor_element):
+                if ancestor_cost >= ATOM_COSTS["tag"]:
+                    continue
+                anchors = self.index.matches(ancestor_atoms)
+                for cost, text, atoms in own:
+                    candidates = self.index.matches(atoms)
+                    if depth == 1:
+                        unique = {
+                            index for index in candidates if self.index.parent_index(index) in anchors
+                        }
+                        combinator = " > "
+                    else:
+                        unique = {
+                            index for index in candidates if self._has_ancestor(index, anchors)
+                        }
+                        combinator = " "
+                    if unique == {target_index}:
+                        results.append(
+                            {
+                                "selector": f"{ancestor_text}{combinator}{text}",
+                                "cost": ancestor_cost + cost + ANCESTOR_COST + depth - 1,
+                            }
+                        )
+                        break
+                if len(results) >= limit:
+                    break
+            ancestor = self.index.parent_index(ancestor)
+            depth += 1
+        return results
+
+    def _positional(self, target_index: int) -> Dict[str, Any]:
+        """
+        Último recurso: ruta con :nth-of-type hasta el ancestro más cercano con selector único
+
+        Es frágil ante cambios de estructura, por eso su costo es el más alto.
+        """
+        segments = []
+        cost = 0
+        index = target_index
+        while index is not None:
+            element = self.index.elements[index]
+            for atom_cost, text, atoms in self.atoms_for(element):
+                if atom_cost < ATOM_COSTS["tag"] and self.index.matches(atoms) == {index}:
+                    segments.insert(0, text)
+                    return {"selector": " > ".join(segments), "cost": cost + atom_cost}
+            parent = element.getparent()
+            if parent is None:
+                segments.insert(0, element.tag)
+                break
+            same_tag = [child for child in parent if child.tag == element.tag]
+            segments.insert(0, f"{element.tag}:nth-of-type({same_tag.index(element) + 1})")
+            cost += POSITIONAL_COST
+            index = self.index.parent_index(index)
+        return {"selector": " > ".join(segments), "cost": cost}
+
+    def _has_ancestor(self, index: int, anchors: Set[int]) -> bool:
+        parent = self.index.parent_index(index)
+        while parent is not None:
+            if parent in anchors:
+                return True
+            parent = self.index.parent_index(parent)
+        return False
+
+
+def format_locator_entry(name: str, selector: str, indent: int = 8) -> str:
+    """
+    Entrada lista para la clase de locators (mismo formato que locators/*.py)
+
+    Args:
+        name: Nombre del atributo (p. ej. BOTON_OKTA_ALT)
+        selector: Selector CSS
+        indent: Sangría del cuerpo de __init__
+    """
+    padding = " " * indent
+    literal = '"' + selector.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    line = f"{padding}self.{name} = (By.CSS_SELECTOR, {literal})"
+    if len(line) <= 88:
+        return line
+    return f"{padding}self.{name} = (\n{padding}    By.CSS_SELECTOR,\n{padding}    {literal},\n{padding})"
+
+
+def synthesize_from_snapshot(
+    snapshot_path: str, by: str, value: str, position: int = 0, alternatives: int = 3
+) -> List[Dict[str, Any]]:
+    """Selectores únicos para el elemento que un locator aproximado encuentra en un snapshot"""
+    synthesizer = SelectorSynthesizer.from_snapshot(snapshot_path)
+    return synthesizer.synthesize(synthesizer.find_target(by, value, position), alternatives)
+
+
+def pick_and_synthesize(driver, timeout: float = 300, alternatives: int = 3) -> List[Dict[str, Any]]:
+    """
+    Espera a que el usuario haga clic en un elemento de la página actual y sintetiza su selector
+
+    Args:
+        driver: Instancia del WebDriver con la página abierta
+        timeout: Segundos máximos de espera del clic
+    """
+    driver.execute_script(PICKER_SCRIPT)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        picked = driver.execute_script(PICKED_SCRIPT)
+        if picked:
+            info, content = picked
+            synthesizer = SelectorSynthesizer(content.encode("utf-8"))
+            target = synthesizer.element_at(info["path"])
+            if target.tag != info["tag"]:
+                raise LookupError(
+                    f"El DOM serializado no coincide con el elemento elegido ({target.tag} != {info['tag']})"
+                )
+            return synthesizer.synthesize(target, alternatives)
+        time.sleep(0.3)
+    raise TimeoutError("No se seleccionó ningún elemento")
+
+
+def suggest_for_registry(
+    snapshots_dir: str = "snapshots", class_names: Optional[Sequence[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Propone un selector rápido para cada locator del registro que no sea ya un id o CSS único
+
+    Cada locator se resuelve en los snapshots donde coincide; se sugiere el
+    selector del primer snapshot en el que el elemento tiene uno estable.
+    """
+    synthesizers = [
+        (path.stem, SelectorSynthesizer.from_snapshot(str(path)))
+        for path in sorted(Path(snapshots_dir).glob("*.html"))
+    ]
+    classes = locator_registry.load()
+    suggestions = []
+    for class_name in class_names or sorted(classes):
+        for name, (by, value) in classes[class_name].locators().items():
+            if by not in ("xpath", "css selector"):
+                continue
+            for screen, synthesizer in synthesizers:
+                try:
+                    target = synthesizer.find_target(by, value)
+                except Exception:
+                    continue
+                best = synthesizer.synthesize(target, alternatives=1)
+                if best and best[0]["selector"] != value:
+                    suggestions.append(
+                        {
+                            "class": class_name,
+                            "name": name,
+                            "current": (by, value),
+                            "screen": screen,
+                            "selector": best[0]["selector"],
+                            "entry": format_locator_entry(name, best[0]["selector"]),
+                        }
+                    )
+                break
+    return suggestions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Sintetiza selectores CSS únicos y rápidos")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="Elemento de un snapshot + locator aproximado")
+    snapshot_parser.add_argument("snapshot", help="Archivo HTML del snapshot")
+    target = snapshot_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--xpath", help="XPath aproximado del elemento")
+    target.add_argument("--css", help="Selector CSS aproximado del elemento")
+    target.add_argument("--locator", help="Locator del registro (Clase.NOMBRE)")
+    snapshot_parser.add_argument("--index", type=int, default=0, help="Coincidencia a usar (0 = primera)")
+    snapshot_parser.add_argument("--name", help="Nombre del atributo para la entrada generada")
+
+    pick_parser = subparsers.add_parser("pick", help="Abre la URL en Chrome y espera un clic")
+    pick_parser.add_argument("url", help="URL de la pantalla")
+    pick_parser.add_argument("--name", default="NUEVO_ELEMENTO", help="Nombre del atributo")
+
+    registry_parser = subparsers.add_parser("registry", help="Sugerencias para todos los locators")
+    registry_parser.add_argument("--snapshots", default="snapshots", help="Directorio de snapshots")
+    registry_parser.add_argument("--class", dest="classes", action="append", help="Clase de locators (repetible)")
+    args = parser.parse_args(argv)
+
+    if args.command == "registry":
+        suggestions = suggest_for_registry(args.snapshots, args.classes)
+        for suggestion in suggestions:
+            print(f"# {suggestion['class']}.{suggestion['name']} ({suggestion['screen']})")
+            print(f"#   actual: {suggestion['current'][0]}: {suggestion['current'][1]}")
+            print(suggestion["entry"])
+        print(f"# {len(suggestions)} sugerencias")
+        return 0
+
+    if args.command == "pick":
+        from selenium import webdriver
+
+        driver = webdriver.Chrome()
+        try:
+            driver.get(args.url)
+            print("Haz clic en el elemento en la ventana de Chrome...")
+            results = pick_and_synthesize(driver)
+        finally:
+            driver.quit()
+        name = args.name
+    else:
+        name = args.name
+        if args.locator:
+            class_name, name_in_class = args.locator.split(".", 1)
+            by, value = getattr(locator_registry.get(class_name), name_in_class)
+            name = name or name_in_class
+        else:
+            by, value = ("xpath", args.xpath) if args.xpath else ("css selector", args.css)
+        results = synthesize_from_snapshot(args.snapshot, by, value, args.index)
+        name = name or "NUEVO_ELEMENTO"
+
+    if not results:
+        print("No se encontró un selector único estable para el elemento")
+        return 1
+    for result in results:
+        print(f"costo {result['cost']:2}  {result['selector']}")
+    print()
+    print(format_locator_entry(name, results[0]["selector"]))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
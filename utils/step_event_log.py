@@ -0,0 +1,381 @@
+"""
+Log Estructurado de Steps - Eventos JSON Lines con Índice Binario de Offsets
+Cada step, espera, screenshot y error queda como un registro JSON por línea
+"""
+
+import json
+import logging
+import struct
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Entrada del índice: step_index (uint32) + offset en bytes (uint64)
+INDEX_ENTRY = struct.Struct("<IQ")
+
+
+class StepEventLog:
+    """Escritor del log estructurado de eventos de un escenario"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._file = None
+        self._index = None
+        self.events_path = None
+        self.index_path = None
+        self.run_id = None
+        self.scenario_id = None
+        self.step_index = 0
+        self._start_mono = None
+        self._step_start_mono = None
+
+    @property
+    def active(self) -> bool:
+        """Indica si hay un escenario abierto"""
+        return self._file is not None
+
+    def start_scenario(
+        self, run_id: str, scenario_id: str, events_path: Union[str, Path]
+    ) -> str:
+        """
+        Abre el log de eventos de un escenario
+
+        Args:
+            run_id: Identificador de la ejecución completa
+            scenario_id: Identificador del escenario dentro de la ejecución
+            events_path: Ruta del archivo .jsonl (el índice se guarda como .idx)
+
+        Returns:
+            Ruta del archivo de eventos
+        """
+        self.end_scenario()
+
+        events_path = Path(events_path)
+        events_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.events_path = events_path
+            self.index_path = events_path.with_suffix(".idx")
+            self._file = open(events_path, "wb")
+            self._index = open(self.index_path, "wb")
+            self.run_id = run_id
+            self.scenario_id = scenario_id
+            self.step_index = 0
+            self._start_mono = time.monotonic()
+            self._step_start_mono = None
+
+        self._write("scenario_start")
+        return str(events_path)
+
+    def end_scenario(self, status: Optional[str] = None):
+        """Cierra el log de eventos del escenario actual"""
+        if not self.active:
+            return
+        self._write("scenario_end", status=status)
+        with self._lock:
+            for handle in (self._file, self._index):
+                try:
+                    handle.close()
+                except Exception:
+                    pass
+            self._file = None
+            self._index = None
+
+    def start_step(self, keyword: str, name: str) -> int:
+        """
+        Registra el inicio de un step y su offset en el índice
+
+        Returns:
+            Índice (1..n) del step dentro del escenario
+        """
+        if not self.active:
+            return 0
+        with self._lock:
+            self.step_index += 1
+            self._step_start_mono = time.monotonic()
+            self._index.write(INDEX_ENTRY.pack(self.step_index, self._file.tell()))
+            self._index.flush()
+        self._write("step_start", keyword=keyword, name=name)
+        return self.step_index
+
+    def end_step(
+        self,
+        status: str,
+        duration: Optional[float] = None,
+        error_message: Optional[str] = None,
+    ):
+        """Registra el fin de un step con su estado y duración"""
+        if duration is None and self._step_start_mono is not None:
+            duration = time.monotonic() - self._step_start_mono
+        self._write(
+            "step_end",
+            status=status,
+            duration=round(duration, 3) if duration is not None else None,
+            error_message=error_message,
+        )
+        if error_message:
+            self.error(error_message, source="step")
+
+    def wait(
+        self,
+        description: str,
+        timeout: Optional[float] = None,
+        elapsed: Optional[float] = None,
+        success: Optional[bool] = None,
+        effective_timeout: Optional[float] = None,
+    ):
+        """Registra una espera (timeout solicitado vs tiempo real)"""
+        self._write(
+            "wait",
+            description=description,
+            timeout=timeout,
+            elapsed=round(elapsed, 3) if elapsed is not None else None,
+            success=success,
+            effective_timeout=(
+                round(effective_timeout, 3) if effective_timeout is not None else None
+            ),
+        )
+
+    def screenshot(self, path: str, name: Optional[str] = None):
+        """Registra la captura de un screenshot"""
+        self._write("screenshot", path=path, name=name)
+
+    def error(self, message: str, error_type: Optional[str] = None, **data):
+        """Registra un error"""
+        self._write("error", message=message, error_type=error_type, **data)
+
+    def event(self, event: str, **data):
+        """Registra un evento arbitrario"""
+        self._write(event, **data)
+
+    def _write(self, event: str, **data):
+        if not self.active:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._file is None:
+                return
+            record = {
+                "run_id": self.run_id,
+                "scenario_id": self.scenario_id,
+                "step_index": self.step_index,
+                "event": event,
+                "mono": round(now - self._start_mono, 6),
+                "ts": datetime.now().isoformat(timespec="milliseconds"),
+            }
+            record.update({k: v for k, v in data.items() if v is not None})
+            self._file.write(
+                (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode(
+                    "utf-8"
+                )
+            )
+            self._file.flush()
+
+
+class StepEventReader:
+    """Lector del log estructurado que usa el índice para ir directo a un step"""
+
+    def __init__(self, events_path: Union[str, Path]):
+        self.events_path = Path(events_path)
+        self.index_path = self.events_path.with_suffix(".idx")
+        self._offsets = None
+
+    def _load_index(self) -> List[tuple]:
+        """Carga el índice binario (step_index, offset)"""
+        if self._offsets is None:
+            self._offsets = []
+            if self.index_path.exists():
+                with open(self.index_path, "rb") as f:
+                    data = f.read()
+                usable = len(data) - len(data) % INDEX_ENTRY.size
+                self._offsets = list(INDEX_ENTRY.iter_unpack(data[:usable]))
+        return self._offsets
+
+    def iter_events(self, event: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Itera todos los eventos, opcionalmente filtrados por tipo"""
+        for _, record in self._iter_numbered(event):
+            yield record
+
+    def _iter_numbered(
+        self, event: Optional[str] = None
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Itera (número de línea 1..n en el archivo, evento)"""
+        if not self.events_path.exists():
+            return
+        with open(self.events_path, "rb") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if event is None or record.get("event") == event:
+                    yield line_number, record
+
+    def read_step(self, step_index: int) -> List[Dict[str, Any]]:
+        """
+        Lee solo los eventos de un step usando el índice de offsets
+
+        Args:
+            step_index: Índice (1..n) del step
+
+        Returns:
+            Lista de eventos del step
+        """
+        offsets = self._load_index()
+        start = end = None
+        for i, (index, offset) in enumerate(offsets):
+            if index == step_index:
+                start = offset
+                if i + 1 < len(offsets):
+                    end = offsets[i + 1][1]
+                break
+        if start is None:
+            return []
+
+        with open(self.events_path, "rb") as f:
+            f.seek(start)
+            data = f.read() if end is None else f.read(end - start)
+
+        events = []
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("step_index") != step_index:
+                break
+            events.append(record)
+        return events
+
+    def summarize_steps(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Resume los eventos por step (esperas, screenshots, errores, comandos
+        WebDriver e inventarios del DOM)
+
+        Returns:
+            Diccionario step_index -> resumen
+        """
+        summary = {}
+        for record in self.iter_events():
+            step_index = record.get("step_index", 0)
+            entry = summary.setdefault(
+                step_index,
+                {
+                    "waits": 0,
+                    "wait_time": 0.0,
+                    "wait_requested": 0.0,
+                    "wait_timeouts": 0,
+                    "screenshots": [],
+                    "errors": [],
+                    "name": None,
+                    "duration": None,
+                    "status": None,
+                    "webdriver": None,
+                    "inventories": [],
+                },
+            )
+            event = record.get("event")
+            if event == "step_start":
+                entry["name"] = record.get("name")
+            elif event == "wait":
+                entry["waits"] += 1
+                entry["wait_time"] += record.get("elapsed") or 0.0
+                entry["wait_requested"] += record.get("timeout") or 0.0
+                if record.get("success") is False:
+                    entry["wait_timeouts"] += 1
+            elif event == "screenshot":
+                entry["screenshots"].append(record.get("path"))
+            elif event == "error":
+                entry["errors"].append(record.get("message"))
+            elif event == "webdriver_commands":
+                entry["webdriver"] = {
+                    key: record.get(key)
+                    for key in (
+                        "commands",
+                        "total_time",
+                        "errors",
+                        "slowest",
+                        "by_command",
+                        "by_method",
+                    )
+                }
+            elif event == "dom_inventory":
+                entry["inventories"].append(
+                    {
+                        "name": record.get("name"),
+                        "path": record.get("path"),
+                        "counts": record.get("counts"),
+                    }
+                )
+            elif event == "step_end":
+                entry["duration"] = record.get("duration")
+                entry["status"] = record.get("status")
+        return summary
+
+    def analyze_errors(self, classifier=None) -> Dict[str, Any]:
+        """
+        Extrae los errores registrados sin parsear texto con expresiones regulares
+
+        Args:
+            classifier: Función que clasifica un mensaje de error (opcional)
+
+        Returns:
+            Diccionario con "errors" y "patterns" (conteo por tipo); cada error
+            incluye "line_number", su línea en el archivo de eventos
+        """
+        errors = []
+        patterns = {}
+        for line_number, record in self._iter_numbered("error"):
+            message = record.get("message", "")
+            error_type = record.get("error_type") or (
+                classifier(message) if classifier else "Error"
+            )
+            errors.append(
+                {
+                    "step_index": record.get("step_index"),
+                    "timestamp": record.get("ts", "N/A"),
+                    "type": error_type,
+                    "message": message,
+                    "location": record.get("source", "N/A"),
+                    "line_number": line_number,
+                }
+            )
+            patterns[error_type] = patterns.get(error_type, 0) + 1
+        return {"errors": errors, "patterns": patterns}
+
+
+class StepEventErrorHandler(logging.Handler):
+    """Handler que convierte los logs de nivel ERROR en eventos estructurados"""
+
+    def __init__(self, event_log: StepEventLog):
+        super().__init__(level=logging.ERROR)
+        self.event_log = event_log
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.event_log.error(
+                record.getMessage(),
+                error_type=record.exc_info[0].__name__ if record.exc_info else None,
+                source=record.name,
+            )
+        except Exception:
+            self.handleError(record)
+
+
+def events_path_for_log(log_file: Union[str, Path]) -> Path:
+    """Ruta del log de eventos que acompaña a un log de texto"""
+    log_file = Path(log_file)
+    name = log_file.stem.replace("test_", "events_", 1)
+    if name == log_file.stem:
+        name = f"events_{name}"
+    return log_file.with_name(name + ".jsonl")
+
+
+# Instancia global para uso fácil
+step_event_log = StepEventLog()
+
+# Los errores registrados por page objects y utilidades pasan al log estructurado
+for _logger_name in ("pages", "utils"):
+    logging.getLogger(_logger_name).addHandler(StepEventErrorHandler(step_event_log))
+del _logger_name
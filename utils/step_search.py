@@ -0,0 +1,155 @@
+"""
+Búsqueda de Steps - Índice Invertido con Ranking BM25
+Tokens normalizados sin acentos y con stemming ligero para español
+"""
+
+import argparse
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+# Palabras vacías (ya sin acentos) que no aportan al ranking
+STOP_WORDS = {
+    "a", "al", "con", "de", "del", "el", "en", "es", "esta", "este", "la", "las",
+    "lo", "los", "mi", "para", "por", "que", "se", "su", "sus", "un", "una", "y",
+}
+
+# Sufijos en orden de prueba (el primero que deje una raíz de 3+ letras gana)
+SUFFIXES = (
+    "amientos", "imientos", "amiento", "imiento", "aciones", "iciones", "mente",
+    "acion", "icion", "ciones", "cion", "ando", "iendo", "adas", "ados", "idas",
+    "idos", "ada", "ado", "ida", "ido", "ar", "er", "ir", "es", "as", "os", "a",
+    "o", "e", "s",
+)
+
+# Parámetros de behave ({usuario}, "{texto}") que no forman parte del texto
+PLACEHOLDER_PATTERN = re.compile(r'"?\{[^}]*\}"?')
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def fold_accents(text: str) -> str:
+    """Quita acentos y diacríticos: "contraseña" -> "contrasena", "catálogo" -> "catalogo" """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def stem(token: str) -> str:
+    """Stemming ligero por sufijos para español"""
+    if len(token) <= 4 or token.isdigit():
+        return token
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Normaliza un texto y devuelve sus tokens (sin acentos, sin palabras vacías, con stemming)"""
+    text = fold_accents(PLACEHOLDER_PATTERN.sub(" ", text).lower())
+    return [stem(token) for token in TOKEN_PATTERN.findall(text) if token not in STOP_WORDS]
+
+
+class StepSearchIndex:
+    """Índice invertido de steps con ranking BM25 y recuperación top-k"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Dict[str, Any]] = []
+        self._postings: Dict[str, List[tuple]] = {}
+        self._lengths: List[int] = []
+        self._avg_length = 0.0
+
+    def build(self, steps: Iterable[Dict[str, Any]]) -> "StepSearchIndex":
+        """
+        Construye el índice
+
+        Args:
+            steps: Steps con al menos la clave "text"
+
+        Returns:
+            El propio índice
+        """
+        postings = defaultdict(list)
+        self.documents = []
+        self._lengths = []
+        for doc_id, step in enumerate(steps):
+            tokens = tokenize(step["text"])
+            self.documents.append(step)
+            self._lengths.append(len(tokens))
+            for term, frequency in Counter(tokens).items():
+                postings[term].append((doc_id, frequency))
+
+        self._postings = dict(postings)
+        self._avg_length = (
+            sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        )
+        return self
+
+    def _idf(self, term: str) -> float:
+        document_frequency = len(self._postings.get(term, ()))
+        total = len(self.documents)
+        return math.log(1 + (total - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def search(self, query: str, top_k: Optional[int] = 5) -> List[Dict[str, Any]]:
+        """
+        Busca los steps más relevantes para un texto
+
+        Args:
+            query: Texto a buscar
+            top_k: Número máximo de resultados (None devuelve todos los que coinciden)
+
+        Returns:
+            Lista de steps (copias) con "score" BM25, de mayor a menor
+        """
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(term)
+            for doc_id, frequency in postings:
+                length_norm = 1 - self.b + self.b * self._lengths[doc_id] / (
+                    self._avg_length or 1
+                )
+                scores[doc_id] += idf * (
+                    frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                )
+
+        if top_k is None:
+            best = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        else:
+            best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [
+            dict(self.documents[doc_id], score=round(score, 4)) for doc_id, score in best
+        ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos"""
+    from .code_reuse_helper import CodeReuseHelper
+
+    parser = argparse.ArgumentParser(
+        description="Busca steps reutilizables (BM25 sobre texto normalizado)"
+    )
+    parser.add_argument("query", help="Texto del step a buscar")
+    parser.add_argument("--top", type=int, default=5, help="Número de resultados")
+    parser.add_argument("--project-root", default=".", help="Raíz del proyecto")
+    args = parser.parse_args(argv)
+
+    results = CodeReuseHelper(args.project_root).search_steps(args.query, args.top)
+    if not results:
+        print("No se encontraron steps similares")
+        return 1
+
+    for result in results:
+        print(f"{result['score']:7.3f}  @{result['type']}(\"{result['text']}\")")
+        print(f"         {result['file']}:{result['line']}  {result['function']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,230 @@
+"""
+Política de Esperas - Solo Esperas Explícitas con Presupuesto por Step
+Deja el implicit wait en cero para que no se sume a los WebDriverWait de los
+page objects, ajusta la frecuencia de sondeo según la espera, reemplaza los
+timeouts fijos por los del modelo de latencias, limita el tiempo total de
+espera de cada step y registra cada espera (timeout solicitado vs tiempo real)
+en el log estructurado y en los reportes
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .latency_model import latency_model
+from .step_event_log import step_event_log
+
+DEFAULT_WAIT_POLICY = {
+    # Segundos de implicit wait del driver (0: solo esperas explícitas)
+    "implicit_wait": 0,
+    # Segundos máximos de espera acumulada por step (None: sin límite)
+    "step_budget": 120,
+    # Sondeo de las esperas normales y de los sondeos cortos (timeout <= probe_timeout)
+    "poll_frequency": 0.5,
+    "probe_poll_frequency": 0.1,
+    "probe_timeout": 2,
+}
+
+
+def describe_condition(method: Callable) -> str:
+    """
+    Descripción legible de una condición de expected_conditions
+
+    Es también la clave del elemento lógico en el modelo de latencias.
+
+    Returns:
+        "element_to_be_clickable //button[...]", "url_contains /home" o el
+        nombre de la función
+    """
+    name = getattr(method, "__qualname__", type(method).__name__).split(".<locals>")[0]
+    for cell in getattr(method, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            continue
+        if isinstance(value, tuple) and len(value) == 2 and all(isinstance(v, str) for v in value):
+            return f"{name} {value[1]}"
+        if isinstance(value, str):
+            return f"{name} {value}"
+    return name
+
+
+class PolicyWait(WebDriverWait):
+    """WebDriverWait que respeta el presupuesto del step y registra cada espera"""
+
+    def __init__(
+        self,
+        policy: "WaitPolicy",
+        driver,
+        timeout: float,
+        poll_frequency: float,
+        description: Optional[str] = None,
+    ):
+        super().__init__(driver, timeout, poll_frequency=poll_frequency)
+        self._policy = policy
+        self._description = description
+
+    def until(self, method: Callable, message: str = ""):
+        return self._measure(super().until, method, message)
+
+    def until_not(self, method: Callable, message: str = ""):
+        return self._measure(super().until_not, method, message)
+
+    def _measure(self, wait: Callable, method: Callable, message: str):
+        key = self._description or describe_condition(method)
+        requested = self._timeout
+        adaptive = latency_model.timeout_for(key, requested)
+        self._timeout = self._policy.allowed_timeout(adaptive)
+        started = time.monotonic()
+        success = False
+        try:
+            result = wait(method, message)
+            success = True
+            return result
+        finally:
+            effective, self._timeout = self._timeout, requested
+            self._policy.record(
+                key, requested, adaptive, effective, time.monotonic() - started, success
+            )
+
+
+class WaitPolicy:
+    """Configuración central de esperas y contabilidad por step"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.config: Dict[str, Any] = dict(DEFAULT_WAIT_POLICY)
+        self._lock = threading.Lock()
+        self._step: Optional[Dict[str, Any]] = None
+
+    def configure(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Aplica la sección "wait_policy" de config.json
+
+        Args:
+            config: implicit_wait, step_budget, poll_frequency, probe_poll_frequency, probe_timeout
+        """
+        self.config = dict(DEFAULT_WAIT_POLICY)
+        self.config.update(config or {})
+
+    def apply(self, driver):
+        """Configura el driver según la política (implicit wait)"""
+        driver.implicitly_wait(self.config["implicit_wait"])
+
+    def wait(
+        self,
+        driver,
+        timeout: float,
+        poll_frequency: Optional[float] = None,
+        description: Optional[str] = None,
+    ) -> PolicyWait:
+        """
+        Espera explícita sujeta a la política (reemplazo de WebDriverWait)
+
+        Args:
+            driver: Instancia del WebDriver
+            timeout: Segundos solicitados
+            poll_frequency: Segundos entre sondeos (por defecto según el tipo de espera)
+            description: Descripción para el registro (por defecto la condición)
+
+        Returns:
+            Espera con until/until_not
+        """
+        if poll_frequency is None:
+            poll_frequency = (
+                self.config["probe_poll_frequency"]
+                if timeout <= self.config["probe_timeout"]
+                else self.config["poll_frequency"]
+            )
+        return PolicyWait(self, driver, timeout, poll_frequency, description)
+
+    def start_step(self):
+        """Reinicia la contabilidad de esperas para un step"""
+        with self._lock:
+            self._step = {
+                "waits": 0,
+                "requested": 0.0,
+                "spent": 0.0,
+                "timeouts": 0,
+                "clamped": 0,
+                "budget_exhausted": False,
+            }
+
+    def end_step(self) -> Optional[Dict[str, Any]]:
+        """
+        Cierra la contabilidad del step actual
+
+        Returns:
+            Totales (waits, requested, spent, timeouts, clamped) o None si no hubo esperas
+        """
+        with self._lock:
+            step, self._step = self._step, None
+        if not step or not step["waits"]:
+            return None
+        step.pop("budget_exhausted")
+        step["requested"] = round(step["requested"], 3)
+        step["spent"] = round(step["spent"], 3)
+        return step
+
+    def allowed_timeout(self, requested: float) -> float:
+        """Timeout efectivo: el solicitado, recortado a lo que queda del presupuesto del step"""
+        budget = self.config.get("step_budget")
+        with self._lock:
+            step = self._step
+            if step is None or budget is None:
+                return requested
+            remaining = max(budget - step["spent"], 0.0)
+            if requested <= remaining:
+                return requested
+            step["clamped"] += 1
+            exhausted, step["budget_exhausted"] = step["budget_exhausted"], True
+        if not exhausted:
+            self.logger.warning(
+                f"⏱️ Presupuesto de esperas del step ({budget}s) casi agotado: "
+                f"la espera de {requested}s se limita a {remaining:.1f}s"
+            )
+        return remaining
+
+    def record(
+        self,
+        description: str,
+        requested: float,
+        adaptive: float,
+        effective: float,
+        elapsed: float,
+        success: bool,
+    ):
+        """
+        Registra una espera en la contabilidad del step, el log estructurado y
+        el modelo de latencias
+
+        Solo cuentan como fallos del elemento en el modelo los timeouts con el
+        tiempo solicitado por el código: los recortados por el presupuesto del
+        step no son evidencia, y tras uno acortado por el propio modelo la
+        siguiente espera vuelve al solicitado.
+        """
+        with self._lock:
+            step = self._step
+            if step is not None:
+                step["waits"] += 1
+                step["requested"] += requested
+                step["spent"] += elapsed
+                step["timeouts"] += not success
+        step_event_log.wait(
+            description,
+            timeout=requested,
+            elapsed=elapsed,
+            success=success,
+            effective_timeout=effective if effective != requested else None,
+        )
+        if success or effective >= requested:
+            latency_model.observe(description, elapsed, success)
+        elif adaptive < requested:
+            latency_model.timed_out_early(description)
+
+
+# Instancia global para uso fácil
+wait_policy = WaitPolicy()
@@ -0,0 +1,190 @@
+"""
+Perfilador de Comandos WebDriver - Round Trips por Step y Método
+Cuenta y cronometra cada comando HTTP que el driver envía a ChromeDriver
+(find_elements, get_attribute, is_displayed, execute_script, ...) y lo
+atribuye al step de behave y al método del page object que lo originó
+"""
+
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Entradas por desglose (comandos y métodos) que se guardan en los reportes
+TOP_ENTRIES = 5
+
+# Carpetas cuyo código origina los comandos (page objects y steps): se prefieren
+# al resto del proyecto
+CALLER_DIRECTORIES = (PROJECT_ROOT / "pages", PROJECT_ROOT / "features" / "steps")
+
+# Utilidades por las que pasan los comandos de los page objects: solo se les
+# atribuye un comando si no hay otro código del proyecto en la pila
+PASS_THROUGH_MODULES = {"wait_policy", "locator_healing", "form_filler", "dom_inventory"}
+
+
+class WebDriverCommandProfiler:
+    """Intercepta WebDriver.execute y acumula los comandos del step actual"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._driver = None
+        self._original_execute = None
+        self._step: Optional[Dict[str, Any]] = None
+        # Origen de cada archivo de código (ruta -> (módulo, prioridad) o None)
+        self._origins: Dict[str, Optional[Tuple[str, int]]] = {}
+        self._this_file = str(Path(__file__).resolve())
+        # Callback opcional (comando, segundos, falló) por cada comando, dentro o fuera de un step
+        self.on_command: Optional[Callable[[str, float, bool], None]] = None
+
+    @property
+    def attached(self) -> bool:
+        return self._driver is not None
+
+    def attach(self, driver):
+        """
+        Instala el contador sobre el driver del escenario
+
+        WebElement envía sus comandos a través de driver.execute, así que se
+        miden también get_attribute, is_displayed, click, etc.
+
+        Args:
+            driver: Instancia del WebDriver
+        """
+        self.detach()
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            method = self._caller()
+            started = time.perf_counter()
+            failed = False
+            try:
+                return original_execute(driver_command, params)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                self._record(driver_command, elapsed, method, failed)
+                if self.on_command is not None:
+                    self.on_command(driver_command, elapsed, failed)
+
+        driver.execute = execute
+        self._driver = driver
+        self._original_execute = original_execute
+
+    def detach(self):
+        """Restaura driver.execute (al cerrar el driver del escenario)"""
+        if self._driver is not None:
+            try:
+                del self._driver.execute
+            except AttributeError:
+                pass
+        self._driver = None
+        self._original_execute = None
+        self._step = None
+
+    def start_step(self):
+        """Empieza a acumular los comandos de un step"""
+        with self._lock:
+            self._step = {"commands": 0, "total_time": 0.0, "errors": 0, "slowest": None,
+                          "by_command": {}, "by_method": {}}
+
+    def end_step(self) -> Optional[Dict[str, Any]]:
+        """
+        Cierra el step actual
+
+        Returns:
+            Resumen con commands, total_time, errors, slowest (comando, método y
+            duración), by_command y by_method (los TOP_ENTRIES de mayor latencia),
+            o None si el step no envió comandos
+        """
+        with self._lock:
+            step, self._step = self._step, None
+        if not step or not step["commands"]:
+            return None
+        return {
+            "commands": step["commands"],
+            "total_time": round(step["total_time"], 3),
+            "errors": step["errors"],
+            "slowest": step["slowest"],
+            "by_command": self._top(step["by_command"]),
+            "by_method": self._top(step["by_method"]),
+        }
+
+    def _record(self, command: str, elapsed: float, method: str, failed: bool):
+        with self._lock:
+            step = self._step
+            if step is None:
+                return
+            step["commands"] += 1
+            step["total_time"] += elapsed
+            step["errors"] += failed
+            for key, breakdown in ((command, step["by_command"]), (method, step["by_method"])):
+                entry = breakdown.setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+            if step["slowest"] is None or elapsed > step["slowest"]["duration"]:
+                step["slowest"] = {
+                    "command": command,
+                    "method": method,
+                    "duration": round(elapsed, 3),
+                }
+
+    def _caller(self) -> str:
+        """
+        Método que originó el comando
+
+        Primer marco de un page object o step en la pila; si no hay ninguno
+        (p. ej. hooks de environment), el primer marco del proyecto que no sea
+        una utilidad de paso (PASS_THROUGH_MODULES), y si no, la utilidad.
+        """
+        frame = sys._getframe(2)
+        best, best_priority = None, -1
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            origin = self._origins.get(filename, "")
+            if origin == "":
+                origin = self._origin(filename)
+                self._origins[filename] = origin
+            if origin and origin[1] > best_priority:
+                module, best_priority = origin
+                name = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+                name = name.split(".<locals>")[0]
+                best = name if "." in name else f"{module}.{name}"
+                if best_priority == 2:
+                    break
+            frame = frame.f_back
+        return best or "desconocido"
+
+    def _origin(self, filename: str) -> Optional[Tuple[str, int]]:
+        """Módulo y prioridad (2 page object o step, 1 proyecto, 0 utilidad de paso)"""
+        try:
+            path = Path(filename).resolve()
+        except (OSError, ValueError):
+            return None
+        if str(path) == self._this_file or "site-packages" in path.parts:
+            return None
+        try:
+            path.relative_to(PROJECT_ROOT)
+        except ValueError:
+            return None
+        if any(directory in path.parents for directory in CALLER_DIRECTORIES):
+            return path.stem, 2
+        return path.stem, 0 if path.stem in PASS_THROUGH_MODULES else 1
+
+    @staticmethod
+    def _top(breakdown: Dict[str, list]) -> list:
+        entries = sorted(breakdown.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            {"name": name, "count": count, "time": round(elapsed, 3)}
+            for name, (count, elapsed) in entries[:TOP_ENTRIES]
+        ]
+
+
+# Instancia global para uso fácil
+webdriver_profiler = WebDriverCommandProfiler()